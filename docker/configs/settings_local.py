@@ -19,7 +19,7 @@
     "ENABLED": True,
     "DEST_STORAGE_PATTERN": "r2-{bucket}",
     "INCLUDE_BUCKETS": ARTIFACT_STORAGE_NAMES,
-    "EXCLUDE_BUCKETS": ["staging"],
+    "EXCLUDE_BUCKETS": ["staging", "htmlized", "pdfized"],
     "VERBOSE_LOGGING": True,
 }
 
@@ -34,6 +34,7 @@
 from ietf.group.factories import RoleFactory
 from ietf.meeting.factories import MeetingFactory, SessionFactory
 from ietf.meeting.models import Session, Registration
+from ietf.message.utils import update_email_aliases
 from ietf.nomcom.models import Volunteer
 from ietf.nomcom.factories import NomComFactory, nomcom_kwargs_for_year
 from ietf.person.factories import PersonFactory, random_faker, EmailFactory, PersonalApiKeyFactory
@@ -919,6 +920,27 @@ def test_api_nfs_metrics(self):
         r = self.client.get(url, headers={"X-Api-Key": "valid-token"})
         self.assertContains(r, 'nfs_latency_seconds{operation="write"}')
 
+    @override_settings(APP_API_TOKENS={"ietf.api.views.slow_page_metrics": ["valid-token"]})
+    @mock.patch("ietf.api.views.get_slow_page_metrics")
+    def test_api_slow_page_metrics(self, mock_metrics):
+        mock_metrics.return_value = {
+            "ietf.doc.views_search.active_drafts_index": {
+                "hit": 3, "stale": 1, "miss": 1, "compute": 2, "compute_ms": 1500,
+            },
+        }
+        url = urlreverse("ietf.api.views.slow_page_metrics")
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 403)
+        r = self.client.get(url, headers={"X-Api-Key": "valid-token"})
+        self.assertContains(
+            r,
+            'slowpages_requests_total{value="ietf.doc.views_search.active_drafts_index",result="hit"} 3\n',
+        )
+        self.assertContains(
+            r,
+            'slowpages_compute_seconds_total{value="ietf.doc.views_search.active_drafts_index"} 1.5\n',
+        )
+
     def test_api_get_session_matherials_no_agenda_meeting_url(self):
         meeting = MeetingFactory(type_id='ietf')
         session = SessionFactory(meeting=meeting)
@@ -960,6 +982,45 @@ def test_draft_aliases(self, mock):
             405,
         )
 
+    @override_settings(APP_API_TOKENS={"ietf.api.views.draft_aliases": ["valid-token"]})
+    def test_draft_aliases_snapshot(self):
+        author = PersonFactory()
+        draft = WgDraftFactory(authors=[author])
+        update_email_aliases(full=True)
+        url = urlreverse("ietf.api.views.draft_aliases")
+
+        r = self.client.get(url, headers={"X-Api-Key": "valid-token"})
+        self.assertEqual(r.status_code, 200)
+        data = r.json()
+        version = data["version"]
+        self.assertIn(
+            {"alias": draft.name, "domains": ["ietf"], "addresses": [author.email_address()]},
+            data["aliases"],
+        )
+        self.assertNotIn("removed", data)
+
+        # nothing changed since that version
+        r = self.client.get(url, {"since": version}, headers={"X-Api-Key": "valid-token"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json(), {"version": version, "aliases": [], "removed": []})
+
+        # only the changed aliases are returned
+        other_author = PersonFactory()
+        draft.documentauthor_set.create(person=other_author, email=other_author.email(), order=2)
+        DocEventFactory(doc=draft)
+        r = self.client.get(url, {"since": version}, headers={"X-Api-Key": "valid-token"})
+        self.assertEqual(r.status_code, 200)
+        data = r.json()
+        self.assertNotEqual(data["version"], version)
+        self.assertEqual(
+            {a["alias"] for a in data["aliases"]},
+            {draft.name, f"{draft.name}.authors", f"{draft.name}.all"},
+        )
+        self.assertEqual(data["removed"], [])
+
+        r = self.client.get(url, {"since": "bogus"}, headers={"X-Api-Key": "valid-token"})
+        self.assertEqual(r.status_code, 400)
+
     @override_settings(APP_API_TOKENS={"ietf.api.views.group_aliases": ["valid-token"]})
     @mock.patch("ietf.api.views.GroupAliasGenerator")
     def test_group_aliases(self, mock):
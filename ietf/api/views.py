@@ -44,6 +44,8 @@
 from ietf.ietfauth.utils import role_required
 from ietf.ipr.utils import ingest_response_email as ipr_ingest_response_email
 from ietf.meeting.models import Meeting
+from ietf.message.models import EmailAlias, EmailAliasBuild
+from ietf.message.utils import update_email_aliases
 from ietf.meeting.utils import import_registration_json_validator, process_single_registration
 from ietf.nomcom.utils import ingest_feedback_email as nomcom_ingest_feedback_email
 from ietf.person.models import Person, Email
@@ -52,6 +54,7 @@
 from ietf.utils.decorators import require_api_key
 from ietf.utils.mail import send_smtp
 from ietf.utils.models import DumpInfo
+from ietf.utils.slowpages import get_metrics as get_slow_page_metrics
 
 
 def top_level(request):
@@ -257,6 +260,17 @@ def nfs_metrics(request):
     response=f'nfs_latency_seconds{{operation="write"}} {write_latency}\nnfs_latency_seconds{{operation="read"}} {read_latency}\n'
     return HttpResponse(response)
 
+@requires_api_token
+@csrf_exempt
+def slow_page_metrics(request):
+    lines = []
+    for name, counters in get_slow_page_metrics().items():
+        for result in ("hit", "stale", "miss"):
+            lines.append(f'slowpages_requests_total{{value="{name}",result="{result}"}} {counters[result]}')
+        lines.append(f'slowpages_compute_total{{value="{name}"}} {counters["compute"]}')
+        lines.append(f'slowpages_compute_seconds_total{{value="{name}"}} {counters["compute_ms"] / 1000}')
+    return HttpResponse("".join(f"{line}\n" for line in lines))
+
 def find_doc_for_rfcdiff(name, rev):
     """rfcdiff lookup heuristics
 
@@ -468,21 +482,59 @@ def directauth(request):
         return HttpResponse(status=405)
 
 
+def _email_aliases_response(request, kind, generate_aliases):
+    """Respond with the draft or group email aliases
+
+    Once the EmailAlias snapshot has been built (by update_email_aliases_task),
+    it is brought up to date incrementally and served with a version token.
+    Passing that token back as the "since" parameter returns only the aliases
+    changed since that version, plus the names of those removed. Until then,
+    generate_aliases() is called to build the alias list from scratch.
+    """
+    since = request.GET.get("since", None)
+    if since is not None and not since.isdigit():
+        return HttpResponseBadRequest("Invalid since parameter")
+    if not EmailAliasBuild.objects.exists():
+        return JsonResponse({"aliases": generate_aliases()})
+
+    build = update_email_aliases()
+    entries = EmailAlias.objects.filter(kind=kind).order_by("alias")
+    if since is None:
+        entries = entries.filter(deleted=False)
+    else:
+        entries = entries.filter(build__gt=int(since))
+    response = {
+        "version": str(build.pk),
+        "aliases": [
+            {
+                "alias": e.alias,
+                "domains": e.domains,
+                "addresses": e.addresses,
+            }
+            for e in entries
+            if not e.deleted
+        ],
+    }
+    if since is not None:
+        response["removed"] = [e.alias for e in entries if e.deleted]
+    return JsonResponse(response)
+
+
 @requires_api_token
 @csrf_exempt
 def draft_aliases(request):
     if request.method == "GET":
-        return JsonResponse(
-            {
-                "aliases": [
-                    {
-                        "alias": alias,
-                        "domains": ["ietf"],
-                        "addresses": address_list,
-                    }
-                    for alias, address_list in DraftAliasGenerator()
-                ]
-            }
+        return _email_aliases_response(
+            request,
+            "draft",
+            lambda: [
+                {
+                    "alias": alias,
+                    "domains": ["ietf"],
+                    "addresses": address_list,
+                }
+                for alias, address_list in DraftAliasGenerator()
+            ],
         )
     return HttpResponse(status=405)
 
@@ -491,17 +543,17 @@ def draft_aliases(request):
 @csrf_exempt
 def group_aliases(request):
     if request.method == "GET":
-        return JsonResponse(
-            {
-                "aliases": [
-                    {
-                        "alias": alias,
-                        "domains": domains,
-                        "addresses": address_list,
-                    } 
-                    for alias, domains, address_list in GroupAliasGenerator()
-                ]
-            }
+        return _email_aliases_response(
+            request,
+            "group",
+            lambda: [
+                {
+                    "alias": alias,
+                    "domains": domains,
+                    "addresses": address_list,
+                } 
+                for alias, domains, address_list in GroupAliasGenerator()
+            ],
         )
     return HttpResponse(status=405)
 
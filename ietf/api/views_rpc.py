@@ -44,6 +44,7 @@
 from ietf.doc.tasks import (
     signal_update_rfc_metadata_task,
     rebuild_reference_relations_task,
+    render_document_artifacts_task,
     trigger_red_precomputer_task,
     update_rfc_searchindex_task,
 )
@@ -574,6 +575,8 @@ def post(self, request):
         update_rfc_searchindex_task.delay(rfc.rfc_number)
         # Trigger reference relations rebuild
         rebuild_reference_relations_task.delay(doc_names=[rfc.name])
+        # Pre-render the htmlized and pdfized forms
+        transaction.on_commit(partial(render_document_artifacts_task.delay, rfc.name))
         # Build rfc json (json for related rfcs was updated in RfcPubNotificationView) 
         transaction.on_commit(partial(update_rfc_json_task.delay, [rfc.rfc_number]))
         return Response(NotificationAckSerializer().data)
@@ -1,17 +1,32 @@
 # Copyright The IETF Trust 2025-2026, All Rights Reserved
 from django.contrib import admin
-from django.db.models import QuerySet
-from django.db.models.functions import Length
+from django.db.models import Case, OuterRef, QuerySet, Subquery, Sum, When
+from django.db.models.functions import Coalesce, Length
 from rangefilter.filters import DateRangeQuickSelectListFilterBuilder
 
 from .apps import get_blobdb
-from .models import Blob, ResolvedMaterial
+from .models import Blob, BlobChunk, BlobContent, PendingReplication, ResolvedMaterial
 from .utils import queue_for_replication
 
 
+def _chunks_length(**owner):
+    """Expression for the total length of the chunks of a Blob or BlobContent"""
+    return Coalesce(
+        Subquery(
+            BlobChunk.objects.filter(**owner)
+            .order_by()
+            .values(*owner)
+            .annotate(length=Sum(Length("data")))
+            .values("length")
+        ),
+        0,
+    )
+
+
 @admin.register(Blob)
 class BlobAdmin(admin.ModelAdmin):
     list_display = ["bucket", "name", "object_size", "modified", "mtime", "content_type"]
+    raw_id_fields = ["shared_content"]
     list_filter = [
         "bucket",
         "content_type",
@@ -26,7 +41,25 @@ def get_queryset(self, request):
         return (
             super().get_queryset(request)
             .defer("content")  # don't load this unless we want it
-            .annotate(object_size=Length("content"))  # accessed via object_size()
+            # accessed via object_size(), computed like SQL_BLOB_COLUMNS does
+            .annotate(
+                object_size=Case(
+                    When(
+                        shared_content__isnull=True,
+                        chunk_size__isnull=True,
+                        then=Length("content"),
+                    ),
+                    When(
+                        shared_content__isnull=True,
+                        then=_chunks_length(blob=OuterRef("pk")),
+                    ),
+                    When(
+                        shared_content__chunk_size__isnull=True,
+                        then=Length("shared_content__content"),
+                    ),
+                    default=_chunks_length(blob_content=OuterRef("shared_content")),
+                )
+            )
         )
 
     @admin.display(ordering="object_size")
@@ -56,3 +89,23 @@ class ResolvedMaterialAdmin(admin.ModelAdmin):
     list_filter = ["meeting_number", "bucket"]
     search_fields = ["name", "blob"]
     ordering = ["name"]
+
+
+@admin.register(PendingReplication)
+class PendingReplicationAdmin(admin.ModelAdmin):
+    model = PendingReplication
+    list_display = ["bucket", "name", "queued"]
+    list_filter = ["bucket", ("queued", DateRangeQuickSelectListFilterBuilder())]
+    search_fields = ["name"]
+    ordering = ["queued"]
+
+
+@admin.register(BlobContent)
+class BlobContentAdmin(admin.ModelAdmin):
+    model = BlobContent
+    list_display = ["checksum", "references", "chunk_size"]
+    search_fields = ["checksum"]
+    ordering = ["-references"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("content")
@@ -22,6 +22,11 @@ def ready(self):
 
         validate_replication_settings()
 
+        # Validate read cache settings
+        from .cache import validate_read_cache_settings
+
+        validate_read_cache_settings()
+
 
 def get_blobdb():
     """Retrieve the blobdb setting from Django's settings"""
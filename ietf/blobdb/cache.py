@@ -0,0 +1,204 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+"""Read-through cache for small, frequently read blobs
+
+Each blob's current metadata is kept in a shared Django cache under its bucket
+and name. Contents are keyed by checksum, so they never go stale. They are kept
+in the shared cache and in a size-bounded LRU within each process. A change to a
+blob drops its metadata from the shared cache when the change commits, so every
+process sees the new checksum on its next read.
+
+A read that loads metadata from the database can race with a change that commits
+while it runs, so metadata is only cached for METADATA_TIMEOUT seconds.
+"""
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.functions import Length
+
+DEFAULT_SETTINGS = {
+    "ENABLED": True,
+    "CACHE": "default",  # shared cache alias
+    "MAX_OBJECT_SIZE": 256 * 1024,  # larger blobs are never cached
+    "LOCAL_MAX_BYTES": 32 * 1024 * 1024,  # bound on each process's LRU
+    "METADATA_TIMEOUT": 300,  # seconds
+    "CONTENT_TIMEOUT": 24 * 60 * 60,  # seconds
+}
+
+
+def get_read_cache_settings():
+    return DEFAULT_SETTINGS | getattr(settings, "BLOBDB_READ_CACHE", {})
+
+
+def validate_read_cache_settings():
+    read_cache_settings = get_read_cache_settings()
+    unknown_settings = set(read_cache_settings.keys()) - set(DEFAULT_SETTINGS.keys())
+    if len(unknown_settings) > 0:
+        raise RuntimeError(
+            f"Unrecognized BLOBDB_READ_CACHE settings: {', '.join(unknown_settings)}"
+        )
+    if read_cache_settings["CACHE"] not in settings.CACHES:
+        raise RuntimeError(
+            f"BLOBDB_READ_CACHE uses unknown cache '{read_cache_settings['CACHE']}'"
+        )
+    for setting_name in [
+        "MAX_OBJECT_SIZE",
+        "LOCAL_MAX_BYTES",
+        "METADATA_TIMEOUT",
+        "CONTENT_TIMEOUT",
+    ]:
+        value = read_cache_settings[setting_name]
+        if not isinstance(value, int) or value < 0:
+            raise RuntimeError(f"{setting_name} must be a non-negative int")
+
+
+@dataclass
+class CachedBlobMetadata:
+    checksum: str
+    size: int
+    modified: datetime.datetime
+    mtime: Optional[datetime.datetime]
+    content_type: str
+
+
+class LocalContentCache:
+    """Thread-safe LRU of contents by checksum, bounded by their total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, checksum) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(checksum)
+            if content is not None:
+                self._entries.move_to_end(checksum)
+            return content
+
+    def set(self, checksum, content: bytes):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if checksum in self._entries:
+                self._entries.move_to_end(checksum)
+                return
+            self._entries[checksum] = content
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_local_content_cache = LocalContentCache(DEFAULT_SETTINGS["LOCAL_MAX_BYTES"])
+
+
+def local_content_cache():
+    _local_content_cache.max_bytes = get_read_cache_settings()["LOCAL_MAX_BYTES"]
+    return _local_content_cache
+
+
+def _metadata_key(bucket, name):
+    return f"blobdb:read-cache:metadata:{bucket}:{name}"
+
+
+def _content_key(checksum):
+    return f"blobdb:read-cache:content:{checksum}"
+
+
+def read_cache_enabled():
+    return get_read_cache_settings()["ENABLED"]
+
+
+def get_cached_blob(storage, name) -> tuple[CachedBlobMetadata, Optional[bytes]]:
+    """Get metadata and contents of a blob via the read cache
+
+    The contents are None if the blob is too large to cache. Raises
+    FileNotFoundError if the blob does not exist.
+    """
+    read_cache_settings = get_read_cache_settings()
+    shared_cache = caches[read_cache_settings["CACHE"]]
+    metadata_key = _metadata_key(storage.bucket_name, name)
+    metadata = shared_cache.get(metadata_key)
+    if metadata is None:
+        metadata = _load_metadata(storage, name)
+        shared_cache.set(
+            metadata_key, metadata, timeout=read_cache_settings["METADATA_TIMEOUT"]
+        )
+    if metadata.size > read_cache_settings["MAX_OBJECT_SIZE"]:
+        return metadata, None
+    content = local_content_cache().get(metadata.checksum)
+    if content is None:
+        content = shared_cache.get(_content_key(metadata.checksum))
+        if content is not None:
+            local_content_cache().set(metadata.checksum, content)
+    if content is None:
+        blob = _get_blob(storage, name)
+        if blob.checksum != metadata.checksum:
+            return _blob_metadata(blob), None  # changed since the metadata was read
+        with blob.open_content() as f:
+            content = bytes(f.read())
+        _cache_content(metadata.checksum, content, shared_cache, read_cache_settings)
+    return metadata, content
+
+
+def _get_blob(storage, name, queryset=None):
+    from .models import Blob
+
+    try:
+        if queryset is None:
+            queryset = storage.get_queryset()
+        return queryset.get(name=name)
+    except Blob.DoesNotExist:
+        raise FileNotFoundError(
+            f"No object '{name}' exists in bucket '{storage.bucket_name}'"
+        )
+
+
+def _blob_metadata(blob, size=None):
+    return CachedBlobMetadata(
+        checksum=blob.checksum,
+        size=blob.content_length() if size is None else size,
+        modified=blob.modified,
+        mtime=blob.mtime,
+        content_type=blob.content_type,
+    )
+
+
+def _load_metadata(storage, name):
+    blob = _get_blob(
+        storage,
+        name,
+        queryset=storage.get_queryset()
+        .defer("content")
+        .annotate(inline_size=Length("content")),
+    )
+    if blob.shared_content_id is None and not blob.is_chunked:
+        return _blob_metadata(blob, size=blob.inline_size)
+    return _blob_metadata(blob)
+
+
+def _cache_content(checksum, content, shared_cache, read_cache_settings):
+    local_content_cache().set(checksum, content)
+    shared_cache.set(
+        _content_key(checksum), content, timeout=read_cache_settings["CONTENT_TIMEOUT"]
+    )
+
+
+def invalidate_cached_blob(bucket, name, using=None):
+    """Drop a blob's cached metadata once the current transaction commits"""
+    shared_cache = caches[get_read_cache_settings()["CACHE"]]
+    transaction.on_commit(
+        lambda: shared_cache.delete(_metadata_key(bucket, name)), using=using
+    )
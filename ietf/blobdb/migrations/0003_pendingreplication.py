@@ -0,0 +1,60 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blobdb", "0002_resolvedmaterial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingReplication",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.CharField(
+                        help_text="Bucket of the changed blob", max_length=1024
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Name of the changed blob", max_length=1024
+                    ),
+                ),
+                (
+                    "queued",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Time of the latest change to the blob",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["queued"], name="blobdb_pend_queued_8a9aca_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pendingreplication",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "name"), name="unique_pending_replication"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blobdb", "0003_pendingreplication"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blob",
+            name="chunk_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="Size of the BlobChunks holding the contents, if not held in content",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="BlobChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "index",
+                    models.PositiveIntegerField(
+                        help_text="Position of the chunk in the blob"
+                    ),
+                ),
+                ("data", models.BinaryField(help_text="Content of the chunk")),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="blobdb.blob",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="blobchunk",
+            constraint=models.UniqueConstraint(
+                fields=("blob", "index"), name="unique_index_per_blob"
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blobdb", "0004_blob_chunk_size_blobchunk"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlobContent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.CharField(
+                        help_text="SHA-384 digest of the content",
+                        max_length=96,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "content",
+                    models.BinaryField(
+                        blank=True, help_text="Content, if not held in chunks"
+                    ),
+                ),
+                (
+                    "chunk_size",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        default=None,
+                        help_text="Size of the BlobChunks holding the contents, if not held in content",
+                        null=True,
+                    ),
+                ),
+                (
+                    "references",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of Blobs with these contents"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="blob",
+            name="shared_content",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Shared contents, if not held by the blob itself",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="blobs",
+                to="blobdb.blobcontent",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blobchunk",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="blobdb.blob",
+            ),
+        ),
+        migrations.AddField(
+            model_name="blobchunk",
+            name="blob_content",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="blobdb.blobcontent",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="blobchunk",
+            constraint=models.UniqueConstraint(
+                fields=("blob_content", "index"), name="unique_index_per_blob_content"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="blobchunk",
+            constraint=models.CheckConstraint(
+                check=models.Q(("blob__isnull", True))
+                ^ models.Q(("blob_content__isnull", True)),
+                name="blobchunk_has_one_owner",
+            ),
+        ),
+    ]
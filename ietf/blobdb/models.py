@@ -1,12 +1,22 @@
 # Copyright The IETF Trust 2025-2026, All Rights Reserved
+import io
+import uuid
+from collections.abc import Iterable
 from hashlib import sha384
 
-from django.db import models, transaction
+from django.conf import settings
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Length
 from django.utils import timezone
 
 from .apps import get_blobdb
+from .cache import invalidate_cached_blob
 from .utils import queue_for_replication
 
+# Content larger than this is stored in BlobChunks of this size
+BLOB_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 class BlobQuerySet(models.QuerySet):
     """QuerySet customized for Blob management
@@ -29,6 +39,94 @@ def bulk_update(self, *args, **kwargs):
         raise NotImplementedError("Updating Blobs in bulk is not supported")
 
 
+class BlobContent(models.Model):
+    """Contents shared by every Blob with the same checksum
+
+    Only used for buckets listed in settings.BLOBDB_SHARED_CONTENT_BUCKETS.
+    references counts the Blobs using the contents; they are deleted when it
+    drops to zero.
+    """
+    checksum = models.CharField(
+        max_length=96, unique=True, help_text="SHA-384 digest of the content"
+    )
+    content = models.BinaryField(blank=True, help_text="Content, if not held in chunks")
+    chunk_size = models.PositiveIntegerField(
+        default=None,
+        blank=True,
+        null=True,
+        help_text="Size of the BlobChunks holding the contents, if not held in content",
+    )
+    references = models.PositiveIntegerField(
+        default=0, help_text="Number of Blobs with these contents"
+    )
+
+    def __str__(self):
+        return f"{self.checksum[:16]}... ({self.references} references)"
+
+    def content_length(self):
+        if self.chunk_size is not None:
+            return chunked_content_length(blob_content_id=self.pk)
+        return len(self.content)
+
+    def open_content(self):
+        if self.chunk_size is not None:
+            return BlobChunkReader(
+                self.chunk_size, self.content_length(), blob_content_id=self.pk
+            )
+        return io.BytesIO(self.content)
+
+
+def shared_content_enabled(bucket: str):
+    return bucket in getattr(settings, "BLOBDB_SHARED_CONTENT_BUCKETS", ())
+
+
+def _acquire_blob_content(checksum, content=b"", using=None):
+    """Add a reference to the shared contents with a checksum, creating them if needed
+
+    Done as a single upsert, so that concurrent saves of the same new contents
+    don't both try to create them and fail on the unique checksum.
+    """
+    using = using or router.db_for_write(BlobContent)
+    table = BlobContent._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (checksum, content, "references") VALUES (%s, %s, 1) '
+            f'ON CONFLICT (checksum) DO UPDATE SET "references" = {table}."references" + 1 '
+            "RETURNING id",
+            [checksum, content],
+        )
+        (pk,) = cursor.fetchone()
+    return BlobContent.objects.using(using).defer("content").get(pk=pk)
+
+
+def _release_blob_content(blob_content_id, using=None):
+    """Drop a reference to shared contents, deleting them if it was the last one"""
+    contents = BlobContent.objects.using(using).filter(pk=blob_content_id)
+    contents.update(references=F("references") - 1)
+    contents.filter(references__lte=0).delete()
+
+
+def _write_chunks(chunks: Iterable[bytes], chunk_size, using=None, **owner):
+    """Store contents as BlobChunks of chunk_size belonging to owner
+
+    Returns the SHA-384 hex digest of the contents.
+    """
+    digest = sha384(usedforsecurity=False)
+    pending = b""
+    index = 0
+    for data in chunks:
+        pending += data
+        while len(pending) >= chunk_size:
+            chunk, pending = pending[:chunk_size], pending[chunk_size:]
+            digest.update(chunk)
+            BlobChunk.objects.using(using).create(index=index, data=chunk, **owner)
+            index += 1
+    if len(pending) > 0:
+        digest.update(pending)
+        BlobChunk.objects.using(using).create(index=index, data=pending, **owner)
+    return digest.hexdigest()
+
+
 class Blob(models.Model):
     objects = BlobQuerySet.as_manager()
     name = models.CharField(max_length=1024, help_text="Name of the blob")
@@ -53,6 +151,20 @@ class Blob(models.Model):
         blank=True,
         help_text="content-type header value for the blob contents",
     )
+    chunk_size = models.PositiveIntegerField(
+        default=None,
+        blank=True,
+        null=True,
+        help_text="Size of the BlobChunks holding the contents, if not held in content",
+    )
+    shared_content = models.ForeignKey(
+        BlobContent,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="blobs",
+        help_text="Shared contents, if not held by the blob itself",
+    )
 
     class Meta:
         constraints = [
@@ -61,25 +173,275 @@ class Meta:
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so the reference can be dropped when the contents change
+        instance._loaded_shared_content_id = instance.__dict__.get("shared_content_id")
+        return instance
+
     def __str__(self):
         return f"{self.bucket}:{self.name}"
 
+    @property
+    def is_chunked(self):
+        return self.chunk_size is not None
+
     def save(self, **kwargs):
+        """Save the blob
+
+        The contents are taken from content unless they are held in chunks or
+        shared. To replace those, clear chunk_size and shared_content along with
+        setting content, or use save_chunked().
+        """
         db = get_blobdb()
         with transaction.atomic(using=db):
-            self.checksum = sha384(self.content, usedforsecurity=False).hexdigest()
+            replacing = not self._state.adding
+            update_fields = kwargs.get("update_fields")
+            new_contents = (
+                (update_fields is None or "content" in update_fields)
+                and not self.is_chunked
+                and self.shared_content_id is None
+            )
+            if new_contents:
+                self.checksum = sha384(self.content, usedforsecurity=False).hexdigest()
+                if shared_content_enabled(self.bucket):
+                    self.shared_content = _acquire_blob_content(
+                        self.checksum, self.content, using=db
+                    )
+                    self.content = b""
             super().save(**kwargs)
+            if new_contents:
+                if replacing:
+                    # drop chunks left over from when the contents were chunked
+                    BlobChunk.objects.using(db).filter(blob=self).delete()
+                self._release_replaced_content(db)
+            self._emit_blob_change_event(using=db)
+
+    def save_chunked(self, chunks: Iterable[bytes]):
+        """Save the blob with contents read from an iterable of bytes
+
+        The contents are stored as BlobChunks of BLOB_CHUNK_SIZE and hashed as
+        they are read, so they are never held in memory as a whole.
+        """
+        db = get_blobdb()
+        with transaction.atomic(using=db):
+            replacing = not self._state.adding
+            self.content = b""
+            if shared_content_enabled(self.bucket):
+                self.chunk_size = None
+                self.shared_content = self._store_shared_chunks(chunks, db)
+                self.checksum = self.shared_content.checksum
+                super().save()
+                if replacing:
+                    BlobChunk.objects.using(db).filter(blob=self).delete()
+            else:
+                self.chunk_size = BLOB_CHUNK_SIZE
+                self.shared_content = None
+                super().save()
+                BlobChunk.objects.using(db).filter(blob=self).delete()
+                self.checksum = _write_chunks(chunks, self.chunk_size, using=db, blob=self)
+                super().save(update_fields=["checksum"])
+            self._release_replaced_content(db)
             self._emit_blob_change_event(using=db)
 
+    def save_metadata(self, replicate=True):
+        """Save changes to the metadata of the blob, leaving its contents alone
+
+        Unless replicate is set, the change is not replicated.
+        """
+        db = get_blobdb()
+        with transaction.atomic(using=db):
+            super().save(update_fields=["modified", "mtime", "content_type"])
+            self._emit_blob_change_event(using=db, replicate=replicate)
+
+    @staticmethod
+    def _store_shared_chunks(chunks, using):
+        # The checksum is only known once everything has been written, so write
+        # to provisional contents and throw them away if they turn out to exist
+        provisional = BlobContent.objects.using(using).create(
+            checksum=f"provisional-{uuid.uuid4().hex}", chunk_size=BLOB_CHUNK_SIZE
+        )
+        checksum = _write_chunks(
+            chunks, provisional.chunk_size, using=using, blob_content=provisional
+        )
+        if BlobContent.objects.using(using).filter(checksum=checksum).exists():
+            provisional.delete()
+        else:
+            try:
+                with transaction.atomic(using=using):
+                    provisional.checksum = checksum
+                    provisional.save(update_fields=["checksum"])
+            except IntegrityError:
+                provisional.delete()  # the same contents were stored concurrently
+        return _acquire_blob_content(checksum, using=using)
+
+    def _release_replaced_content(self, using):
+        replaced = getattr(self, "_loaded_shared_content_id", None)
+        if replaced is not None:
+            _release_blob_content(replaced, using=using)
+        self._loaded_shared_content_id = self.shared_content_id
+
+    def content_length(self):
+        if self.shared_content_id is not None:
+            return self.shared_content.content_length()
+        if self.is_chunked:
+            return chunked_content_length(blob_id=self.pk)
+        return len(self.content)
+
+    def open_content(self):
+        """Get a read-only file-like object for the contents"""
+        if self.shared_content_id is not None:
+            return self.shared_content.open_content()
+        if self.is_chunked:
+            return BlobChunkReader(self.chunk_size, self.content_length(), blob_id=self.pk)
+        return io.BytesIO(self.content)
+
     def delete(self, **kwargs):
         db = get_blobdb()
         with transaction.atomic(using=db):
+            shared_content_id = self.shared_content_id
             retval = super().delete(**kwargs)
+            if shared_content_id is not None:
+                _release_blob_content(shared_content_id, using=db)
             self._emit_blob_change_event(using=db)
         return retval
 
-    def _emit_blob_change_event(self, using: str | None=None):
-        queue_for_replication(self.bucket, self.name, using=using)
+    def _emit_blob_change_event(self, using: str | None=None, replicate=True):
+        invalidate_cached_blob(self.bucket, self.name, using=using)
+        if replicate:
+            queue_for_replication(self.bucket, self.name, using=using)
+
+
+class BlobChunk(models.Model):
+    """A piece of contents too large to keep in a single field
+
+    Chunks belong to either a Blob or a BlobContent. Every chunk but the last
+    holds exactly the chunk_size of its owner.
+    """
+    blob = models.ForeignKey(Blob, null=True, blank=True, on_delete=models.CASCADE)
+    blob_content = models.ForeignKey(
+        BlobContent, null=True, blank=True, on_delete=models.CASCADE
+    )
+    index = models.PositiveIntegerField(help_text="Position of the chunk in the blob")
+    data = models.BinaryField(help_text="Content of the chunk")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["blob", "index"], name="unique_index_per_blob"
+            ),
+            models.UniqueConstraint(
+                fields=["blob_content", "index"], name="unique_index_per_blob_content"
+            ),
+            models.CheckConstraint(
+                check=Q(blob__isnull=True) ^ Q(blob_content__isnull=True),
+                name="blobchunk_has_one_owner",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.blob_id or self.blob_content_id}[{self.index}]"
+
+
+def chunked_content_length(using=None, **owner):
+    """Total length of the chunks of a chunked Blob or BlobContent"""
+    return (
+        BlobChunk.objects.using(using or get_blobdb())
+        .filter(**owner)
+        .aggregate(length=Sum(Length("data")))["length"]
+    ) or 0
+
+
+class BlobChunkReader(io.RawIOBase):
+    """Seekable read-only file over the chunks of a chunked Blob or BlobContent
+
+    The owner of the chunks is given as a blob_id or blob_content_id keyword.
+    Holds at most one chunk in memory, fetching chunks as reading reaches them.
+    """
+
+    def __init__(self, chunk_size, size, using=None, **owner):
+        super().__init__()
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.size = size
+        self.using = using or get_blobdb()
+        self._pos = 0
+        self._chunk_index = None
+        self._chunk = b""
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        # Fill the whole buffer, even across chunks: callers such as s3transfer
+        # take a short read for the end of the file
+        buffer = memoryview(buffer).cast("B")
+        count = 0
+        while count < len(buffer) and self._pos < self.size:
+            index, offset = divmod(self._pos, self.chunk_size)
+            if index != self._chunk_index:
+                self._chunk = bytes(
+                    BlobChunk.objects.using(self.using)
+                    .filter(index=index, **self.owner)
+                    .values_list("data", flat=True)
+                    .get()
+                )
+                self._chunk_index = index
+            n = min(len(buffer) - count, len(self._chunk) - offset)
+            if n <= 0:
+                break  # chunks shorter than recorded size
+            buffer[count : count + n] = self._chunk[offset : offset + n]
+            self._pos += n
+            count += n
+        return count
+
+
+class PendingReplication(models.Model):
+    """A blob whose latest change has not been replicated yet
+
+    There is at most one entry per blob, however often it changed. Entries are
+    written in the same transaction as the change itself and removed once the
+    replicator has pushed the blob as of that change.
+    """
+    bucket = models.CharField(max_length=1024, help_text="Bucket of the changed blob")
+    name = models.CharField(max_length=1024, help_text="Name of the changed blob")
+    queued = models.DateTimeField(
+        default=timezone.now, help_text="Time of the latest change to the blob"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "name"], name="unique_pending_replication"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["queued"]),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket}:{self.name} (queued {self.queued.isoformat()})"
 
 
 class ResolvedMaterial(models.Model):
@@ -1,13 +1,19 @@
 # Copyright The IETF Trust 2025, All Rights Reserved
 import datetime
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import reduce
 from io import BytesIO
+from operator import or_
 from typing import Optional
 
 from django.conf import settings
 from django.core.files import File
 from django.core.files.storage import storages, InvalidStorageError
-from django.db import connections
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
 
 from ietf.utils import log
 
@@ -17,6 +23,9 @@
     "INCLUDE_BUCKETS": (),  # empty means include all
     "EXCLUDE_BUCKETS": (),  # empty means exclude none
     "VERBOSE_LOGGING": False,
+    "BATCH_SIZE": 100,  # blobs fetched from the blobdb per query
+    "MAX_WORKERS": 8,  # concurrent uploads to the replica
+    "BATCH_DELAY": 5,  # seconds to collect changes before replicating them
 }
 
 
@@ -56,6 +65,13 @@ def validate_replication_settings():
     exclude_buckets = replicator_settings["EXCLUDE_BUCKETS"]
     if not isinstance(exclude_buckets, (list, tuple, set)):
         raise RuntimeError("EXCLUDE_BUCKETS must be a list, tuple, or set")
+    # batching parameters must be positive ints
+    for setting_name in ["BATCH_SIZE", "MAX_WORKERS"]:
+        value = replicator_settings[setting_name]
+        if not isinstance(value, int) or value < 1:
+            raise RuntimeError(f"{setting_name} must be a positive int")
+    if not isinstance(replicator_settings["BATCH_DELAY"], (int, float)):
+        raise RuntimeError("BATCH_DELAY must be a number of seconds")
     # if we have explicit include_buckets, make sure the necessary storages exist
     if len(include_buckets) > 0:
         include_storages = {destination_storage_name_for(b) for b in include_buckets}
@@ -106,15 +122,59 @@ class SqlBlob:
     modified: datetime.datetime
     mtime: Optional[datetime.datetime]
     content_type: str
+    id: Optional[int] = None
+    chunk_size: Optional[int] = None  # contents are in BlobChunks if set
+    shared_content_id: Optional[int] = None  # chunks belong to a BlobContent if set
+    size: int = 0
+
+    def open_content(self):
+        if self.chunk_size is None:
+            return BytesIO(self.content)
+        from .models import BlobChunkReader
+
+        if self.shared_content_id is not None:
+            return BlobChunkReader(
+                self.chunk_size, self.size, blob_content_id=self.shared_content_id
+            )
+        return BlobChunkReader(self.chunk_size, self.size, blob_id=self.id)
+
+
+# Columns for SqlBlob, from blobdb_blob b and its shared blobdb_blobcontent c
+SQL_BLOB_COLUMNS = """
+    b.id, COALESCE(c.content, b.content) AS content, b.checksum, b.modified,
+    b.mtime, b.content_type, COALESCE(c.chunk_size, b.chunk_size) AS chunk_size,
+    b.shared_content_id,
+    CASE
+        WHEN c.id IS NULL AND b.chunk_size IS NULL THEN octet_length(b.content)
+        WHEN c.id IS NULL THEN (
+            SELECT COALESCE(SUM(octet_length(data)), 0) FROM blobdb_blobchunk
+            WHERE blob_id=b.id
+        )
+        WHEN c.chunk_size IS NULL THEN octet_length(c.content)
+        ELSE (
+            SELECT COALESCE(SUM(octet_length(data)), 0) FROM blobdb_blobchunk
+            WHERE blob_content_id=c.id
+        )
+    END AS size
+"""
+SQL_BLOB_TABLES = """
+    blobdb_blob b LEFT JOIN blobdb_blobcontent c ON c.id = b.shared_content_id
+"""
+
+
+def _blobdb_connection():
+    from .apps import get_blobdb
+
+    return connections[get_blobdb() or DEFAULT_DB_ALIAS]
 
 
 def fetch_blob_via_sql(bucket: str, name: str) -> Optional[SqlBlob]:
-    blobdb_connection = connections["blobdb"]
+    blobdb_connection = _blobdb_connection()
     cursor = blobdb_connection.cursor()
     cursor.execute(
-        """
-        SELECT content, checksum, modified, mtime, content_type FROM blobdb_blob
-        WHERE bucket=%s AND name=%s LIMIT 1
+        f"""
+        SELECT {SQL_BLOB_COLUMNS} FROM {SQL_BLOB_TABLES}
+        WHERE b.bucket=%s AND b.name=%s LIMIT 1
         """,
         [bucket, name],
     )
@@ -126,24 +186,36 @@ def fetch_blob_via_sql(bucket: str, name: str) -> Optional[SqlBlob]:
     })
 
 
-def replicate_blob(bucket, name):
-    """Replicate a Blobdb blob to a Storage"""
-    if not replication_enabled(bucket):
-        if verbose_logging_enabled():
-            log.log(
-                f"Not replicating {bucket}:{name} because replication is not enabled for {bucket}"
-            )
-        return
+def fetch_blobs_via_sql(bucket: str, names: list[str]) -> dict[str, SqlBlob]:
+    """Fetch many blobs from a bucket in one query, keyed by name
 
-    try:
-        destination_storage = destination_storage_for(bucket)
-    except InvalidStorageError as e:
-        log.log(
-            f"Failed to replicate {bucket}:{name} because destination storage for {bucket} is not configured"
-        )
-        raise ReplicationError from e
+    Names of blobs that do not exist are missing from the result. Chunked
+    contents are not fetched; SqlBlob.open_content() streams them.
+    """
+    blobdb_connection = _blobdb_connection()
+    cursor = blobdb_connection.cursor()
+    cursor.execute(
+        f"""
+        SELECT b.name, {SQL_BLOB_COLUMNS} FROM {SQL_BLOB_TABLES}
+        WHERE b.bucket=%s AND b.name = ANY(%s)
+        """,
+        [bucket, list(names)],
+    )
+    col_names = [col[0] for col in cursor.description][1:]
+    return {
+        row[0]: SqlBlob(**{
+            col_name: row_val
+            for col_name, row_val in zip(col_names, row[1:])
+        })
+        for row in cursor.fetchall()
+    }
 
-    blob = fetch_blob_via_sql(bucket, name)
+
+def push_to_replica(destination_storage, bucket: str, name: str, blob: Optional[SqlBlob]):
+    """Make the replica of a blob match its blobdb state
+
+    A blob of None deletes the replica.
+    """
     if blob is None:
         if verbose_logging_enabled():
             log.log(f"Deleting {bucket}:{name} from replica")
@@ -154,7 +226,7 @@ def replicate_blob(bucket, name):
             raise ReplicationError from e
     else:
         # Add metadata expected by the MetadataS3Storage
-        file_with_metadata = SimpleMetadataFile(file=BytesIO(blob.content))
+        file_with_metadata = SimpleMetadataFile(file=blob.open_content())
         file_with_metadata.content_type = blob.content_type
         file_with_metadata.custom_metadata = {
             "sha384": blob.checksum,
@@ -174,5 +246,145 @@ def replicate_blob(bucket, name):
             raise ReplicationError from e
 
 
+def _destination_storage_or_error(bucket: str, what: str):
+    try:
+        return destination_storage_for(bucket)
+    except InvalidStorageError as e:
+        log.log(
+            f"Failed to replicate {what} because destination storage for {bucket} is not configured"
+        )
+        raise ReplicationError from e
+
+
+def replicate_blob(bucket, name):
+    """Replicate a Blobdb blob to a Storage"""
+    if not replication_enabled(bucket):
+        if verbose_logging_enabled():
+            log.log(
+                f"Not replicating {bucket}:{name} because replication is not enabled for {bucket}"
+            )
+        return
+
+    destination_storage = _destination_storage_or_error(bucket, f"{bucket}:{name}")
+    push_to_replica(destination_storage, bucket, name, fetch_blob_via_sql(bucket, name))
+
+
+@dataclass
+class ReplicationStats:
+    """Throughput of the replicator for one bucket"""
+    saved: int = 0
+    deleted: int = 0
+    failed: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def __str__(self):
+        rate = self.bytes / self.seconds if self.seconds > 0 else 0.0
+        return (
+            f"{self.saved} saved, {self.deleted} deleted, {self.failed} failed, "
+            f"{self.bytes} bytes in {self.seconds:.2f}s ({rate / 1024:.1f} KiB/s)"
+        )
+
+
+def replicate_blobs(bucket: str, names: list[str], stats: ReplicationStats) -> set[str]:
+    """Replicate many blobs from one bucket, uploading them concurrently
+
+    Content is fetched in a single query. Returns the names that failed to
+    replicate and adds the outcome to stats.
+    """
+    if not replication_enabled(bucket):
+        if verbose_logging_enabled():
+            log.log(
+                f"Not replicating {len(names)} blob(s) because replication is not enabled for {bucket}"
+            )
+        return set()
+
+    start = time.monotonic()
+    destination_storage = _destination_storage_or_error(bucket, f"{len(names)} blob(s)")
+    blobs = fetch_blobs_via_sql(bucket, names)
+    # Chunked blobs read their contents through the ORM, so upload them from this
+    # thread rather than opening a database connection per worker thread
+    chunked = [name for name in names if name in blobs and blobs[name].chunk_size is not None]
+    max_workers = get_replication_settings()["MAX_WORKERS"]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+        futures = {
+            name: executor.submit(
+                push_to_replica, destination_storage, bucket, name, blobs.get(name)
+            )
+            for name in names
+            if name not in chunked
+        }
+        failed = set()
+        for name in chunked:
+            try:
+                push_to_replica(destination_storage, bucket, name, blobs[name])
+            except ReplicationError:
+                failed.add(name)
+    for name, future in futures.items():
+        if future.exception() is not None:
+            failed.add(name)
+    for name in names:
+        if name in failed:
+            continue
+        if name in blobs:
+            stats.saved += 1
+            stats.bytes += blobs[name].size
+        else:
+            stats.deleted += 1
+    stats.failed += len(failed)
+    stats.seconds += time.monotonic() - start
+    return failed
+
+
+def replicate_pending_blobs() -> dict[str, ReplicationStats]:
+    """Replicate the queued blob changes until none are left
+
+    Works through the PendingReplication entries in batches, oldest first. An
+    entry is removed once its blob is replicated, unless the blob changed again
+    in the meantime. Failed entries stay queued; a ReplicationError is raised
+    after everything else has been replicated so that the caller can retry.
+
+    Returns the throughput per bucket.
+    """
+    from .models import PendingReplication
+
+    batch_size = get_replication_settings()["BATCH_SIZE"]
+    stats: dict[str, ReplicationStats] = defaultdict(ReplicationStats)
+    failed_pks = set()
+    while True:
+        batch = list(
+            PendingReplication.objects.exclude(pk__in=failed_pks).order_by("queued")[:batch_size]
+        )
+        if len(batch) == 0:
+            break
+        by_bucket = defaultdict(list)
+        for entry in batch:
+            by_bucket[entry.bucket].append(entry)
+        done = []
+        for bucket, entries in by_bucket.items():
+            try:
+                failed_names = replicate_blobs(
+                    bucket, [entry.name for entry in entries], stats[bucket]
+                )
+            except ReplicationError:
+                failed_names = {entry.name for entry in entries}
+                stats[bucket].failed += len(entries)
+            for entry in entries:
+                if entry.name in failed_names:
+                    failed_pks.add(entry.pk)
+                else:
+                    done.append(entry)
+        if len(done) > 0:
+            PendingReplication.objects.filter(
+                reduce(or_, (Q(pk=entry.pk, queued=entry.queued) for entry in done))
+            ).delete()
+
+    for bucket, bucket_stats in sorted(stats.items()):
+        log.log(f"Replicated {bucket}: {bucket_stats}")
+    if len(failed_pks) > 0:
+        raise ReplicationError(f"Failed to replicate {len(failed_pks)} blob(s)")
+    return stats
+
+
 class ReplicationError(Exception):
     pass
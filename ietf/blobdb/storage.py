@@ -1,23 +1,28 @@
 # Copyright The IETF Trust 2025-2026, All Rights Reserved
+from hashlib import sha384
 from typing import Optional
 
 from django.core.exceptions import SuspiciousFileOperation
 from django.core.files.base import ContentFile
 from django.core.files.storage import Storage
+from django.db import transaction
 from django.db.models.functions import Length
 from django.utils.deconstruct import deconstructible
 from django.utils import timezone
 
 from ietf.utils.storage import MetadataFile
-from .models import Blob
+from .apps import get_blobdb
+from .cache import get_cached_blob, read_cache_enabled
+from .models import Blob, BlobContent, BLOB_CHUNK_SIZE, chunked_content_length
 from .utils import queue_for_replication
 
 
 class BlobFile(MetadataFile):
 
-    def __init__(self, content, name=None, mtime=None, content_type=""):
+    def __init__(self, content=b"", name=None, mtime=None, content_type="", file=None):
+        """Wrap content, or a file-like object to stream from if file is given"""
         super().__init__(
-            file=ContentFile(content),
+            file=ContentFile(content) if file is None else file,
             name=name,
             mtime=mtime,
             content_type=content_type,
@@ -48,15 +53,29 @@ def size(self, name):
             self.get_queryset()
             .filter(name=name)
             .annotate(object_size=Length("content"))
-            .values_list("object_size", flat=True)
+            .values_list("pk", "chunk_size", "object_size", "shared_content_id")
         )
         if len(sizes) == 0:
             raise FileNotFoundError(
                 f"No object '{name}' exists in bucket '{self.bucket_name}'"
             )
-        return sizes[0]  # unique constraint guarantees 0 or 1 entry
+        pk, chunk_size, object_size, shared_content_id = sizes[0]  # unique constraint guarantees 0 or 1 entry
+        if shared_content_id is not None:
+            return BlobContent.objects.using(get_blobdb()).get(pk=shared_content_id).content_length()
+        if chunk_size is not None:
+            return chunked_content_length(blob_id=pk)
+        return object_size
 
     def _open(self, name, mode="rb"):
+        if read_cache_enabled():
+            metadata, content = get_cached_blob(self, name)
+            if content is not None:
+                return BlobFile(
+                    content=content,
+                    name=name,
+                    mtime=metadata.mtime or metadata.modified,  # fall back to modified time
+                    content_type=metadata.content_type,
+                )
         try:
             blob = self.get_queryset().get(name=name)
         except Blob.DoesNotExist:
@@ -64,7 +83,7 @@ def _open(self, name, mode="rb"):
                 f"No object '{name}' exists in bucket '{self.bucket_name}'"
             )
         return BlobFile(
-            content=blob.content,
+            file=blob.open_content(),  # streams chunked contents
             name=blob.name,
             mtime=blob.mtime or blob.modified,  # fall back to modified time
             content_type=blob.content_type,
@@ -75,19 +94,47 @@ def _save(self, name, content):
         
         The storage API allows _save() to save to a different name than was requested. This method will
         never do that, instead overwriting the existing blob.
+
+        Contents larger than BLOB_CHUNK_SIZE are read and stored a chunk at a time. Saving
+        the contents a blob already has only updates its metadata, and is only replicated if
+        that changed.
         """
-        Blob.objects.update_or_create(
-            name=name,
-            bucket=self.bucket_name,
-            defaults={
-                "content": content.read(),
-                "modified": timezone.now(),
-                "mtime": getattr(content, "mtime", None),
-                "content_type": getattr(content, "content_type", ""),
-            },
-        )
+        with transaction.atomic(using=get_blobdb()):
+            blob = (
+                self.get_queryset().select_for_update().defer("content").filter(name=name).first()
+                or Blob(name=name, bucket=self.bucket_name)
+            )
+            old_metadata = (blob.mtime, blob.content_type)
+            blob.modified = timezone.now()
+            blob.mtime = getattr(content, "mtime", None)
+            blob.content_type = getattr(content, "content_type", "")
+            if not blob._state.adding and blob.checksum == self._checksum(content):
+                blob.save_metadata(
+                    replicate=(blob.mtime, blob.content_type) != old_metadata
+                )
+                return name
+            size = getattr(content, "size", None)  # None if it cannot be determined
+            if size is None or size > BLOB_CHUNK_SIZE:
+                blob.save_chunked(content.chunks(BLOB_CHUNK_SIZE))
+            else:
+                blob.content = content.read()
+                blob.chunk_size = None
+                blob.shared_content = None
+                blob.save()
         return name
 
+    @staticmethod
+    def _checksum(content):
+        """SHA-384 hex digest of the contents, leaving content at its start"""
+        custom_metadata = getattr(content, "custom_metadata", {})
+        if "sha384" in custom_metadata:
+            return custom_metadata["sha384"]
+        digest = sha384(usedforsecurity=False)
+        for chunk in content.chunks(BLOB_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+
     def get_available_name(self, name, max_length=None):
         if max_length is not None and len(name) > max_length:
             raise SuspiciousFileOperation(
@@ -1,10 +1,14 @@
-# Copyright The IETF Trust 2025, All Rights Reserved
+# Copyright The IETF Trust 2025-2026, All Rights Reserved
 
 import json
 
 from celery import shared_task
+from django.core.cache import caches
 
-from .replication import replicate_blob, ReplicationError
+from .replication import replicate_blob, replicate_pending_blobs, ReplicationError
+
+# Set while a replicate_pending_blobs_task is scheduled but has not started
+REPLICATION_SCHEDULED_CACHE_KEY = "blobdb:replication-scheduled"
 
 
 @shared_task(
@@ -15,3 +19,12 @@ def pybob_the_blob_replicator_task(body: str):
     bucket = request["bucket"]
     name = request["name"]
     replicate_blob(bucket, name)
+
+
+@shared_task(
+    autoretry_for=(ReplicationError,), retry_backoff=10, retry_kwargs={"max_retries": 5}
+)
+def replicate_pending_blobs_task():
+    # Changes queued from here on need another run
+    caches["default"].delete(REPLICATION_SCHEDULED_CACHE_KEY)
+    replicate_pending_blobs()
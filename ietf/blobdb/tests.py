@@ -1,11 +1,20 @@
-# Copyright The IETF Trust 2025, All Rights Reserved
+# Copyright The IETF Trust 2025-2026, All Rights Reserved
 import datetime
+import io
+from hashlib import sha384
+from unittest import mock
 
+from django.contrib.admin.sites import site as admin_site
 from django.core.files.base import ContentFile
+from django.test import RequestFactory
+from django.test.utils import override_settings
 
 from ietf.utils.test_utils import TestCase
+from .admin import BlobAdmin
+from .cache import local_content_cache
 from .factories import BlobFactory
-from .models import Blob
+from .models import Blob, BlobContent, PendingReplication, _acquire_blob_content
+from .replication import replicate_pending_blobs, ReplicationError
 from .storage import BlobFile, BlobdbStorage
 
 
@@ -74,7 +83,163 @@ def test_open_null_mtime(self):
             self.assertEqual(f.mtime, blob.modified)
             self.assertEqual(f.content_type, "application/x-oh-no-you-didnt")
 
+    @mock.patch("ietf.blobdb.models.BLOB_CHUNK_SIZE", 8)
+    @mock.patch("ietf.blobdb.storage.BLOB_CHUNK_SIZE", 8)
+    def test_chunked_save_and_open(self):
+        storage = BlobdbStorage(bucket_name="my-bucket")
+        content = b"These bytes are stored in several chunks."
+        storage.save("big.txt", BlobFile(content=content, content_type="text/plain"))
+        blob = Blob.objects.get(bucket="my-bucket", name="big.txt")
+        self.assertEqual(blob.chunk_size, 8)
+        self.assertEqual(bytes(blob.content), b"")
+        self.assertEqual(blob.blobchunk_set.count(), 6)
+        self.assertEqual(blob.checksum, sha384(content).hexdigest())
+        self.assertEqual(storage.size("big.txt"), len(content))
+        with storage.open("big.txt", "rb") as f:
+            self.assertEqual(f.read(5), content[:5])
+            self.assertEqual(f.read(), content[5:])
+            f.seek(-7, io.SEEK_END)
+            self.assertEqual(f.read(), content[-7:])
+            self.assertEqual(f.custom_metadata["sha384"], blob.checksum)
+            self.assertEqual(f.custom_metadata["len"], str(len(content)))
+
+        blobs = BlobAdmin(Blob, admin_site).get_queryset(RequestFactory().get("/"))
+        self.assertEqual(blobs.get(pk=blob.pk).object_size, len(content))
+
+        # reads longer than a chunk are not cut short at the chunk boundary
+        with blob.open_content() as f:
+            self.assertEqual(f.read(20), content[:20])
+            self.assertEqual(f.read(20), content[20:40])
+            self.assertEqual(f.read(20), content[40:])
+            self.assertEqual(f.read(20), b"")
+
+        # shrinking the contents stores them inline again
+        storage.save("big.txt", BlobFile(content=b"small"))
+        blob.refresh_from_db()
+        self.assertIsNone(blob.chunk_size)
+        self.assertEqual(bytes(blob.content), b"small")
+        self.assertFalse(blob.blobchunk_set.exists())
+
+    @override_settings(
+        BLOBDB_SHARED_CONTENT_BUCKETS=["shared"], BLOBDB_REPLICATION={"ENABLED": True}
+    )
+    def test_shared_content(self):
+        storage = BlobdbStorage(bucket_name="shared")
+        storage.save("a.txt", BlobFile(content=b"same", content_type="text/plain"))
+        storage.save("b.txt", BlobFile(content=b"same", content_type="text/plain"))
+        blob_a = Blob.objects.get(bucket="shared", name="a.txt")
+        blob_b = Blob.objects.get(bucket="shared", name="b.txt")
+        self.assertEqual(blob_a.shared_content_id, blob_b.shared_content_id)
+        self.assertEqual(bytes(blob_a.content), b"")
+        shared_content = BlobContent.objects.get()
+        self.assertEqual(shared_content.references, 2)
+        self.assertEqual(shared_content.checksum, sha384(b"same").hexdigest())
+        self.assertEqual(storage.size("b.txt"), 4)
+        blobs = BlobAdmin(Blob, admin_site).get_queryset(RequestFactory().get("/"))
+        self.assertEqual(blobs.get(pk=blob_b.pk).object_size, 4)
+        with storage.open("b.txt", "rb") as f:
+            self.assertEqual(f.read(), b"same")
+
+        # re-saving unchanged contents with unchanged metadata is not replicated
+        PendingReplication.objects.all().delete()
+        storage.save("a.txt", BlobFile(content=b"same", content_type="text/plain"))
+        self.assertFalse(PendingReplication.objects.exists())
+        self.assertEqual(BlobContent.objects.get().references, 2)
+
+        storage.save("a.txt", BlobFile(content=b"different"))
+        self.assertTrue(PendingReplication.objects.filter(name="a.txt").exists())
+        self.assertEqual(BlobContent.objects.get(pk=shared_content.pk).references, 1)
+        storage.delete("b.txt")
+        self.assertFalse(BlobContent.objects.filter(pk=shared_content.pk).exists())
+        with storage.open("a.txt", "rb") as f:
+            self.assertEqual(f.read(), b"different")
+
+    def test_acquire_blob_content(self):
+        checksum = sha384(b"new").hexdigest()
+        first = _acquire_blob_content(checksum, b"new")
+        # a second acquire that did not see the first one's row still shares it
+        second = _acquire_blob_content(checksum, b"new")
+        self.assertEqual(first.pk, second.pk)
+        shared_content = BlobContent.objects.get(checksum=checksum)
+        self.assertEqual(shared_content.references, 2)
+        self.assertEqual(bytes(shared_content.content), b"new")
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "blobdb-read-cache",
+            },
+        },
+    )
+    def test_open_uses_read_cache(self):
+        storage = BlobdbStorage(bucket_name="my-bucket")
+        BlobFactory.create_batch(3, bucket="my-bucket")
+        with self.captureOnCommitCallbacks(execute=True):
+            storage.save("cached.txt", BlobFile(content=b"original"))
+        local_content_cache().clear()
+        # a miss reads the metadata and then the blob, not the rest of the bucket
+        with self.assertNumQueries(2):
+            with storage.open("cached.txt", "rb") as f:
+                self.assertEqual(f.read(), b"original")
+        with self.assertNumQueries(0):
+            with storage.open("cached.txt", "rb") as f:
+                self.assertEqual(f.read(), b"original")
+
+        # changes invalidate the cached metadata when they commit
+        with self.captureOnCommitCallbacks(execute=True):
+            storage.save("cached.txt", BlobFile(content=b"changed"))
+        with storage.open("cached.txt", "rb") as f:
+            self.assertEqual(f.read(), b"changed")
+        with self.captureOnCommitCallbacks(execute=True):
+            storage.delete("cached.txt")
+        with self.assertRaises(FileNotFoundError):
+            storage.open("cached.txt")
+
     def test_open_file_not_found(self):
         storage = BlobdbStorage(bucket_name="not-a-bucket")
         with self.assertRaises(FileNotFoundError):
             storage.open("definitely/not-a-file.txt")
+
+
+@override_settings(
+    BLOBDB_REPLICATION={"ENABLED": True, "EXCLUDE_BUCKETS": ["not-replicated"]}
+)
+class ReplicationTests(TestCase):
+    def test_queue_coalesces_changes(self):
+        blob = BlobFactory(bucket="replicated", name="a.txt")
+        blob.content = b"changed"
+        blob.save()
+        BlobFactory(bucket="replicated", name="b.txt")
+        BlobFactory(bucket="not-replicated", name="c.txt")
+        self.assertCountEqual(
+            PendingReplication.objects.values_list("bucket", "name"),
+            [("replicated", "a.txt"), ("replicated", "b.txt")],
+        )
+
+    @mock.patch("ietf.blobdb.replication.destination_storage_for")
+    def test_replicate_pending_blobs(self, mock_storage_for):
+        storage = mock_storage_for.return_value
+        BlobFactory(bucket="replicated", name="a.txt", content=b"aaa")
+        BlobFactory(bucket="replicated", name="b.txt", content=b"bbbb")
+        BlobFactory(bucket="replicated", name="gone.txt").delete()
+        stats = replicate_pending_blobs()
+        self.assertFalse(PendingReplication.objects.exists())
+        self.assertEqual(mock_storage_for.call_args, mock.call("replicated"))
+        self.assertCountEqual(
+            [c.args[0] for c in storage.save.call_args_list], ["a.txt", "b.txt"]
+        )
+        self.assertEqual(storage.delete.call_args, mock.call("gone.txt"))
+        self.assertEqual(stats["replicated"].saved, 2)
+        self.assertEqual(stats["replicated"].deleted, 1)
+        self.assertEqual(stats["replicated"].bytes, 7)
+
+        # failures stay queued for a retry
+        storage.reset_mock()
+        storage.save.side_effect = [Exception("nope"), None]
+        BlobFactory(bucket="replicated", name="c.txt")
+        BlobFactory(bucket="replicated", name="d.txt")
+        with self.assertRaises(ReplicationError):
+            replicate_pending_blobs()
+        self.assertEqual(storage.save.call_count, 2)
+        self.assertEqual(PendingReplication.objects.count(), 1)
@@ -1,11 +1,24 @@
 # Copyright The IETF Trust 2026, All Rights Reserved
-import json
-from functools import partial
-
+from django.core.cache import caches
 from django.db import transaction
+from django.utils import timezone
+
+from ietf.blobdb.replication import get_replication_settings, replication_enabled
+from ietf.blobdb.tasks import (
+    REPLICATION_SCHEDULED_CACHE_KEY,
+    replicate_pending_blobs_task,
+)
+
 
-from ietf.blobdb.replication import replication_enabled
-from ietf.blobdb.tasks import pybob_the_blob_replicator_task
+def schedule_replication():
+    """Start a replication run in a little while, unless one is already scheduled
+
+    Changes made before the run starts are all handled by it, so a burst of
+    changes costs a single task.
+    """
+    delay = get_replication_settings()["BATCH_DELAY"]
+    if caches["default"].add(REPLICATION_SCHEDULED_CACHE_KEY, True, timeout=delay):
+        replicate_pending_blobs_task.apply_async(countdown=delay)
 
 
 def queue_for_replication(bucket: str, name: str, using: str | None=None):
@@ -16,17 +29,14 @@ def queue_for_replication(bucket: str, name: str, using: str | None=None):
     if not replication_enabled(bucket):
         return
 
-    # For now, fire a celery task we've arranged to guarantee in-order processing.
-    # Later becomes pushing an event onto a queue to a dedicated worker.
-    transaction.on_commit(
-        partial(
-            pybob_the_blob_replicator_task.delay,
-            json.dumps(
-                {
-                    "name": name,
-                    "bucket": bucket,
-                }
-            )
-        ),
-        using=using,
+    from .models import PendingReplication
+
+    # Repeated changes to a blob collapse into one entry. The entry commits along
+    # with the change, and the dedicated blobdb worker drains the queue in order.
+    PendingReplication.objects.using(using).bulk_create(
+        [PendingReplication(bucket=bucket, name=name, queued=timezone.now())],
+        update_conflicts=True,
+        unique_fields=["bucket", "name"],
+        update_fields=["queued"],
     )
+    transaction.on_commit(schedule_replication, using=using)
@@ -8,7 +8,7 @@
 
 class CommunityListAdmin(admin.ModelAdmin):
     list_display = ['id', 'person', 'group']
-    raw_id_fields = ['person', 'group', 'added_docs']
+    raw_id_fields = ['person', 'group', 'added_docs', 'tracked_docs']
 admin.site.register(CommunityList, CommunityListAdmin)
 
 class SearchRuleAdmin(admin.ModelAdmin):
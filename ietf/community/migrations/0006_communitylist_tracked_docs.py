@@ -0,0 +1,77 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def forward(apps, schema_editor):
+    """Populate the tracked_docs table from the current added docs and search rules
+
+    This mirrors ietf.community.utils.compute_docs_tracked_by_community_list
+    using the historical models.
+    """
+    CommunityList = apps.get_model("community", "CommunityList")
+    Document = apps.get_model("doc", "Document")
+    RelatedDocument = apps.get_model("doc", "RelatedDocument")
+
+    def docs_matching_rule(rule):
+        docs = Document.objects.all()
+        if rule.rule_type.endswith("_rfc"):
+            docs = docs.filter(type_id="rfc")
+        else:
+            docs = docs.filter(type_id="draft", states=rule.state_id)
+
+        if rule.rule_type in ["group", "area", "group_rfc", "area_rfc"]:
+            return docs.filter(Q(group=rule.group_id) | Q(group__parent=rule.group_id))
+        elif rule.rule_type in ["group_exp"]:
+            return docs.filter(group=rule.group_id)
+        elif rule.rule_type.startswith("state_"):
+            return docs
+        elif rule.rule_type == "author":
+            return docs.filter(documentauthor__person=rule.person_id)
+        elif rule.rule_type == "author_rfc":
+            return docs.filter(
+                Q(rfcauthor__person=rule.person_id)
+                | Q(rfcauthor__isnull=True, documentauthor__person=rule.person_id)
+            )
+        elif rule.rule_type == "ad":
+            return docs.filter(ad=rule.person_id)
+        elif rule.rule_type == "shepherd":
+            return docs.filter(shepherd__person=rule.person_id)
+        elif rule.rule_type == "name_contains":
+            return docs.filter(searchrule=rule)
+        return Document.objects.none()
+
+    for clist in CommunityList.objects.all():
+        added_ids = set(clist.added_docs.values_list("pk", flat=True))
+        doc_ids = set(added_ids)
+        doc_ids.update(
+            RelatedDocument.objects.filter(
+                source__in=added_ids, relationship_id="became_rfc"
+            ).values_list("target", flat=True)
+        )
+        for rule in clist.searchrule_set.all():
+            doc_ids.update(docs_matching_rule(rule).values_list("pk", flat=True))
+        clist.tracked_docs.set(doc_ids)
+
+
+def reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("doc", "0038_rpcactionholderopenentry"),
+        ("community", "0005_user_to_person"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="communitylist",
+            name="tracked_docs",
+            field=models.ManyToManyField(
+                related_name="tracking_community_lists", to="doc.document"
+            ),
+        ),
+        migrations.RunPython(forward, reverse),
+    ]
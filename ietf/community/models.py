@@ -15,6 +15,12 @@ class CommunityList(models.Model):
     group = ForeignKey(Group, blank=True, null=True)
     added_docs = models.ManyToManyField(Document)
 
+    # materialized view of the documents tracked by this list - the
+    # added documents, the RFCs they became and everything matched by
+    # the search rules - kept current by the receivers in
+    # ietf.community.signals so the list can be read with a single join
+    tracked_docs = models.ManyToManyField(Document, related_name="tracking_community_lists")
+
     def long_name(self):
         if self.person:
             return 'Personal I-D list of %s' % self.person.plain_name()
@@ -2,11 +2,17 @@
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 
-from ietf.doc.models import DocEvent
+from ietf.doc.models import DocEvent, Document, DocumentAuthor, RelatedDocument, RfcAuthor
+from .models import CommunityList, SearchRule
 from .tasks import notify_event_to_subscribers_task
+from .utils import (
+    invalidate_search_rule_index,
+    update_community_lists_tracking_doc,
+    update_tracked_docs_for_community_list,
+)
 
 
 def notify_of_event(event: DocEvent):
@@ -42,3 +48,84 @@ def notify_of_events_receiver(sender, instance, **kwargs):
         return  # only notify on creation
 
     notify_of_event(instance)
+
+
+# The receivers below keep the materialized CommunityList.tracked_docs
+# table current. Anything that changes which rules match a document
+# (its own fields, states, authors or RFC relation) updates that document;
+# anything that changes the rules or added docs of a list updates that list.
+
+@receiver(post_save, sender=Document, dispatch_uid="community_list_tracking_doc_saved_uid")
+def doc_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_community_lists_tracking_doc(instance)
+
+
+@receiver(m2m_changed, sender=Document.states.through, dispatch_uid="community_list_tracking_doc_states_uid")
+def doc_states_changed_receiver(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        update_community_lists_tracking_doc(instance)
+
+
+@receiver(post_save, sender=DocumentAuthor, dispatch_uid="community_list_tracking_author_saved_uid")
+@receiver(post_save, sender=RfcAuthor, dispatch_uid="community_list_tracking_rfcauthor_saved_uid")
+def doc_author_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_community_lists_tracking_doc(instance.document)
+
+
+@receiver(post_delete, sender=DocumentAuthor, dispatch_uid="community_list_tracking_author_deleted_uid")
+@receiver(post_delete, sender=RfcAuthor, dispatch_uid="community_list_tracking_rfcauthor_deleted_uid")
+def doc_author_deleted_receiver(sender, instance, **kwargs):
+    doc = Document.objects.filter(pk=instance.document_id).first()
+    if doc is not None:
+        update_community_lists_tracking_doc(doc, prune_only=True)
+
+
+@receiver(post_save, sender=RelatedDocument, dispatch_uid="community_list_tracking_relation_saved_uid")
+def related_document_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw and instance.relationship_id == "became_rfc":
+        update_community_lists_tracking_doc(instance.target)
+
+
+@receiver(post_delete, sender=RelatedDocument, dispatch_uid="community_list_tracking_relation_deleted_uid")
+def related_document_deleted_receiver(sender, instance, **kwargs):
+    if instance.relationship_id == "became_rfc":
+        doc = Document.objects.filter(pk=instance.target_id).first()
+        if doc is not None:
+            update_community_lists_tracking_doc(doc, prune_only=True)
+
+
+@receiver(m2m_changed, sender=CommunityList.added_docs.through, dispatch_uid="community_list_tracking_added_docs_uid")
+def added_docs_changed_receiver(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        update_community_lists_tracking_doc(instance)
+    else:
+        update_tracked_docs_for_community_list(instance)
+
+
+@receiver(post_save, sender=SearchRule, dispatch_uid="community_list_tracking_rule_saved_uid")
+def search_rule_saved_receiver(sender, instance, raw=False, **kwargs):
+    invalidate_search_rule_index()
+    if not raw:
+        update_tracked_docs_for_community_list(instance.community_list)
+
+
+@receiver(post_delete, sender=SearchRule, dispatch_uid="community_list_tracking_rule_deleted_uid")
+def search_rule_deleted_receiver(sender, instance, **kwargs):
+    invalidate_search_rule_index()
+    clist = CommunityList.objects.filter(pk=instance.community_list_id).first()
+    if clist is not None:
+        update_tracked_docs_for_community_list(clist, prune_only=True)
+
+
+@receiver(m2m_changed, sender=SearchRule.name_contains_index.through, dispatch_uid="community_list_tracking_name_index_uid")
+def name_contains_index_changed_receiver(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        update_community_lists_tracking_doc(instance)
+    else:
+        update_tracked_docs_for_community_list(instance.community_list)
@@ -13,3 +13,16 @@ def notify_event_to_subscribers_task(event_id):
         log(f"Unable to send subscriber notifications because DocEvent {event_id} was not found")
     else:
         notify_event_to_subscribers(event)
+
+
+@shared_task
+def update_community_list_tracked_docs_task():
+    """Rebuild the materialized tracked_docs of every community list
+
+    The signal receivers keep these current; this is a safety net for
+    changes made without sending signals, e.g. bulk queryset updates.
+    """
+    from .models import CommunityList
+    from .utils import update_tracked_docs_for_community_list
+    for clist in CommunityList.objects.all():
+        update_tracked_docs_for_community_list(clist)
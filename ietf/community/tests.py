@@ -4,6 +4,7 @@
 from unittest import mock
 from pyquery import PyQuery
 
+from django.core.cache import cache
 from django.test.utils import override_settings
 from django.urls import reverse as urlreverse
 from lxml import etree
@@ -15,6 +16,14 @@
 from ietf.community.utils import (
     docs_matching_community_list_rule,
     community_list_rules_matching_doc,
+    compute_docs_tracked_by_community_list,
+    docs_tracked_by_community_list,
+    community_lists_tracking_doc,
+    search_rule_index,
+    SEARCH_RULE_INDEX_CACHE_KEY,
+    NameContainsMatcher,
+    reset_name_contains_indexes,
+    update_name_contains_indexes_with_new_doc,
 )
 from ietf.community.utils import (
     reset_name_contains_index_for_rule,
@@ -29,7 +38,7 @@
 from ietf.doc.utils import add_state_change_event
 from ietf.person.models import Person, Email, Alias
 from ietf.utils.test_utils import TestCase, login_testing_unauthorized
-from ietf.doc.factories import DocEventFactory, WgDraftFactory
+from ietf.doc.factories import DocEventFactory, WgDraftFactory, WgRfcFactory
 from ietf.group.factories import GroupFactory, RoleFactory
 from ietf.person.factories import PersonFactory, EmailFactory, AliasFactory
 
@@ -151,6 +160,147 @@ def test_rule_matching(self):
             draft in list(docs_matching_community_list_rule(rule_group_exp))
         )
 
+    def test_name_contains_matcher(self):
+        matcher = NameContainsMatcher([(1, "^draft-[^-]+-foo-"), (2, "bar"), (3, "bar"), (4, "(")])
+        self.assertEqual(matcher.matching_rule_ids("draft-ietf-foo-bar"), [1, 2, 3])
+        self.assertEqual(matcher.matching_rule_ids("draft-ietf-foobar"), [2, 3])
+        self.assertEqual(matcher.matching_rule_ids("draft-ietf-baz"), [])
+        # patterns that can't be combined are still matched one by one
+        matcher = NameContainsMatcher([(1, "(?P<x>foo)"), (2, "(?P<x>bar)")])
+        self.assertIsNone(matcher.combined)
+        self.assertEqual(matcher.matching_rule_ids("draft-bar"), [2])
+
+    def test_name_contains_indexes(self):
+        plain = PersonFactory(user__username="plain")
+        clist = CommunityList.objects.create(person=plain)
+        draft = WgDraftFactory()
+        other_draft = WgDraftFactory()
+        rule = SearchRule.objects.create(
+            community_list=clist,
+            rule_type="name_contains",
+            state=State.objects.get(type="draft", slug="active"),
+            text="^%s$" % draft.name,
+        )
+        self.assertEqual(list(rule.name_contains_index.all()), [])
+
+        counts = reset_name_contains_indexes(dry_run=True)
+        self.assertEqual(counts, {rule: (0, 1)})
+        self.assertEqual(list(rule.name_contains_index.all()), [])
+
+        counts = reset_name_contains_indexes()
+        self.assertEqual(counts, {rule: (0, 1)})
+        self.assertEqual(list(rule.name_contains_index.all()), [draft])
+        self.assertIn(draft, docs_tracked_by_community_list(clist))
+
+        rule.text = "^%s$" % other_draft.name
+        rule.save()
+        update_name_contains_indexes_with_new_doc(other_draft)
+        self.assertCountEqual(rule.name_contains_index.all(), [draft, other_draft])
+        self.assertIn(other_draft, docs_tracked_by_community_list(clist))
+
+    def test_name_contains_indexes_postgres_only_regex(self):
+        """Rules with regexes only PostgreSQL understands are matched in the database"""
+        plain = PersonFactory(user__username="plain")
+        clist = CommunityList.objects.create(person=plain)
+        draft = WgDraftFactory()
+        WgDraftFactory()
+        rule = SearchRule.objects.create(
+            community_list=clist,
+            rule_type="name_contains",
+            state=State.objects.get(type="draft", slug="active"),
+            text=r"^\m%s$" % draft.name,  # \m (start of word) is a bad escape for Python
+        )
+        self.assertIn(rule.text, NameContainsMatcher([(rule.pk, rule.text)]).uncompiled)
+
+        counts = reset_name_contains_indexes()
+        self.assertEqual(counts, {rule: (0, 1)})
+        self.assertEqual(list(rule.name_contains_index.all()), [draft])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test_search_rule_index_invalidation",
+    }})
+    def test_search_rule_index_invalidation(self):
+        """The cached search rule index must follow rule changes
+
+        Dev and test normally configure a dummy cache, hence the override.
+        """
+        plain = PersonFactory(user__username="plain")
+        clist = CommunityList.objects.create(person=plain)
+        draft = WgDraftFactory()
+        self.assertEqual(search_rule_index(), {})
+        self.assertNotIn(clist, community_lists_tracking_doc(draft))
+
+        rule = SearchRule.objects.create(
+            community_list=clist,
+            rule_type="group",
+            group=draft.group,
+            state=State.objects.get(type="draft", slug="active"),
+        )
+        self.assertIn(clist, community_lists_tracking_doc(draft))
+        self.assertEqual(list(community_list_rules_matching_doc(draft)), [rule])
+        with self.assertNumQueries(0):
+            search_rule_index()
+
+        rule.delete()
+        self.assertNotIn(clist, community_lists_tracking_doc(draft))
+        self.assertEqual(search_rule_index(), {})
+
+        # an index cached by another process before the commit is dropped on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            rule = SearchRule.objects.create(
+                community_list=clist,
+                rule_type="group",
+                group=draft.group,
+                state=State.objects.get(type="draft", slug="active"),
+            )
+            cache.set(SEARCH_RULE_INDEX_CACHE_KEY, {})
+        self.assertIsNone(cache.get(SEARCH_RULE_INDEX_CACHE_KEY))
+        self.assertIn(clist, community_lists_tracking_doc(draft))
+
+    def test_tracked_docs_maintained(self):
+        plain = PersonFactory(user__username="plain")
+        clist = CommunityList.objects.create(person=plain)
+        draft = WgDraftFactory()
+        self.assertNotIn(draft, docs_tracked_by_community_list(clist))
+
+        # adding a rule pulls in matching documents
+        rule = SearchRule.objects.create(
+            community_list=clist,
+            rule_type="group",
+            group=draft.group,
+            state=State.objects.get(type="draft", slug="active"),
+        )
+        self.assertIn(draft, docs_tracked_by_community_list(clist))
+
+        # a state change drops the document again
+        draft.set_state(State.objects.get(type="draft", slug="expired"))
+        self.assertNotIn(draft, docs_tracked_by_community_list(clist))
+
+        # explicitly added documents and the RFCs they became are tracked
+        other_draft = WgDraftFactory()
+        clist.added_docs.add(other_draft)
+        self.assertIn(other_draft, docs_tracked_by_community_list(clist))
+        rfc = WgRfcFactory()
+        self.assertNotIn(rfc, docs_tracked_by_community_list(clist))
+        other_draft.relateddocument_set.create(relationship_id="became_rfc", target=rfc)
+        self.assertIn(rfc, docs_tracked_by_community_list(clist))
+
+        clist.added_docs.remove(other_draft)
+        self.assertNotIn(other_draft, docs_tracked_by_community_list(clist))
+        self.assertNotIn(rfc, docs_tracked_by_community_list(clist))
+
+        # removing a rule drops the documents it matched
+        draft.set_state(State.objects.get(type="draft", slug="active"))
+        self.assertIn(draft, docs_tracked_by_community_list(clist))
+        rule.delete()
+        self.assertNotIn(draft, docs_tracked_by_community_list(clist))
+
+        self.assertCountEqual(
+            docs_tracked_by_community_list(clist),
+            compute_docs_tracked_by_community_list(clist),
+        )
+
     def test_view_list_duplicates(self):
         person = PersonFactory(
             name="John Q. Public", user__username="bazquux@example.com"
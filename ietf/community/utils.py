@@ -4,15 +4,16 @@
 
 import re
 
+from django.db import DatabaseError, transaction
 from django.db.models import Q
 from django.conf import settings
+from django.core.cache import cache
 
 import debug                            # pyflakes:ignore
 
 from ietf.community.models import CommunityList, EmailSubscription, SearchRule
-from ietf.doc.models import Document, State
+from ietf.doc.models import Document, RelatedDocument, State
 from ietf.group.models import Role
-from ietf.person.models import Person
 from ietf.ietfauth.utils import has_role
 
 from ietf.utils.mail import send_mail
@@ -48,14 +49,78 @@ def reset_name_contains_index_for_rule(rule):
 
     rule.name_contains_index.set(Document.objects.filter(name__regex=rule.text))
 
+class NameContainsMatcher:
+    """Match document names against the text of many name_contains rules at once
+
+    Django doesn't support a reversed regex operator, so matching a new
+    document against the rules is done in Python. The distinct rule
+    patterns are combined into a single alternation that rejects the
+    (common) non-matching names in one pass; only names that match it
+    are checked against the individual patterns.
+    """
+    def __init__(self, rules):
+        self.rule_ids_by_text = {}
+        for pk, text in rules:
+            self.rule_ids_by_text.setdefault(text, []).append(pk)
+
+        self.patterns = []
+        self.uncompiled = {}  # texts Python can't compile, but the database might
+        for text, rule_ids in self.rule_ids_by_text.items():
+            try:
+                self.patterns.append((re.compile(text), rule_ids))
+            except re.error:
+                self.uncompiled[text] = rule_ids
+
+        try:
+            self.combined = re.compile("|".join("(?:%s)" % p.pattern for p, _ in self.patterns))
+        except re.error:
+            # e.g. duplicate group names or backreferences across patterns
+            self.combined = None
+
+    def matching_rule_ids(self, name):
+        if not self.patterns or (self.combined is not None and not self.combined.search(name)):
+            return []
+        return [pk for p, rule_ids in self.patterns if p.search(name) for pk in rule_ids]
+
+
+def name_contains_matcher():
+    return NameContainsMatcher(SearchRule.objects.filter(rule_type="name_contains").values_list("pk", "text"))
+
+
 def update_name_contains_indexes_with_new_doc(doc):
-    for r in SearchRule.objects.filter(rule_type="name_contains"):
-        # in theory we could use the database to do this query, but
-        # Django doesn't support a reversed regex operator, and regexp
-        # support needs backend-specific code so custom SQL is a bit
-        # cumbersome too
-        if re.search(r.text, doc.name) and not doc in r.name_contains_index.all():
-            r.name_contains_index.add(doc)
+    rule_ids = name_contains_matcher().matching_rule_ids(doc.name)
+    if rule_ids:
+        doc.searchrule_set.add(*rule_ids)  # only inserts the missing index rows
+
+
+def reset_name_contains_indexes(dry_run=False):
+    """Rebuild the name_contains index of every rule in one pass over the documents
+
+    Returns a dict mapping each rule to a (previous count, new count) tuple.
+    """
+    matcher = name_contains_matcher()
+    matched = {pk: set() for _, pks in matcher.patterns for pk in pks}
+    for doc_id, name in Document.objects.values_list("pk", "name").iterator(chunk_size=2000):
+        for rule_id in matcher.matching_rule_ids(name):
+            matched[rule_id].add(doc_id)
+
+    # PostgreSQL accepts some regexes that Python doesn't, match those in the database
+    for text, rule_ids in matcher.uncompiled.items():
+        try:
+            with transaction.atomic():
+                doc_ids = set(Document.objects.filter(name__regex=text).values_list("pk", flat=True))
+        except DatabaseError:
+            continue  # invalid for the database as well, leave the index alone
+        for pk in rule_ids:
+            matched[pk] = doc_ids
+
+    counts = {}
+    for rule in SearchRule.objects.filter(pk__in=list(matched)):
+        count = rule.name_contains_index.count()
+        if not dry_run:
+            rule.name_contains_index.set(matched[rule.pk])
+        counts[rule] = (count, len(matched[rule.pk]))
+    return counts
 
 
 def docs_matching_community_list_rule(rule):
@@ -86,106 +151,212 @@ def docs_matching_community_list_rule(rule):
     raise NotImplementedError
 
 
-def community_list_rules_matching_doc(doc):
-    rules = SearchRule.objects.none()
+SEARCH_RULE_INDEX_CACHE_KEY = "community:search_rule_index"
+SEARCH_RULE_INDEX_CACHE_TIMEOUT = 60 * 60  # bounds staleness if an invalidation is lost
+
+
+def _search_rule_index_key(rule_type, state_id, group_id, person_id):
+    """Key under which a rule is stored in the inverted search rule index
+
+    The key holds exactly the rule attributes that
+    community_list_rules_matching_doc() compares against a document.
+    """
+    if rule_type in ["group_rfc", "area_rfc"]:
+        return ("group_rfc", group_id)  # rule.state is ignored for RFCs
+    elif rule_type in ["group", "area", "group_exp"]:
+        return ("group", group_id, state_id)
+    elif rule_type.startswith("state_"):
+        return ("state", state_id)
+    elif rule_type == "author_rfc":
+        return ("author_rfc", person_id)
+    elif rule_type in ["author", "ad", "shepherd"]:
+        return (rule_type, person_id, state_id)
+    elif rule_type == "name_contains":
+        return ("name_contains", state_id)
+    return None
+
+
+def build_search_rule_index():
+    """Build the inverted search rule index
+
+    Maps the keys from _search_rule_index_key() to lists of
+    (rule pk, community list pk) tuples.
+    """
+    index = {}
+    for pk, clist_id, rule_type, state_id, group_id, person_id in SearchRule.objects.values_list(
+        "pk", "community_list_id", "rule_type", "state_id", "group_id", "person_id"
+    ):
+        key = _search_rule_index_key(rule_type, state_id, group_id, person_id)
+        if key is not None:
+            index.setdefault(key, []).append((pk, clist_id))
+    return index
+
+
+def search_rule_index():
+    index = cache.get(SEARCH_RULE_INDEX_CACHE_KEY)
+    if index is None:
+        index = build_search_rule_index()
+        cache.set(SEARCH_RULE_INDEX_CACHE_KEY, index, SEARCH_RULE_INDEX_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_search_rule_index():
+    """Drop the cached search rule index, now and once the current transaction commits
+
+    Until the commit, other processes still see the old rules and may cache an
+    index built from them, so the second delete is needed to get rid of that.
+    """
+    cache.delete(SEARCH_RULE_INDEX_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(SEARCH_RULE_INDEX_CACHE_KEY))
+
+
+def _search_rules_matching_doc(doc):
+    """Find the rules matching a doc by looking up its attributes in the search rule index
+
+    Returns a list of (rule pk, community list pk) tuples.
+    """
     if doc.type_id not in ["draft", "rfc"]:
-        return rules  # none
+        return []
+    index = search_rule_index()
+    if not index:
+        return []
     states = list(doc.states.values_list("pk", flat=True))
+    keys = []
 
     # group and area rules
     if doc.group_id:
         groups = [doc.group_id]
         if doc.group.parent_id:
             groups.append(doc.group.parent_id)
-        rules_to_add = SearchRule.objects.filter(group__in=groups)
         if doc.type_id == "rfc":
-            rules_to_add = rules_to_add.filter(rule_type__in=["group_rfc", "area_rfc"])
+            keys.extend(("group_rfc", g) for g in groups)
         else:
-            rules_to_add = rules_to_add.filter(
-                rule_type__in=["group", "area", "group_exp"],
-                state__in=states,
-            )
-        rules |= rules_to_add
+            keys.extend(("group", g, s) for g in groups for s in states)
 
     # state rules (only relevant for I-Ds)
     if doc.type_id == "draft":
-        rules |= SearchRule.objects.filter(
-            rule_type__in=[
-                "state_iab",
-                "state_iana",
-                "state_iesg",
-                "state_irtf",
-                "state_ise",
-                "state_rfceditor",
-                "state_ietf",
-            ],
-            state__in=states,
-        )
+        keys.extend(("state", s) for s in states)
 
     # author rules
     if doc.type_id == "rfc":
-        has_rfcauthors = doc.rfcauthor_set.exists()
-        rules |= SearchRule.objects.filter(
-            rule_type="author_rfc",
-            person__in=list(
-                Person.objects.filter(
-                    Q(rfcauthor__document=doc)
-                    if has_rfcauthors
-                    else Q(documentauthor__document=doc)
-                )
-            ),
-        )
+        rfcauthor_person_ids = list(doc.rfcauthor_set.values_list("person_id", flat=True))
+        if rfcauthor_person_ids:
+            keys.extend(("author_rfc", p) for p in rfcauthor_person_ids if p is not None)
+        else:
+            keys.extend(("author_rfc", p) for p in doc.documentauthor_set.values_list("person_id", flat=True))
     else:
-        rules |= SearchRule.objects.filter(
-            rule_type="author",
-            state__in=states,
-            person__in=list(Person.objects.filter(documentauthor__document=doc)),
+        keys.extend(
+            ("author", p, s)
+            for p in doc.documentauthor_set.values_list("person_id", flat=True)
+            for s in states
         )
 
     # Other draft-only rules rules
+    matches = []
     if doc.type_id == "draft":
         if doc.ad_id:
-            rules |= SearchRule.objects.filter(
-                rule_type="ad",
-                state__in=states,
-                person=doc.ad_id,
-            )
+            keys.extend(("ad", doc.ad_id, s) for s in states)
 
-        if doc.shepherd_id:
-            rules |= SearchRule.objects.filter(
-                rule_type="shepherd",
-                state__in=states,
-                person__email=doc.shepherd_id,
-            )
+        if doc.shepherd_id and doc.shepherd.person_id:
+            keys.extend(("shepherd", doc.shepherd.person_id, s) for s in states)
 
-        rules |= SearchRule.objects.filter(
-            rule_type="name_contains",
-            state__in=states,
-            name_contains_index=doc,  # search our materialized index to avoid full scan
+        name_contains_rules = dict(
+            m for s in states for m in index.get(("name_contains", s), [])
         )
+        if name_contains_rules:
+            # search our materialized index to avoid full scan
+            matches.extend(
+                (rule_id, name_contains_rules[rule_id])
+                for rule_id in SearchRule.name_contains_index.through.objects.filter(
+                    document=doc, searchrule__in=list(name_contains_rules)
+                ).values_list("searchrule_id", flat=True)
+            )
 
-    return rules
+    for key in keys:
+        matches.extend(index.get(key, []))
+    return matches
 
 
-def docs_tracked_by_community_list(clist):
+def community_list_rules_matching_doc(doc):
+    return SearchRule.objects.filter(pk__in={rule_id for rule_id, _ in _search_rules_matching_doc(doc)})
+
+
+def compute_docs_tracked_by_community_list(clist):
+    """Evaluate the added documents and search rules of a community list
+
+    This is the expensive computation behind the materialized
+    CommunityList.tracked_docs table; views should use
+    docs_tracked_by_community_list() instead.
+    """
     if clist.pk is None:
         return Document.objects.none()
 
     # in theory, we could use an OR query, but databases seem to have
     # trouble with OR queries and complicated joins so do the OR'ing
     # manually
-    doc_ids = set()
-    for doc in clist.added_docs.all():
-        doc_ids.add(doc.pk)
-        doc_ids.update(rfc.pk for rfc in doc.related_that_doc("became_rfc"))
+    doc_ids = set(clist.added_docs.values_list("pk", flat=True))
+    doc_ids.update(
+        RelatedDocument.objects.filter(
+            source__in=doc_ids, relationship_id="became_rfc"
+        ).values_list("target", flat=True)
+    )
 
     for rule in clist.searchrule_set.all():
         doc_ids = doc_ids | set(docs_matching_community_list_rule(rule).values_list("pk", flat=True))
 
     return Document.objects.filter(pk__in=doc_ids)
 
+
+def docs_tracked_by_community_list(clist):
+    if clist.pk is None:
+        return Document.objects.none()
+
+    return Document.objects.filter(tracking_community_lists=clist)
+
+
 def community_lists_tracking_doc(doc):
-    return CommunityList.objects.filter(Q(added_docs=doc) | Q(searchrule__in=community_list_rules_matching_doc(doc)))
+    clist_ids = {clist_id for _, clist_id in _search_rules_matching_doc(doc)}
+    return CommunityList.objects.filter(Q(added_docs=doc) | Q(pk__in=clist_ids))
+
+
+def update_tracked_docs_for_community_list(clist, prune_only=False):
+    """Bring the materialized tracked_docs of a community list up to date
+
+    With prune_only, rows are only removed, never added. That is what
+    the post_delete receivers need: they may run in the middle of a
+    cascading delete where inserting new rows would violate a foreign key.
+    """
+    if clist.pk is None:
+        return
+
+    doc_ids = set(compute_docs_tracked_by_community_list(clist).values_list("pk", flat=True))
+    if prune_only:
+        clist.tracked_docs.remove(*clist.tracked_docs.exclude(pk__in=doc_ids))
+    else:
+        clist.tracked_docs.set(doc_ids)
+
+
+def update_community_lists_tracking_doc(doc, prune_only=False):
+    """Bring the materialized tracked_docs of all community lists up to date for one document
+
+    See update_tracked_docs_for_community_list() regarding prune_only.
+    """
+    if doc.pk is None:
+        return
+
+    clist_ids = set(community_lists_tracking_doc(doc).values_list("pk", flat=True))
+    if doc.type_id == "rfc":
+        # lists that track the draft this RFC came from
+        clist_ids.update(
+            CommunityList.objects.filter(
+                added_docs__relateddocument__target=doc,
+                added_docs__relateddocument__relationship_id="became_rfc",
+            ).values_list("pk", flat=True)
+        )
+    if prune_only:
+        doc.tracking_community_lists.remove(*doc.tracking_community_lists.exclude(pk__in=clist_ids))
+    else:
+        doc.tracking_community_lists.set(clist_ids)
 
 
 def notify_event_to_subscribers(event):
@@ -0,0 +1,15 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ietf.doc.utils_search import update_document_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vectors of all documents."
+
+    def handle(self, *args, **options):
+        if not settings.DOC_SEARCH_FULL_TEXT:
+            raise CommandError("settings.DOC_SEARCH_FULL_TEXT is not enabled")
+        update_document_search_vectors()
@@ -0,0 +1,39 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+import django.db.models.deletion
+import ietf.utils.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("doc", "0038_rpcactionholderopenentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentSearchVector",
+            fields=[
+                (
+                    "document",
+                    ietf.utils.models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_vector",
+                        serialize=False,
+                        to="doc.document",
+                    ),
+                ),
+                ("vector", django.contrib.postgres.search.SearchVectorField()),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["vector"], name="doc_search_vector_gin_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -21,9 +21,10 @@
 from weasyprint.text.fonts import FontConfiguration
 
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core import checks
 from django.core.files.base import File
-from django.core.cache import caches
 from django.core.validators import (
     URLValidator,
     RegexValidator,
@@ -41,6 +42,7 @@
 
 from ietf.group.models import Group
 from ietf.doc.storage_utils import (
+    retrieve_bytes as utils_retrieve_bytes,
     store_str as utils_store_str,
     store_bytes as utils_store_bytes,
     store_file as utils_store_file
@@ -51,11 +53,12 @@
 from ietf.person.models import Email, Person
 from ietf.person.utils import get_active_balloters
 from ietf.utils import log
+from ietf.utils.cache import cached_render
 from ietf.utils.decorators import memoize
 from ietf.utils.text import decode_document_content
 from ietf.utils.validators import validate_no_control_chars
 from ietf.utils.mail import formataddr
-from ietf.utils.models import ForeignKey
+from ietf.utils.models import ForeignKey, OneToOneField
 from ietf.utils.timezone import date_today, RPC_TZINFO, DEADLINE_TZINFO
 if TYPE_CHECKING:
     # importing other than for type checking causes errors due to cyclic imports
@@ -733,6 +736,64 @@ def html_body(self, classes=""):
 
         return html
 
+    # Pre-rendered forms of the document text, keyed by blob storage bucket
+    RENDERED_ARTIFACT_KINDS = {
+        "htmlized": ("html", "text/html;charset=utf-8", "HTMLIZER_VERSION"),
+        "pdfized": ("pdf", "application/pdf", "PDFIZER_VERSION"),
+    }
+
+    def rendered_artifact_name(self, kind):
+        """Name of the pre-rendered artifact for this revision in the given store
+
+        The name includes the renderer version, so bumping the version setting
+        after a change to the rendering makes every artifact render again.
+        """
+        ext, _, version_setting = self.RENDERED_ARTIFACT_KINDS[kind]
+        version = getattr(settings, version_setting)
+        return f"v{version}/{self.get_base_name().split('.')[0]}.{ext}"
+
+    def rendered_artifact_checksum(self, kind) -> Optional[str]:
+        """SHA-384 of the stored pre-rendered artifact, or None if it has not been stored
+
+        This only touches the StoredObject table, so it is cheap enough to answer
+        conditional requests without reading the artifact itself.
+        """
+        if not settings.ENABLE_BLOBSTORAGE:
+            return None
+        return (
+            StoredObject.objects.exclude_deleted()
+            .filter(store=kind, name=self.rendered_artifact_name(kind))
+            .values_list("sha384", flat=True)
+            .first()
+        )
+
+    def retrieve_rendered_artifact(self, kind) -> Optional[bytes]:
+        """Return the stored pre-rendered artifact, or None if it is not available"""
+        if self.rendered_artifact_checksum(kind) is None:
+            return None
+        try:
+            return utils_retrieve_bytes(kind, self.rendered_artifact_name(kind))
+        except Exception:
+            return None  # already logged; fall back to rendering
+
+    def store_rendered_artifact(self, kind, content: bytes) -> None:
+        _, content_type, _ = self.RENDERED_ARTIFACT_KINDS[kind]
+        utils_store_bytes(
+            kind,
+            self.rendered_artifact_name(kind),
+            content,
+            allow_overwrite=True,
+            doc_name=self.name,
+            doc_rev=self.rev,
+            content_type=content_type,
+        )
+
+    def render_htmlized(self, text):
+        # The path here has to match the urlpattern for htmlized
+        # documents in order to produce correct intra-document links
+        html = rfc2html.markup(text, path=settings.HTMLIZER_URL_PREFIX)
+        return f'<div class="rfcmarkup">{html}</div>'
+
     def htmlized(self):
         name = self.get_base_name()
         text = self.text()
@@ -742,23 +803,26 @@ def htmlized(self):
             return None
         html = ""
         if text:
-            cache = caches['htmlized']
-            cache_key = name.split('.')[0]
-            try:
-                html = cache.get(cache_key)
-            except EOFError:
-                html = None
-            if not html:
-                # The path here has to match the urlpattern for htmlized
-                # documents in order to produce correct intra-document links
-                html = rfc2html.markup(text, path=settings.HTMLIZER_URL_PREFIX)
-                html = f'<div class="rfcmarkup">{html}</div>'
-                if html:
-                    cache.set(cache_key, html, settings.HTMLIZER_CACHE_TIME)
+            def lookup():
+                stored = self.retrieve_rendered_artifact("htmlized")
+                return None if stored is None else stored.decode("utf-8")
+
+            def render():
+                html = self.render_htmlized(text)
+                self.store_rendered_artifact("htmlized", html.encode("utf-8"))
+                return html
+
+            html = cached_render(
+                "htmlized",
+                f"{name.split('.')[0]}:v{settings.HTMLIZER_VERSION}",
+                render,
+                settings.HTMLIZER_CACHE_TIME,
+                stale_timeout=settings.HTMLIZER_STALE_TIME,
+                lookup=lookup,
+            )
         return html
 
-    def pdfized(self):
-        name = self.get_base_name()
+    def render_pdfized(self):
         text = self.html_body(classes="rfchtml")
         stylesheets = [finders.find("ietf/css/document_html_referenced.css")]
         if text:
@@ -767,32 +831,55 @@ def pdfized(self):
             text = self.htmlized()
         stylesheets.append(f'{settings.STATIC_IETF_ORG_INTERNAL}/fonts/noto-sans-mono/import.css')
 
-        cache = caches["pdfized"]
-        cache_key = name.split(".")[0]
         try:
-            pdf = cache.get(cache_key)
-        except EOFError:
+            font_config = FontConfiguration()
+            pdf = wpHTML(
+                string=text, base_url=settings.IDTRACKER_BASE_URL
+            ).write_pdf(
+                stylesheets=stylesheets,
+                font_config=font_config,
+                presentational_hints=True,
+                optimize_images=True,
+            )
+        except AssertionError:
             pdf = None
-        if not pdf:
-            try:
-                font_config = FontConfiguration()
-                pdf = wpHTML(
-                    string=text, base_url=settings.IDTRACKER_BASE_URL
-                ).write_pdf(
-                    stylesheets=stylesheets,
-                    font_config=font_config,
-                    presentational_hints=True,
-                    optimize_images=True,
-                )
-            except AssertionError:
-                pdf = None
-            except Exception as e:
-                log.log('weasyprint failed:'+str(e))
-                raise
-            if pdf:
-                cache.set(cache_key, pdf, settings.PDFIZER_CACHE_TIME)
+        except Exception as e:
+            log.log('weasyprint failed:'+str(e))
+            raise
         return pdf
 
+    def pdfized(self):
+        def render():
+            pdf = self.render_pdfized()
+            if pdf:
+                self.store_rendered_artifact("pdfized", pdf)
+            return pdf
+
+        return cached_render(
+            "pdfized",
+            f"{self.get_base_name().split('.')[0]}:v{settings.PDFIZER_VERSION}",
+            render,
+            settings.PDFIZER_CACHE_TIME,
+            stale_timeout=settings.PDFIZER_STALE_TIME,
+            lookup=lambda: self.retrieve_rendered_artifact("pdfized"),
+        )
+
+    def store_rendered_artifacts(self):
+        """Render the htmlized and pdfized forms of this revision into blob storage
+
+        Meant to be run in the background when a revision appears, so that
+        requests find the artifacts already rendered instead of running
+        rfc2html or WeasyPrint themselves.
+        """
+        name = self.get_base_name()
+        if name.endswith(".txt"):
+            text = self.text()
+            if text:
+                self.store_rendered_artifact("htmlized", self.render_htmlized(text).encode("utf-8"))
+        pdf = self.render_pdfized()
+        if pdf:
+            self.store_rendered_artifact("pdfized", pdf)
+
     def references(self):
         return self.relations_that_doc(('refnorm','refinfo','refunk','refold'))
 
@@ -1932,3 +2019,22 @@ class Meta:
 
     def __str__(self):
         return f"{self.store}:{self.name}"
+
+
+class DocumentSearchVector(models.Model):
+    """Full-text search vector for a document's name, title, authors and abstract
+
+    Kept in its own table so the wide Document rows do not grow. Maintained by
+    ietf.doc.utils_search.update_document_search_vectors() when
+    settings.DOC_SEARCH_FULL_TEXT is enabled.
+    """
+    document = OneToOneField(
+        Document, primary_key=True, related_name="search_vector", on_delete=models.CASCADE
+    )
+    vector = SearchVectorField()
+
+    class Meta:
+        indexes = [GinIndex(fields=["vector"], name="doc_search_vector_gin_idx")]
+
+    def __str__(self):
+        return f"Search vector for {self.document_id}"
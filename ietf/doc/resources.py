@@ -19,7 +19,8 @@
     ReviewRequestDocEvent, ReviewAssignmentDocEvent, EditedAuthorsDocEvent, DocumentURL,
     IanaExpertDocEvent, IRSGBallotDocEvent, DocExtResource, DocumentActionHolder,
     BofreqEditorDocEvent, BofreqResponsibleDocEvent, StoredObject, RfcAuthor,
-    EditedRfcAuthorsDocEvent, RpcAssignmentDocEvent, RpcActionHolderOpenEntry)
+    EditedRfcAuthorsDocEvent, RpcAssignmentDocEvent, RpcActionHolderOpenEntry,
+    DocumentSearchVector)
 
 from ietf.name.resources import BallotPositionNameResource, DocTypeNameResource
 class BallotTypeResource(ModelResource):
@@ -966,3 +967,9 @@ class Meta:
             "person": ALL_WITH_RELATIONS,
         }
 api.doc.register(RpcActionHolderOpenEntryResource())
+
+
+class DocumentSearchVectorResource(ModelResource):
+    class Meta:
+        queryset = DocumentSearchVector.objects.none()
+api.doc.register(DocumentSearchVectorResource())
@@ -0,0 +1,47 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ietf.person.models import Person
+from .models import Document, DocumentAuthor, RfcAuthor
+from .utils_search import update_document_search_vectors
+
+
+# The receivers below keep DocumentSearchVector current. Each change to a
+# document's name, title, abstract or author names updates that document once
+# the change commits. Deferring the update also keeps it from recreating the
+# vector of a document that is being deleted.
+
+def update_search_vectors_on_commit(doc_ids):
+    if settings.DOC_SEARCH_FULL_TEXT:
+        doc_ids = list(doc_ids)
+        transaction.on_commit(lambda: update_document_search_vectors(doc_ids))
+
+
+@receiver(post_save, sender=Document, dispatch_uid="doc_search_vector_doc_saved_uid")
+def doc_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vectors_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=DocumentAuthor, dispatch_uid="doc_search_vector_author_saved_uid")
+@receiver(post_save, sender=RfcAuthor, dispatch_uid="doc_search_vector_rfcauthor_saved_uid")
+@receiver(post_delete, sender=DocumentAuthor, dispatch_uid="doc_search_vector_author_deleted_uid")
+@receiver(post_delete, sender=RfcAuthor, dispatch_uid="doc_search_vector_rfcauthor_deleted_uid")
+def doc_author_changed_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vectors_on_commit([instance.document_id])
+
+
+@receiver(post_save, sender=Person, dispatch_uid="doc_search_vector_person_saved_uid")
+def person_saved_receiver(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created and settings.DOC_SEARCH_FULL_TEXT:
+        update_search_vectors_on_commit(
+            Document.objects.filter(
+                Q(documentauthor__person=instance) | Q(rfcauthor__person=instance)
+            ).values_list("pk", flat=True).distinct()
+        )
@@ -9,6 +9,7 @@
 from celery import shared_task
 from celery.exceptions import MaxRetriesExceededError
 from pathlib import Path
+from typing import Optional
 
 from django.conf import settings
 from django.utils import timezone
@@ -29,7 +30,7 @@
     send_expire_warning_for_draft,
 )
 from .lastcall import get_expired_last_calls, expire_last_call
-from .models import Document, NewRevisionDocEvent
+from .models import Document, DocEvent, NewRevisionDocEvent
 from .utils import (
     generate_idnits2_rfc_status,
     generate_idnits2_rfcs_obsoleted,
@@ -133,6 +134,59 @@ def generate_draft_bibxml_files_task(days=7, process_all=False):
             log.log(f"Error generating bibxml for {event.doc.name}-{event.rev}: {err}")
 
 
+def _document_revision(doc_name, rev=None):
+    """Get a Document, or the DocHistory for rev if that is not the current one"""
+    doc = Document.objects.filter(name=doc_name).first()
+    if doc is not None and rev and rev != doc.rev:
+        doc = doc.history_set.filter(rev=rev).first() or doc.fake_history_obj(rev)
+    return doc
+
+
+def _store_rendered_artifacts(doc):
+    try:
+        doc.store_rendered_artifacts()
+    except Exception as err:
+        log.log(f"Error rendering artifacts for {doc.get_base_name()}: {err}")
+
+
+@shared_task
+def render_document_artifacts_task(doc_name: str, rev: Optional[str] = None):
+    """Pre-render the htmlized and pdfized forms of a document revision
+
+    The results go to blob storage, where Document.htmlized() and pdfized()
+    look before rendering inside a request.
+    """
+    doc = _document_revision(doc_name, rev)
+    if doc is None:
+        log.log(f"Document {doc_name} not found, not rendering artifacts")
+        return
+    _store_rendered_artifacts(doc)
+
+
+@shared_task
+def render_recent_document_artifacts_task(days=2):
+    """Pre-render artifacts for recent revisions that are not yet in blob storage
+
+    Catches up on revisions whose render was never queued or failed.
+    """
+    since = timezone.now() - datetime.timedelta(days=days)
+    revisions = set(
+        NewRevisionDocEvent.objects.filter(
+            type="new_revision", doc__type_id="draft", time__gte=since
+        ).values_list("doc__name", "rev")
+    )
+    revisions.update(
+        (name, None)
+        for name in DocEvent.objects.filter(
+            type="published_rfc", doc__type_id="rfc", time__gte=since
+        ).values_list("doc__name", flat=True)
+    )
+    for doc_name, rev in sorted(revisions, key=lambda r: (r[0], r[1] or "")):
+        doc = _document_revision(doc_name, rev)
+        if doc is not None and doc.rendered_artifact_checksum("pdfized") is None:
+            _store_rendered_artifacts(doc)
+
+
 @shared_task(ignore_result=False)
 def investigate_fragment_task(name_fragment: str):
     return {
@@ -211,6 +265,15 @@ def update_rfc_searchindex_task(self, rfc_number: int):
             )
 
 
+@shared_task
+def sync_searchindex_task():
+    """Push documents changed since the last sync to the search index"""
+    if not searchindex.enabled():
+        log.log("Search indexing is not enabled, skipping")
+        return
+    searchindex.sync_changed_documents()
+
+
 @shared_task
 def rebuild_searchindex_task(
     *, batchsize=40, drop_collection=False, upsert_presets=True
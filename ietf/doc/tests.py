@@ -203,6 +203,39 @@ def test_search_became_rfc(self):
         self.assertEqual(r.status_code, 200)
         self.assertContains(r, rfc.title)
 
+    @override_settings(DOC_SEARCH_FULL_TEXT=True)
+    def test_search_full_text(self):
+        """Name searches can use the full-text search vectors"""
+        person = PersonFactory(name="Arthur Dent")
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = WgDraftFactory(
+                name="draft-ietf-mars-improbability",
+                title="Infinite Improbability Drive",
+                authors=[person],
+            )
+            rfc = WgRfcFactory(title="Somewhat unrelated title")
+            draft.relateddocument_set.create(relationship_id="became_rfc", target=rfc)
+            other = WgDraftFactory(name="draft-ietf-mars-towels", title="Towels")
+
+        def search(name):
+            form = SearchForm({"activedrafts": "on", "rfcs": "on", "name": name})
+            return list(retrieve_search_results(form))
+
+        self.assertCountEqual(search("improbab"), [draft, rfc])
+        self.assertCountEqual(search("mars-improbability"), [draft, rfc])
+        self.assertCountEqual(search("Dent"), [draft, rfc])
+        self.assertCountEqual(search("infinite drive"), [draft, rfc])
+        self.assertCountEqual(search("towel"), [other])
+        self.assertCountEqual(search(rfc.name.upper().replace("RFC", "RFC ")), [rfc])
+        self.assertCountEqual(search(str(rfc.rfc_number)), [rfc])
+
+        # author changes are picked up
+        with self.captureOnCommitCallbacks(execute=True):
+            person.name = "Ford Prefect"
+            person.save()
+        self.assertCountEqual(search("Dent"), [])
+        self.assertCountEqual(search("Prefect"), [draft, rfc])
+
     def test_search_by_author(self):
         """The author search covers both DocumentAuthor and RfcAuthor"""
         base_url = urlreverse('ietf.doc.views_search.search')
@@ -3092,6 +3125,43 @@ def test_generator_class(self):
             {k: sorted(v) for k, v in expected_dict.items()},
         )
 
+    def test_generator_query_count_does_not_grow_with_drafts(self):
+        """Generating aliases must not cost queries per draft
+
+        The generator preloads authors, emails and RFC publication events for each
+        batch of drafts and looks up group roles once per group, so adding drafts to
+        the same groups must not change the number of queries.
+        """
+        group = GroupFactory(type_id="wg")
+        RoleFactory(group=group, name_id="chair")
+        RoleFactory(group=group.parent, name_id="ad")
+        a_month_ago = timezone.now() - datetime.timedelta(days=30)
+
+        def add_drafts(count):
+            for _ in range(count):
+                WgDraftFactory(group=group, authors=[PersonFactory()], ad=PersonFactory(),
+                               shepherd=EmailFactory())
+                finished = WgDraftFactory(
+                    group=group,
+                    authors=[PersonFactory()],
+                    states=[("draft", "rfc"), ("draft-iesg", "pub")],
+                    time=a_month_ago,
+                )
+                rfc = WgRfcFactory(group=group)
+                DocEventFactory(doc=rfc, type="published_rfc", time=a_month_ago)
+                finished.relateddocument_set.create(relationship_id="became_rfc", target=rfc)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                aliases = list(DraftAliasGenerator())
+            self.assertTrue(aliases)
+            return len(context.captured_queries)
+
+        add_drafts(2)
+        baseline = count_queries()
+        add_drafts(4)
+        self.assertEqual(count_queries(), baseline)
+
     @override_settings(TOOLS_SERVER="tools.example.org", DRAFT_ALIAS_DOMAIN="draft.example.org")
     def test_get_draft_notify_emails(self):
         ad = PersonFactory()
@@ -3797,6 +3867,63 @@ def test_pdfized(self):
             self.assertEqual(r.status_code, 200)
             self.assertContains(r, "Error while rendering PDF")
 
+    def test_pdfized_stored_artifact(self):
+        draft = WgDraftFactory()
+        with (Path(settings.INTERNET_ALL_DRAFTS_ARCHIVE_DIR) / f"{draft.name}-{draft.rev}.txt").open("w") as f:
+            f.write("text content")
+        pdf = b"%PDF-1.7 pre-rendered content"
+        with mock.patch("ietf.doc.models.DocumentInfo.render_pdfized", return_value=pdf):
+            draft.store_rendered_artifacts()
+        etag = f'"{sha384(pdf).hexdigest()}"'
+        self.assertEqual(draft.rendered_artifact_checksum("pdfized"), sha384(pdf).hexdigest())
+
+        url = urlreverse(self.view, kwargs=dict(name=draft.name))
+        username = PersonFactory().user.username
+        self.client.login(username=username, password=username + "+password")
+        with mock.patch("ietf.doc.models.DocumentInfo.render_pdfized") as mock_render:
+            r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(r.content, pdf)
+            self.assertEqual(r["ETag"], etag)
+            self.assertEqual(r["Accept-Ranges"], "bytes")
+
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 304)
+
+            r = self.client.get(url, HTTP_RANGE="bytes=0-3")
+            self.assertEqual(r.status_code, 206)
+            self.assertEqual(r.content, b"%PDF")
+            self.assertEqual(r["Content-Range"], f"bytes 0-3/{len(pdf)}")
+
+            r = self.client.get(url, HTTP_RANGE="bytes=-7", HTTP_IF_RANGE=etag)
+            self.assertEqual(r.status_code, 206)
+            self.assertEqual(r.content, b"content")
+
+            r = self.client.get(url, HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"stale"')
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(r.content, pdf)
+
+            r = self.client.get(url, HTTP_RANGE=f"bytes={len(pdf)}-")
+            self.assertEqual(r.status_code, 416)
+            self.assertEqual(r["Content-Range"], f"bytes */{len(pdf)}")
+        self.assertFalse(mock_render.called)
+
+        # a separate rendering, e.g. one cached before the pdf was stored again,
+        # is not served under the stored pdf's ETag
+        with mock.patch("ietf.doc.models.DocumentInfo.pdfized", return_value=b"%PDF-1.7 other"):
+            r = self.client.get(url)
+            self.assertEqual(r.content, pdf)
+            self.assertEqual(r["ETag"], etag)
+
+        # a new renderer version does not use the artifacts of the old one
+        with override_settings(PDFIZER_VERSION=settings.PDFIZER_VERSION + 1):
+            self.assertIsNone(draft.rendered_artifact_checksum("pdfized"))
+            new_pdf = b"%PDF-1.7 re-rendered content"
+            with mock.patch("ietf.doc.models.DocumentInfo.render_pdfized", return_value=new_pdf):
+                self.assertEqual(draft.pdfized(), new_pdf)
+            self.assertEqual(draft.rendered_artifact_checksum("pdfized"), sha384(new_pdf).hexdigest())
+        self.assertEqual(draft.rendered_artifact_checksum("pdfized"), sha384(pdf).hexdigest())
+
 class NotifyValidationTests(TestCase):
     def test_notify_validation(self):
         valid_values = [
@@ -14,7 +14,12 @@
 from ietf.utils.test_utils import TestCase
 from ietf.utils.timezone import datetime_today
 
-from .factories import DocumentFactory, NewRevisionDocEventFactory, WgRfcFactory
+from .factories import (
+    DocumentFactory,
+    NewRevisionDocEventFactory,
+    WgDraftFactory,
+    WgRfcFactory,
+)
 from .models import Document, NewRevisionDocEvent
 from .tasks import (
     expire_ids_task,
@@ -25,6 +30,8 @@
     investigate_fragment_task,
     notify_expirations_task,
     rebuild_searchindex_task,
+    render_document_artifacts_task,
+    render_recent_document_artifacts_task,
     update_rfc_searchindex_task,
 )
 
@@ -116,6 +123,39 @@ def test_investigate_fragment_task(self):
             retval, {"name_fragment": "some fragment", "results": investigation_results}
         )
 
+    @mock.patch("ietf.doc.models.DocumentInfo.store_rendered_artifacts", autospec=True)
+    def test_render_document_artifacts_task(self, mock_store):
+        draft = WgDraftFactory(create_revisions=range(0, 2))
+        render_document_artifacts_task(draft.name, draft.rev)
+        self.assertEqual(mock_store.call_count, 1)
+        self.assertEqual(mock_store.call_args.args[0], draft)
+
+        # an older revision renders from its history
+        mock_store.reset_mock()
+        render_document_artifacts_task(draft.name, "00")
+        self.assertEqual(mock_store.call_count, 1)
+        self.assertEqual(mock_store.call_args.args[0].rev, "00")
+
+        # failures are logged, not raised
+        mock_store.reset_mock()
+        mock_store.side_effect = RuntimeError
+        render_document_artifacts_task(draft.name)
+        self.assertEqual(mock_store.call_count, 1)
+
+        mock_store.reset_mock()
+        render_document_artifacts_task("draft-does-not-exist")
+        self.assertFalse(mock_store.called)
+
+        # catch-up only renders revisions without a stored artifact
+        mock_store.reset_mock()
+        mock_store.side_effect = None
+        with mock.patch(
+            "ietf.doc.models.DocumentInfo.rendered_artifact_checksum",
+            side_effect=[None, "abc123"],
+        ):
+            render_recent_document_artifacts_task()
+        self.assertEqual(mock_store.call_count, 1)
+
     @mock.patch("ietf.doc.tasks.searchindex.update_or_create_rfc_entry")
     @mock.patch("ietf.doc.tasks.searchindex.enabled")
     def test_update_rfc_searchindex_task(
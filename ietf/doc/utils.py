@@ -53,7 +53,7 @@
 from ietf.group.models import Role, Group, GroupFeatures
 from ietf.ietfauth.utils import has_role, is_authorized_in_doc_stream, is_individual_draft_author, is_bofreq_editor
 from ietf.person.models import Email, Person
-from ietf.person.utils import get_active_balloters
+from ietf.person.utils import fill_in_email_caches, get_active_balloters
 from ietf.review.models import ReviewWish
 from ietf.utils import draft, log
 from ietf.utils.mail import parseaddr, send_mail
@@ -1058,6 +1058,8 @@ def rebuild_reference_relations(doc, filenames):
         if after != intended:
             errors.append("Attempted changed didn't achieve intended results")
         changed_references = True
+        from ietf.group.utils import invalidate_dependency_graphs_for_doc
+        invalidate_dependency_graphs_for_doc(doc)
     else:
         changed_references = False
 
@@ -1534,13 +1536,76 @@ def bibxml_for_draft(doc, rev=None):
 
 
 class DraftAliasGenerator:
+    """Generate the email aliases for drafts
+
+    Iterating works through the drafts in batches of batch_size, preloading the
+    authors, emails and RFC publication dates of each batch in a handful of
+    queries, and looks up the roles of each group only once per run. The
+    get_draft_*_emails() methods also work on their own for a single draft, in
+    which case they fall back to per-draft queries.
+    """
     days = 2 * 365
+    batch_size = 500
 
     def __init__(self, draft_queryset=None):
         if draft_queryset is not None:
             self.draft_queryset = draft_queryset.filter(type_id="draft")  # only drafts allowed
         else:
             self.draft_queryset = Document.objects.filter(type_id="draft")
+        self._author_emails = {}  # doc pk -> [Email], for preloaded drafts
+        self._group_ad_emails = {}  # group pk -> set of addresses
+        self._group_chair_emails = {}  # group pk -> set of addresses
+
+    def _preload(self, drafts):
+        """Fill in the per-draft data for a batch of drafts
+
+        The drafts must have been fetched with select_related("ad", "shepherd__person")
+        for this to pay off.
+        """
+        self._author_emails = {d.pk: [] for d in drafts}
+        for author in DocumentAuthor.objects.filter(
+            document__in=drafts, email__isnull=False
+        ).select_related("email__person"):
+            self._author_emails[author.document_id].append(author.email)
+
+        # Email.email_address() and Person.email_address() fall back to the
+        # person's current address, so seed those caches in bulk
+        people = [d.ad for d in drafts if d.ad_id]
+        people.extend(d.shepherd.person for d in drafts if d.shepherd_id and d.shepherd.person_id)
+        people.extend(
+            e.person
+            for emails in self._author_emails.values()
+            for e in emails
+            if e.person_id
+        )
+        fill_in_email_caches(people)
+
+    def _published_rfc_times(self, drafts):
+        """Get the publication time of the RFC each of the given drafts became
+
+        Returns a dict mapping draft pk to the time, or None if the RFC has no
+        published_rfc event.
+        """
+        rfc_for_draft = dict(
+            RelatedDocument.objects.filter(
+                source__in=drafts, relationship_id="became_rfc"
+            ).values_list("source_id", "target_id")
+        )
+        # DISTINCT ON fetches only the newest event per RFC
+        published = dict(
+            DocEvent.objects.filter(doc_id__in=rfc_for_draft.values(), type="published_rfc")
+            .order_by("doc_id", "-time", "-id")
+            .distinct("doc_id")
+            .values_list("doc_id", "time")
+        )
+        return {d.pk: published.get(rfc_for_draft.get(d.pk)) for d in drafts}
+
+    def _batches(self, drafts):
+        drafts = list(drafts.select_related("group", "ad", "shepherd__person"))
+        for start in range(0, len(drafts), self.batch_size):
+            batch = drafts[start:start + self.batch_size]
+            self._preload(batch)
+            yield batch
 
     def get_draft_ad_emails(self, doc):
         """Get AD email addresses for the given draft, if any."""
@@ -1548,7 +1613,9 @@ def get_draft_ad_emails(self, doc):
         ad_emails = set()
         # If working group document, return current WG ADs
         if doc.group and doc.group.acronym != "none":
-            ad_emails.update(get_group_ad_emails(doc.group))
+            if doc.group_id not in self._group_ad_emails:
+                self._group_ad_emails[doc.group_id] = get_group_ad_emails(doc.group)
+            ad_emails.update(self._group_ad_emails[doc.group_id])
         # Document may have an explicit AD set
         if doc.ad:
             ad_emails.add(doc.ad.email_address())
@@ -1559,7 +1626,9 @@ def get_draft_chair_emails(self, doc):
         from ietf.group.utils import get_group_role_emails  # avoid circular import
         chair_emails = set()
         if doc.group:
-            chair_emails.update(get_group_role_emails(doc.group, ["chair", "secr"]))
+            if doc.group_id not in self._group_chair_emails:
+                self._group_chair_emails[doc.group_id] = get_group_role_emails(doc.group, ["chair", "secr"])
+            chair_emails.update(self._group_chair_emails[doc.group_id])
         return chair_emails
 
     def get_draft_shepherd_email(self, doc):
@@ -1572,7 +1641,11 @@ def get_draft_shepherd_email(self, doc):
     def get_draft_authors_emails(self, doc):
         """Get list of authors for the given draft."""
         author_emails = set()
-        for email in Email.objects.filter(documentauthor__document=doc):
+        if doc.pk in self._author_emails:
+            emails = self._author_emails[doc.pk]
+        else:
+            emails = Email.objects.filter(documentauthor__document=doc)
+        for email in emails:
             if email.active:
                 author_emails.add(email.address)
             elif email.person:
@@ -1661,10 +1734,11 @@ def __iter__(self) -> Iterator[tuple[str, list[str]]]:
         active_state = State.objects.get(type_id="draft", slug="active")
         active_pks = []  # build a static list of the drafts we actually returned as "active"
         active_drafts = drafts.filter(states=active_state)
-        for this_draft in active_drafts:
-            active_pks.append(this_draft.pk)
-            for alias, addresses in self._yield_aliases_for_draft(this_draft):
-                yield alias, addresses
+        for batch in self._batches(active_drafts):
+            for this_draft in batch:
+                active_pks.append(this_draft.pk)
+                for alias, addresses in self._yield_aliases_for_draft(this_draft):
+                    yield alias, addresses
 
         # Annotate with the draft state slug so we can check for drafts that
         # have become RFCs
@@ -1680,15 +1754,19 @@ def __iter__(self) -> Iterator[tuple[str, list[str]]]:
                 ).values("state__slug"),
             )
         )
-        for this_draft in inactive_recent_drafts:
-            # Omit drafts that became RFCs, unless they were published in the last DEFAULT_YEARS
-            if this_draft.draft_state_slug == "rfc":
-                rfc = this_draft.became_rfc()
-                log.assertion("rfc is not None")
-                if rfc.latest_event(type='published_rfc').time < show_since:
-                    continue
-            for alias, addresses in self._yield_aliases_for_draft(this_draft):
-                yield alias, addresses
+        for batch in self._batches(inactive_recent_drafts):
+            published_rfc_times = self._published_rfc_times(
+                [d for d in batch if d.draft_state_slug == "rfc"]
+            )
+            for this_draft in batch:
+                # Omit drafts that became RFCs, unless they were published in the last DEFAULT_YEARS
+                if this_draft.draft_state_slug == "rfc":
+                    published_time = published_rfc_times[this_draft.pk]
+                    log.assertion("published_time is not None")
+                    if published_time is None or published_time < show_since:
+                        continue
+                for alias, addresses in self._yield_aliases_for_draft(this_draft):
+                    yield alias, addresses
 
 
 def get_doc_email_aliases(name: Optional[str] = None):
@@ -9,6 +9,8 @@
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
 
 from ietf.doc.models import (Document, RelatedDocument, DocEvent, TelechatDocEvent, BallotDocEvent,
     DocTypeName, RpcAssignmentDocEvent)
@@ -441,7 +443,10 @@ def prepare_document_table(request, docs, query=None, max_results=200, show_ad_a
     """Take a queryset of documents and a QueryDict with sorting info
     and return list of documents with attributes filled in for
     displaying a full table of information about the documents, plus
-    dict with information about the columns."""
+    dict with information about the columns.
+
+    The request may be None to leave out the information personal to
+    the logged-in user."""
 
     if not isinstance(docs, list):
         # evaluate and fill in attribute results immediately to decrease
@@ -460,7 +465,7 @@ def prepare_document_table(request, docs, query=None, max_results=200, show_ad_a
         docs = docs[:max_results]
 
     fill_in_document_table_attributes(docs)
-    if request.user.is_authenticated and hasattr(request.user, "person"):
+    if request is not None and request.user.is_authenticated and hasattr(request.user, "person"):
         augment_docs_and_person_with_person_info(docs, request.user.person)
     augment_docs_with_related_docs_info(docs)
 
@@ -633,3 +638,57 @@ def doc_type_name(doc_type):
     if doc_type == "draft":
         return "Internet-Draft"
     return DocTypeName.objects.get(slug=doc_type).name
+
+
+# Name, title and author names weigh more than the abstract. Names are split on
+# dashes so that draft-ietf-foo-bar matches a search for "foo bar" or "ietf-foo".
+# The simple configuration does no stemming, which would defeat the prefix
+# matching of full_text_search_query().
+DOCUMENT_SEARCH_VECTOR_SQL = """
+    INSERT INTO doc_documentsearchvector (document_id, vector)
+    SELECT d.id,
+        setweight(to_tsvector('simple', replace(d.name, '-', ' ')), 'A')
+        || setweight(to_tsvector('simple', coalesce(d.title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(p.name, ' ') FROM doc_documentauthor da
+            JOIN person_person p ON p.id = da.person_id WHERE da.document_id = d.id
+        ), '')), 'B')
+        || setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(ra.titlepage_name, ' ') FROM doc_rfcauthor ra
+            WHERE ra.document_id = d.id
+        ), '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(d.abstract, '')), 'C')
+    FROM doc_document d
+    {where}
+    ON CONFLICT (document_id) DO UPDATE SET vector = EXCLUDED.vector
+"""
+
+
+def update_document_search_vectors(doc_ids=None):
+    """Recompute the full-text search vectors of documents, or of all documents if doc_ids is None
+
+    Does nothing unless settings.DOC_SEARCH_FULL_TEXT is enabled.
+    """
+    if not settings.DOC_SEARCH_FULL_TEXT:
+        return
+    with connection.cursor() as cursor:
+        if doc_ids is None:
+            cursor.execute(DOCUMENT_SEARCH_VECTOR_SQL.format(where=""))
+        else:
+            cursor.execute(
+                DOCUMENT_SEARCH_VECTOR_SQL.format(where="WHERE d.id = ANY(%s)"),
+                [list(doc_ids)],
+            )
+
+
+def full_text_search_query(text):
+    """SearchQuery matching documents with words starting with each word of text
+
+    Returns None if text has no words to search for.
+    """
+    words = re.findall(r"[^\W_]+", text.lower())
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words), config="simple", search_type="raw"
+    )
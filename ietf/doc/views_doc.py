@@ -35,6 +35,7 @@
 
 
 import glob
+import hashlib
 import json
 import os
 import re
@@ -42,7 +43,6 @@
 from pathlib import Path
 
 from celery.result import AsyncResult
-from django.core.cache import caches
 from django.core.files.base import ContentFile
 from django.core.exceptions import PermissionDenied
 from django.db.models import Max
@@ -50,6 +50,8 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.urls import reverse as urlreverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.conf import settings
 from django import forms
 from django.contrib.auth.decorators import login_required
@@ -91,7 +93,8 @@
 from ietf.utils import markup_txt, log, markdown
 from ietf.utils.draft import get_status_from_draft_text
 from ietf.utils.meetecho import MeetechoAPIError, SlidesManager
-from ietf.utils.response import permission_denied
+from ietf.utils.response import permission_denied, ranged_response
+from ietf.utils.slowpages import slow_page_value
 from ietf.utils.text import maybe_split
 from ietf.utils.timezone import date_today
 from ietf.utils.unicodenormalize import normalize_for_sorting
@@ -1128,12 +1131,26 @@ def document_pdfized(request, name, rev=None, ext=None):
     if not os.path.exists(doc.get_file_name()):
         raise Http404("File not found: %s" % doc.get_file_name())
 
-    try:
-        pdf = doc.pdfized()
-    except Exception:
-        return render(request, "doc/weasyprint_failed.html")
+    # Answer conditional requests from the stored checksum without reading the pdf.
+    # Renderings are not byte-stable, so a stored pdf is then served as it is,
+    # rather than one that may have been rendered separately.
+    pdf = None
+    stored_etag = doc.rendered_artifact_checksum("pdfized")
+    if stored_etag:
+        not_modified = get_conditional_response(request, etag=quote_etag(stored_etag))
+        if not_modified is not None:
+            return not_modified
+        pdf = doc.retrieve_rendered_artifact("pdfized")
+
+    if pdf is None:
+        try:
+            pdf = doc.pdfized()
+        except Exception:
+            return render(request, "doc/weasyprint_failed.html")
     if pdf:
-        return HttpResponse(pdf,content_type='application/pdf')
+        # Hash what is served, in case the stored pdf was replaced meanwhile
+        etag = hashlib.sha384(pdf).hexdigest()
+        return ranged_response(request, pdf, "application/pdf", etag=etag)
     else:
         raise Http404
 
@@ -2096,18 +2113,18 @@ def remind_action_holders(request, name):
     )
 
 
+@slow_page_value(fresh_for=60 * 60)
+def all_doc_email_aliases():
+    return get_doc_email_aliases()
+
+
 @login_required
 def email_aliases(request):
     """List of all email aliases
     
     This is currently slow except when cached
     """
-    slowcache = caches["slowpages"]
-    cache_key = "emailaliasesview"
-    aliases = slowcache.get(cache_key)
-    if not aliases:
-        aliases = get_doc_email_aliases()  # gets all aliases
-        slowcache.set(cache_key, aliases, 3600)
+    aliases = all_doc_email_aliases()
     return render(
         request,
         "doc/email_aliases.html",
@@ -46,7 +46,7 @@
 
 from django import forms
 from django.conf import settings
-from django.core.cache import cache, caches
+from django.core.cache import cache
 from django.urls import reverse as urlreverse
 from django.db.models import Count, Model, Q
 from django.http import Http404, HttpResponseBadRequest, HttpResponse, HttpResponseRedirect, QueryDict
@@ -58,12 +58,13 @@
 
 import debug                            # pyflakes:ignore
 
-from ietf.doc.models import ( Document, DocHistory, DocumentAuthor, RelatedDocument,
+from ietf.doc.models import ( Document, DocHistory, DocumentAuthor, DocumentSearchVector, RelatedDocument,
     RfcAuthor, RpcActionHolderOpenEntry, State, NewRevisionDocEvent, IESG_SUBSTATE_TAGS,
     IESG_BALLOT_ACTIVE_STATES, IESG_STATCHG_CONFLREV_ACTIVE_STATES,
     IESG_CHARTER_ACTIVE_STATES )
 from ietf.doc.fields import select2_id_doc_name_json
 from ietf.doc.utils import (
+    augment_docs_and_person_with_person_info,
     augment_events_with_revision,
     needed_ballot_positions,
 )
@@ -75,7 +76,9 @@
 from ietf.utils.draft_search import normalize_draftname
 from ietf.utils.fields import ModelMultipleChoiceField
 from ietf.utils.log import log
-from ietf.doc.utils_search import prepare_document_table, doc_type, doc_state, doc_type_name, AD_WORKLOAD
+from ietf.utils.slowpages import slow_page_value
+from ietf.doc.utils_search import (prepare_document_table, doc_type, doc_state, doc_type_name, AD_WORKLOAD,
+    full_text_search_query)
 from ietf.ietfauth.utils import has_role
 from ietf.utils.unicodenormalize import normalize_for_sorting
 
@@ -149,6 +152,33 @@ def clean(self):
             q['irtfstate'] = None
         return q
 
+def full_text_name_queries(look_for, rfcs):
+    """Queries matching a name search against the document full-text search vectors
+
+    Stands in for the substring matches of retrieve_search_results(), which cannot
+    use an index. Returns None if look_for has nothing to search for.
+    """
+    # "RFC 1234" and "rfc1234" are the same search; the name is indexed as one word
+    look_for = re.sub(r"^(rfc|bcp|fyi|std)\s+(\d+)$", r"\1\2", look_for.strip().lower())
+    # a bare number is an RFC number, which is only indexed as part of the name
+    look_for = re.sub(r"^(\d+)$", r"rfc\1", look_for)
+    search_query = full_text_search_query(look_for)
+    if search_query is None:
+        return None
+    matching = DocumentSearchVector.objects.filter(vector=search_query).values("document_id")
+    queries = [Q(pk__in=matching)]
+    if rfcs:
+        # RFCs published from a matching draft, or contained in the subseries doc
+        # being searched for
+        relationships = ["became_rfc"]
+        if re.match(r"^(bcp|fyi|std)\d+$", look_for):
+            relationships.append("contains")
+        queries.append(Q(pk__in=RelatedDocument.objects.filter(
+            relationship_id__in=relationships, source__in=matching
+        ).values("target_id")))
+    return queries
+
+
 def retrieve_search_results(form, all_types=False):
     """Takes a validated SearchForm and return the results."""
 
@@ -178,7 +208,12 @@ def retrieve_search_results(form, all_types=False):
         docs = Document.objects.filter(type__in=types)
 
     # name
-    if query["name"]:
+    full_text_queries = None
+    if query["name"] and settings.DOC_SEARCH_FULL_TEXT:
+        full_text_queries = full_text_name_queries(query["name"], query["rfcs"])
+    if full_text_queries:
+        docs = docs.filter(reduce(operator.or_, full_text_queries))
+    elif query["name"]:
         look_for = query["name"]
         queries = [
             Q(name__icontains=look_for),
@@ -969,20 +1004,20 @@ def drafts_in_last_call(request):
         'form':form, 'docs':results, 'meta':meta, 'pages':pages
     })
 
+@slow_page_value(fresh_for=30 * 60, prewarm=[(7,)])
+def recent_drafts_table(days):
+    since = timezone.now()-datetime.timedelta(days=days)
+    state = State.objects.get(type='draft', slug='active')
+    events = NewRevisionDocEvent.objects.filter(time__gt=since)
+    names = [ e.doc.name for e in events ]
+    docs = Document.objects.filter(name__in=names, states=state)
+    # without a request, so the cached table has no personal information
+    return prepare_document_table(None, docs, query={'sort':'-date', }, max_results=len(names))
+
 def recent_drafts(request, days=7):
-    slowcache = caches['slowpages']
-    cache_key = f'recentdraftsview{days}'
-    cached_val = slowcache.get(cache_key)
-    if not cached_val:
-        since = timezone.now()-datetime.timedelta(days=days)
-        state = State.objects.get(type='draft', slug='active')
-        events = NewRevisionDocEvent.objects.filter(time__gt=since)
-        names = [ e.doc.name for e in events ]
-        docs = Document.objects.filter(name__in=names, states=state)
-        results, meta = prepare_document_table(request, docs, query={'sort':'-date', }, max_results=len(names))
-        slowcache.set(cache_key, [docs, results, meta], 1800)
-    else:
-        [docs, results, meta] = cached_val
+    results, meta = recent_drafts_table(days)
+    if request.user.is_authenticated and hasattr(request.user, "person"):
+        augment_docs_and_person_with_person_info(results, request.user.person)
 
     pages = 0
     for doc in results:
@@ -1039,13 +1074,12 @@ def index_all_drafts(request): # Should we rename this
 
     return render(request, 'doc/index_all_drafts.html', { "categories": categories })
 
+@slow_page_value(fresh_for=15 * 60)
+def active_drafts_index():
+    return active_drafts_index_by_group()
+
 def index_active_drafts(request):
-    slowcache = caches['slowpages']
-    cache_key = 'doc:index_active_drafts'
-    groups = slowcache.get(cache_key)
-    if not groups:
-        groups = active_drafts_index_by_group()
-        slowcache.set(cache_key, groups, 15*60)
+    groups = active_drafts_index()
     return render(request, "doc/index_active_drafts.html", { 'groups': groups })
 
 def ajax_select2_search_docs(request, model_name, doc_type): # TODO - remove model_name argument...
@@ -7,7 +7,7 @@
 
 from django.urls import reverse as urlreverse
 from django.db.models import Q
-from django.test import Client
+from django.test import Client, override_settings
 from django.utils import timezone
 
 import debug                             # pyflakes:ignore
@@ -20,6 +20,8 @@
     get_child_group_role_emails,
     get_group_ad_emails,
     get_group_email_aliases,
+    invalidate_dependency_graphs_for_doc,
+    compute_group_stats,
     GroupAliasGenerator,
     role_holder_emails,
 )
@@ -138,6 +140,31 @@ def test_group_stats(self):
             self.assertIn(doc.name, ids)
 
 
+    def test_compute_group_stats(self):
+        area = GroupFactory(type_id="area")
+        wg = GroupFactory(type_id="wg", parent=area)
+        concluded = GroupFactory(type_id="wg", parent=area, state_id="conclude")
+        draft1 = WgDraftFactory(group=wg, pages=10)
+        draft2 = WgDraftFactory(group=wg, pages=20)
+        WgDraftFactory(group=concluded, pages=40)
+        other_area = GroupFactory(type_id="area")
+        WgDraftFactory(group__type_id="ag", group__parent=other_area, pages=5)
+
+        data = {d["id"]: d for d in compute_group_stats()}
+        self.assertEqual(data[draft1.name]["pages"], 10)
+        self.assertEqual(data[draft2.name]["parent"], wg.acronym)
+        self.assertEqual(data[draft2.name]["grandparent"], area.acronym)
+        self.assertEqual((data[wg.acronym]["docs"], data[wg.acronym]["pages"]), (2, 30))
+        self.assertEqual((data[area.acronym]["docs"], data[area.acronym]["pages"]), (2, 30))
+        self.assertNotIn(concluded.acronym, data)
+        self.assertEqual((data[other_area.acronym]["docs"], data[other_area.acronym]["pages"]), (0, 0))
+        self.assertIn("ietf", data)
+
+        data = {d["id"]: d for d in compute_group_stats(only_active=False)}
+        self.assertEqual((data[concluded.acronym]["docs"], data[concluded.acronym]["active"]), (1, False))
+        self.assertEqual((data[area.acronym]["docs"], data[area.acronym]["pages"]), (3, 70))
+
+
 class GroupDocDependencyTests(TestCase):
     def setUp(self):
         super().setUp()
@@ -176,6 +203,39 @@ def test_group_document_dependencies(self):
                     self.fail("JSON load failed: %s" % e)
 
 
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "dependency-graph-test",
+            }
+        }
+    )
+    def test_group_document_dependencies_cached(self):
+        source = WgDraftFactory()
+        target = WgDraftFactory(group=source.group)
+        RelatedDocument.objects.create(source=source, target=target, relationship_id="refinfo")
+        url = urlreverse("ietf.group.views.dependencies", kwargs=dict(acronym=source.group.acronym))
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        graph = r.json()
+        self.assertCountEqual([n["id"] for n in graph["nodes"]], [source.name, target.name])
+        self.assertEqual(graph["links"], [{"source": source.name, "target": target.name, "rel": "refinfo"}])
+
+        # served from the cache until the references are rebuilt
+        other = WgDraftFactory(group=source.group)
+        RelatedDocument.objects.create(source=source, target=other, relationship_id="refnorm")
+        self.assertEqual(self.client.get(url).json(), graph)
+
+        invalidate_dependency_graphs_for_doc(source)
+        graph = self.client.get(url).json()
+        self.assertCountEqual(
+            [n["id"] for n in graph["nodes"]], [source.name, target.name, other.name]
+        )
+        self.assertEqual(len(graph["links"]), 2)
+
+
 class GenerateGroupAliasesTests(TestCase):
     def test_generator_class(self):
         """The GroupAliasGenerator should generate the same lists as the old mgmt cmd"""
@@ -5,6 +5,7 @@
 from itertools import chain
 from pathlib import Path
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -24,6 +25,7 @@
 from ietf.review.utils import can_manage_review_requests_for_team
 from ietf.utils import log, markdown
 from ietf.utils.history import get_history_object_for, copy_many_to_many_for_history
+from ietf.utils.slowpages import slow_page_value
 from ietf.doc.templatetags.ietf_filters import is_valid_url
 from functools import reduce
 
@@ -548,3 +550,228 @@ def fill_in_wg_drafts(group):
         # TODO: remote_field?
         rfc.remote_field = RelatedDocument.objects.filter(source=rfc,relationship_id__in=['obs','updates']).distinct()
         rfc.invrel = RelatedDocument.objects.filter(target=rfc,relationship_id__in=['obs','updates']).distinct()
+
+
+# The dependency graph of a group is cached until the references of one of its
+# documents are rebuilt, or for at most this long to pick up state changes.
+DEPENDENCY_GRAPH_CACHE_TIMEOUT = 60 * 60
+
+
+def dependency_graph_cache_key(group_id):
+    return f"group:dependency-graph:{group_id}"
+
+
+def build_dependency_graph(group, cl_docs):
+    """Reference graph between a group's documents and the documents they reference
+
+    The graph has node attributes keyed by node id and adjacency lists of
+    (target id, relationship) pairs keyed by source id. Node ids are document
+    names, or the RFC name of drafts that became RFCs.
+    """
+    references = Q(
+        Q(source__group=group) | Q(source__in=cl_docs),
+        source__type="draft",
+        relationship__slug__startswith="ref",
+    )
+    rfc_or_subseries = {"rfc", "bcp", "fyi", "std"}
+    both_rfcs = Q(source__type_id="rfc", target__type_id__in=rfc_or_subseries)
+    pre_rfc_draft_to_rfc = Q(
+        source__states__type="draft",
+        source__states__slug="rfc",
+        target__type_id__in=rfc_or_subseries,
+    )
+    both_pre_rfcs = Q(
+        source__states__type="draft",
+        source__states__slug="rfc",
+        target__type_id="draft",
+        target__states__type="draft",
+        target__states__slug="rfc",
+    )
+    inactive = Q(
+        source__states__type="draft",
+        source__states__slug__in=["expired", "repl"],
+    )
+    attractor = Q(target__name__in=["rfc5000", "rfc5741"])
+    removed = Q(source__states__type="draft", source__states__slug__in=["auth-rm", "ietf-rm"])
+    related = (
+        "source__std_level",
+        "source__intended_std_level",
+        "target__std_level",
+        "target__intended_std_level",
+        "relationship",
+    )
+    relations = list(
+        RelatedDocument.objects.filter(references)
+        .exclude(both_rfcs)
+        .exclude(pre_rfc_draft_to_rfc)
+        .exclude(both_pre_rfcs)
+        .exclude(inactive)
+        .exclude(attractor)
+        .exclude(removed)
+        .select_related(*related)
+    )
+
+    # Load each document once, with what its node needs, rather than through the
+    # relations, whose documents are separate instances with cold caches
+    docs = {}
+
+    def load_docs(pks):
+        docs.update(
+            (doc.pk, doc)
+            for doc in Document.objects.filter(pk__in=set(pks) - set(docs))
+            .select_related("group", "std_level", "intended_std_level")
+            .prefetch_related("states")
+        )
+
+    load_docs([x.target_id for x in relations])
+    links = {
+        x.pk: x
+        for x in relations
+        if (
+            docs[x.target_id].type_id not in rfc_or_subseries
+            and docs[x.target_id].get_state_slug("draft") != "rfc"
+        ) or x.is_downref()
+    }
+    links.update(
+        (x.pk, x)
+        for x in RelatedDocument.objects.filter(
+            relationship__slug="replaces",
+            target__in={x.target_id for x in links.values()},
+        ).select_related(*related)
+    )
+    load_docs(chain.from_iterable((x.source_id, x.target_id) for x in links.values()))
+
+    became_rfc = dict(
+        RelatedDocument.objects.filter(
+            relationship_id="became_rfc",
+            source__in={pk for x in links.values() for pk in (x.source_id, x.target_id)},
+        ).values_list("source_id", "target__name")
+    )
+
+    def node_id(doc):
+        return became_rfc.get(doc.pk, doc.name)
+
+    nodes = {}
+    adjacency = {}
+    for x in links.values():
+        source, target = docs[x.source_id], docs[x.target_id]
+        for doc in (source, target):
+            nodes.setdefault(node_id(doc), {
+                "rfc": doc.type_id == "rfc" or doc.pk in became_rfc,
+                "post-wg": doc.get_state_slug("draft-iesg") not in ["idexists", "dead"],
+                "expired": doc.get_state_slug("draft") == "expired",
+                "replaced": doc.get_state_slug("draft") == "repl",
+                "group": doc.group.acronym if doc.group and doc.group.acronym != "none" else "",
+                "url": doc.get_absolute_url(),
+                "level": doc.intended_std_level.name
+                if doc.intended_std_level
+                else doc.std_level.name
+                if doc.std_level
+                else "",
+            })
+        edge = [node_id(target), "downref" if x.is_downref() else x.relationship.slug]
+        edges = adjacency.setdefault(node_id(source), [])
+        if edge not in edges:
+            edges.append(edge)
+    return {"nodes": nodes, "adjacency": adjacency}
+
+
+def dependency_graph_json(graph):
+    """Nodes and links of a dependency graph in the form the dependencies view serves"""
+    return {
+        "nodes": [{"id": id, **attrs} for id, attrs in graph["nodes"].items()],
+        "links": [
+            {"source": source, "target": target, "rel": rel}
+            for source, edges in graph["adjacency"].items()
+            for target, rel in edges
+        ],
+    }
+
+
+def invalidate_dependency_graphs_for_doc(doc):
+    """Drop the cached dependency graphs that the references of doc appear in"""
+    group_ids = set(
+        CommunityList.objects.filter(tracked_docs=doc, group__isnull=False)
+        .values_list("group_id", flat=True)
+    )
+    if doc.group_id is not None:
+        group_ids.add(doc.group_id)
+    cache.delete_many([dependency_graph_cache_key(group_id) for group_id in group_ids])
+
+
+@slow_page_value(fresh_for=15 * 60, prewarm=[(3, True)])
+def compute_group_stats(years=3, only_active=True):
+    """Document, page and WG counts of areas, for the group stats chart
+
+    Returns a list of nodes for each recent IETF-stream draft, each WG and each
+    area, with the totals of WGs and areas summed from the drafts in one pass
+    over the rows of a single query.
+    """
+    when = timezone.now() - datetime.timedelta(days=int(years) * 365)
+    rows = (
+        Document.objects.filter(type="draft", stream="ietf", group__parent__type="area")
+        .filter(
+            Q(docevent__newrevisiondocevent__time__gte=when)
+            | Q(docevent__type="published_rfc", docevent__time__gte=when)
+        )
+        .exclude(states__type="draft", states__slug="repl")
+        .exclude(group__acronym="none")
+        .values_list(
+            "name",
+            "pages",
+            "group__acronym",
+            "group__type_id",
+            "group__state_id",
+            "group__parent__acronym",
+            "group__parent__state_id",
+        )
+        .distinct()
+        .order_by("group__parent__acronym", "group__acronym", "name")
+    )
+
+    areas = {}
+    for name, pages, wg, wg_type, wg_state, area, area_state in rows:
+        if only_active and area_state not in Group.ACTIVE_STATE_IDS:
+            continue
+        area_entry = areas.setdefault(area, {
+            "id": area,
+            "active": area_state in Group.ACTIVE_STATE_IDS,
+            "parent": "ietf",
+            "pages": 0,
+            "docs": 0,
+            "wgs": {},
+        })
+        # drafts of other groups in the area only make the area show up
+        if wg_type != "wg" or (only_active and wg_state not in Group.ACTIVE_STATE_IDS):
+            continue
+        wg_entry = area_entry["wgs"].setdefault(wg, {
+            "id": wg,
+            "active": wg_state in Group.ACTIVE_STATE_IDS,
+            "parent": area,
+            "grandparent": "ietf",
+            "pages": 0,
+            "docs": 0,
+            "drafts": [],
+        })
+        wg_entry["drafts"].append({
+            "id": name,
+            "active": True,
+            "parent": wg,
+            "grandparent": area,
+            "pages": pages,
+            "docs": 1,
+        })
+        wg_entry["pages"] += pages or 0
+        wg_entry["docs"] += 1
+        area_entry["pages"] += pages or 0
+        area_entry["docs"] += 1
+
+    data = []
+    for area_entry in areas.values():
+        for wg_entry in area_entry.pop("wgs").values():
+            data.extend(wg_entry.pop("drafts"))
+            data.append(wg_entry)
+        data.append(area_entry)
+    data.append({"id": "ietf", "active": True})
+    return data
+
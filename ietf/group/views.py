@@ -49,6 +49,7 @@
 from django import forms
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery, TextField, Value
 from django.db.models.functions import Coalesce
 from django.http import (
@@ -70,7 +71,7 @@
 
 from ietf.community.models import CommunityList, EmailSubscription
 from ietf.community.utils import docs_tracked_by_community_list
-from ietf.doc.models import DocTagName, State, RelatedDocument, Document, DocEvent
+from ietf.doc.models import DocTagName, State, Document, DocEvent
 from ietf.doc.templatetags.ietf_filters import clean_whitespace
 from ietf.doc.utils import get_chartering_type, get_tags_for_stream_id
 from ietf.doc.utils_charter import charter_name_for_group, replace_charter_of_replaced_group
@@ -88,7 +89,9 @@
                               construct_group_menu_context, get_group_materials,
                               save_group_in_history, can_manage_group, update_role_set,
                               get_group_or_404, setup_default_community_list_for_group, fill_in_charter_info,
-                              get_group_email_aliases)                              
+                              get_group_email_aliases, DEPENDENCY_GRAPH_CACHE_TIMEOUT,
+                              dependency_graph_cache_key, build_dependency_graph, dependency_graph_json,
+                              compute_group_stats)                              
 #
 from ietf.ietfauth.utils import has_role, is_authorized_in_group
 from ietf.mailtrigger.utils import gather_relevant_expansions
@@ -772,100 +775,26 @@ def materials(request, acronym, group_type=None):
                   }))
 
 
-@cache_page(60 * 60)
 def dependencies(request, acronym, group_type=None):
     group = get_group_or_404(acronym, group_type)
     if not group.features.has_documents:
         raise Http404
 
-    if not group.communitylist_set.exists():
-        setup_default_community_list_for_group(group)
-    clist = group.communitylist_set.first()
-
-    docs, meta, docs_related, meta_related = prepare_group_documents(
-        request, group, clist
-    )
-    cl_docs = set(docs).union(set(docs_related))
+    cache_key = dependency_graph_cache_key(group.pk)
+    graph = cache.get(cache_key)
+    if graph is None:
+        if not group.communitylist_set.exists():
+            setup_default_community_list_for_group(group)
+        clist = group.communitylist_set.first()
 
-    references = Q(
-        Q(source__group=group) | Q(source__in=cl_docs),
-        source__type="draft",
-        relationship__slug__startswith="ref",
-    )
-    rfc_or_subseries = {"rfc", "bcp", "fyi", "std"}
-    both_rfcs = Q(source__type_id="rfc", target__type_id__in=rfc_or_subseries)
-    pre_rfc_draft_to_rfc = Q(
-        source__states__type="draft",
-        source__states__slug="rfc",
-        target__type_id__in=rfc_or_subseries,
-    )
-    both_pre_rfcs = Q(
-        source__states__type="draft",
-        source__states__slug="rfc",
-        target__type_id="draft",
-        target__states__type="draft",
-        target__states__slug="rfc",
-    )
-    inactive = Q(
-        source__states__type="draft",
-        source__states__slug__in=["expired", "repl"],
-    )
-    attractor = Q(target__name__in=["rfc5000", "rfc5741"])
-    removed = Q(source__states__type="draft", source__states__slug__in=["auth-rm", "ietf-rm"])
-    relations = (
-        RelatedDocument.objects.filter(references)
-        .exclude(both_rfcs)
-        .exclude(pre_rfc_draft_to_rfc)
-        .exclude(both_pre_rfcs)
-        .exclude(inactive)
-        .exclude(attractor)
-        .exclude(removed)
-    )
-
-    links = set()
-    for x in relations:
-        always_include = x.target.type_id not in rfc_or_subseries and x.target.get_state_slug("draft") != "rfc" 
-        if always_include or x.is_downref():
-            links.add(x)
-
-    replacements = RelatedDocument.objects.filter(
-        relationship__slug="replaces",
-        target__in=[x.target for x in links],
-    )
-
-    for x in replacements:
-        links.add(x)
-
-    nodes = set([x.source for x in links]).union([x.target for x in links])
-    graph = {
-        "nodes": [
-            {
-                "id": x.became_rfc().name if x.became_rfc() else x.name,
-                "rfc": x.type_id == "rfc" or x.became_rfc() is not None,
-                "post-wg": x.get_state_slug("draft-iesg") not in ["idexists", "dead"],
-                "expired": x.get_state_slug("draft") == "expired",
-                "replaced": x.get_state_slug("draft") == "repl",
-                "group": x.group.acronym if x.group and x.group.acronym != "none" else "",
-                "url": x.get_absolute_url(),
-                "level": x.intended_std_level.name
-                if x.intended_std_level
-                else x.std_level.name
-                if x.std_level
-                else "",
-            }
-            for x in nodes
-        ],
-        "links": [
-            {
-                "source": x.source.became_rfc().name if x.source.became_rfc() else x.source.name,
-                "target": x.target.became_rfc().name if x.target.became_rfc() else x.target.name,
-                "rel": "downref" if x.is_downref() else x.relationship.slug,
-            }
-            for x in links
-        ],
-    }
+        docs, meta, docs_related, meta_related = prepare_group_documents(
+            request, group, clist
+        )
+        cl_docs = set(docs).union(set(docs_related))
+        graph = build_dependency_graph(group, cl_docs)
+        cache.set(cache_key, graph, DEPENDENCY_GRAPH_CACHE_TIMEOUT)
 
-    return HttpResponse(json.dumps(graph), content_type="application/json")
+    return HttpResponse(json.dumps(dependency_graph_json(graph)), content_type="application/json")
 
 
 def email_aliases(request, acronym=None, group_type=None):
@@ -1508,82 +1437,8 @@ def group_menu_data(request):
 
 
 @cache_control(public=True, max_age=30 * 60)
-@cache_page(30 * 60)
 def group_stats_data(request, years="3", only_active=True):
-    when = timezone.now() - datetime.timedelta(days=int(years) * 365)
-    docs = (
-        Document.objects.filter(type="draft", stream="ietf")
-        .filter(
-            Q(docevent__newrevisiondocevent__time__gte=when)
-            | Q(docevent__type="published_rfc", docevent__time__gte=when)
-        )
-        .exclude(states__type="draft", states__slug="repl")
-        .distinct()
-    )
-
-    data = []
-    for a in Group.objects.filter(type="area"):
-        if only_active and not a.is_active:
-            continue
-
-        area_docs = docs.filter(group__parent=a).exclude(group__acronym="none")
-        if not area_docs:
-            continue
-
-        area_page_cnt = 0
-        area_doc_cnt = 0
-        for wg in Group.objects.filter(type="wg", parent=a):
-            if only_active and not wg.is_active:
-                continue
-
-            wg_docs = area_docs.filter(group=wg)
-            if not wg_docs:
-                continue
-
-            wg_page_cnt = 0
-            for doc in wg_docs:
-                # add doc data
-                data.append(
-                    {
-                        "id": doc.name,
-                        "active": True,
-                        "parent": wg.acronym,
-                        "grandparent": a.acronym,
-                        "pages": doc.pages,
-                        "docs": 1,
-                    }
-                )
-                wg_page_cnt += doc.pages
-
-            area_doc_cnt += len(wg_docs)
-            area_docs = area_docs.exclude(group=wg)
-
-            # add WG data
-            data.append(
-                {
-                    "id": wg.acronym,
-                    "active": wg.is_active,
-                    "parent": a.acronym,
-                    "grandparent": "ietf",
-                    "pages": wg_page_cnt,
-                    "docs": len(wg_docs),
-                }
-            )
-            area_page_cnt += wg_page_cnt
-
-        # add area data
-        data.append(
-            {
-                "id": a.acronym,
-                "active": a.is_active,
-                "parent": "ietf",
-                "pages": area_page_cnt,
-                "docs": area_doc_cnt,
-            }
-        )
-
-    data.append({"id": "ietf", "active": True})
-    return JsonResponse(data, safe=False)
+    return JsonResponse(compute_group_stats(int(years), only_active), safe=False)
 
 
 # --- Review views -----------------------------------------------------
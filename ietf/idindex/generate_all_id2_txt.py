@@ -43,6 +43,6 @@
 import django
 django.setup()
 
-from ietf.idindex.index import all_id2_txt
+from ietf.idindex.index import all_id2_txt_lines
 
-sys.stdout.write(all_id2_txt())
+sys.stdout.writelines(all_id2_txt_lines())
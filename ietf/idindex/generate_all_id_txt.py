@@ -41,6 +41,6 @@
 import django
 django.setup()
 
-from ietf.idindex.index import all_id_txt
+from ietf.idindex.index import all_id_txt_lines
 
-sys.stdout.write(all_id_txt())
+sys.stdout.writelines(all_id_txt_lines())
@@ -41,7 +41,7 @@
 import django
 django.setup()
 
-from ietf.idindex.index import id_index_txt
+from ietf.idindex.index import id_index_txt_chunks
 
-sys.stdout.write(id_index_txt())
+sys.stdout.writelines(id_index_txt_chunks())
 
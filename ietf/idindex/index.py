@@ -1,4 +1,4 @@
-# Copyright The IETF Trust 2013-2020, All Rights Reserved
+# Copyright The IETF Trust 2013-2026, All Rights Reserved
 # -*- coding: utf-8 -*-
 
 
@@ -8,7 +8,12 @@
 import datetime
 import os
 
+from collections import defaultdict
+
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.functions import Collate
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -19,63 +24,118 @@
 from ietf.doc.models import IESG_SUBSTATE_TAGS
 from ietf.doc.templatetags.ietf_filters import clean_whitespace
 from ietf.group.models import Group
+from ietf.idindex.models import IndexBuild, IndexEntry
 from ietf.person.models import Person, Email
 
-def all_id_txt():
-    # this returns a lot of data so try to be efficient
-
-    # precalculations
-    revision_time = dict(NewRevisionDocEvent.objects.filter(type="new_revision", doc__name__startswith="draft-").order_by('time').values_list("doc__name", "time"))
-
-    def formatted_rev_date(name):
-        t = revision_time.get(name)
-        return t.strftime("%Y-%m-%d") if t else ""
-
-    rfcs = dict()
-    for rfc in Document.objects.filter(type_id="rfc"):
-        draft = rfc.came_from_draft()
-        if draft is not None:
-            rfcs[draft.name] = rfc.name
-
-    replacements = dict(RelatedDocument.objects.filter(target__states=State.objects.get(type="draft", slug="repl"),
-                                                       relationship="replaces").values_list("target__name", "source__name"))
-
+# Sorts drafts with no revision events first in 1id-index.txt
+FALLBACK_REV_TIME = datetime.datetime(1950, 1, 1, tzinfo=datetime.UTC)
+
+def _latest_revision_dates(event_model, names=None):
+    """Map draft names to the date (YYYY-MM-DD) of their latest new_revision event"""
+    events = event_model.objects.filter(type="new_revision", doc__name__startswith="draft-")
+    if names is not None:
+        events = events.filter(doc__name__in=names)
+    return {
+        name: time.strftime("%Y-%m-%d")
+        for name, time in events.order_by().values("doc__name").annotate(
+            latest=Max("time")
+        ).values_list("doc__name", "latest").iterator()
+    }
+
+
+def _rfcs_by_draft_name(names=None):
+    """Map draft names to the name of the RFC each became, in one query"""
+    relations = RelatedDocument.objects.filter(
+        relationship_id="became_rfc", source__type_id="draft", target__type_id="rfc"
+    )
+    if names is not None:
+        relations = relations.filter(source__name__in=names)
+    return dict(relations.values_list("source__name", "target__name"))
+
+
+def _replacements(names=None):
+    relations = RelatedDocument.objects.filter(target__states=State.objects.get(type="draft", slug="repl"),
+                                               relationship="replaces")
+    if names is not None:
+        relations = relations.filter(target__name__in=names)
+    return dict(relations.values_list("target__name", "source__name"))
+
+
+def _iesg_substate_tags(names=None):
+    """Map draft names to the names of their IESG substate tags"""
+    tags = defaultdict(list)
+    doc_tags = Document.tags.through.objects.filter(
+        document__type_id="draft", doctagname__slug__in=IESG_SUBSTATE_TAGS
+    )
+    if names is not None:
+        doc_tags = doc_tags.filter(document__name__in=names)
+    for name, tag in doc_tags.order_by("doctagname__order", "doctagname__name").values_list(
+        "document__name", "doctagname__name"
+    ).iterator():
+        tags[name].append(tag)
+    return tags
+
+
+def _render_around(template_name, context, placeholder):
+    """Render a template and split it where the placeholder variable goes
+
+    Lets the streaming builders emit a template's header and footer around
+    content they generate piece by piece.
+    """
+    marker = f"\x00{placeholder}\x00"
+    head, tail = render_to_string(template_name, dict(context, **{placeholder: marker})).split(marker)
+    return head, tail
+
+
+def all_id_entries(names=None):
+    """Generate the all_id.txt entries as (name, section, sort_key, line) tuples
+
+    Entries come in file order. If names is given, only those drafts are
+    considered.
+    """
+    revision_dates = _latest_revision_dates(NewRevisionDocEvent, names)
+    rfcs = _rfcs_by_draft_name(names)
+    replacements = _replacements(names)
+    substate_tags = _iesg_substate_tags(names)
 
     # we need a distinct to prevent the queries below from multiplying the result
     all_ids = Document.objects.filter(type="draft").order_by('name').distinct()
+    if names is not None:
+        all_ids = all_ids.filter(name__in=names)
 
-    res = ["\nInternet-Drafts Status Summary\n"]
-
-    def add_line(f1, f2, f3, f4):
+    def line(f1, f2, f3, f4):
         # each line must have exactly 4 tab-separated fields
-        res.append(f1 + "\t" + f2 + "\t" + f3 + "\t" + f4)
+        return f1 + "\t" + f2 + "\t" + f3 + "\t" + f4 + "\n"
 
 
     inactive_states = ["idexists", "pub", "dead"]
 
     excludes = list(State.objects.filter(type="draft", slug__in=["rfc","repl"]))
     includes = list(State.objects.filter(type="draft-iesg").exclude(slug__in=inactive_states))
-    in_iesg_process = all_ids.exclude(states__in=excludes).filter(states__in=includes).only("name", "rev")
+    in_iesg_process = all_ids.exclude(states__in=excludes).filter(states__in=includes).only("name", "rev").prefetch_related("states")
 
     # handle those actively in the IESG process
-    for d in in_iesg_process:
+    in_iesg_process_ids = []
+    for d in in_iesg_process.iterator(chunk_size=2000):
+        in_iesg_process_ids.append(d.pk)
         state = d.get_state("draft-iesg").name
-        tags = d.tags.filter(slug__in=IESG_SUBSTATE_TAGS).values_list("name", flat=True)
+        tags = substate_tags.get(d.name)
         if tags:
             state += "::" + "::".join(tags)
-        add_line(d.name + "-" + d.rev,
-                 formatted_rev_date(d.name),
-                 "In IESG processing - I-D Tracker state <" + state + ">",
-                 "",
-                 )
+        yield (d.name, "", "0\t" + d.name,
+               line(d.name + "-" + d.rev,
+                    revision_dates.get(d.name, ""),
+                    "In IESG processing - I-D Tracker state <" + state + ">",
+                    "",
+                    ))
 
 
     # handle the rest
 
-    not_in_process = all_ids.exclude(pk__in=[d.pk for d in in_iesg_process])
+    not_in_process = all_ids.exclude(pk__in=in_iesg_process_ids)
 
     for s in State.objects.filter(type="draft").order_by("order"):
-        for name, rev in not_in_process.filter(states=s).values_list("name", "rev"):
+        for name, rev in not_in_process.filter(states=s).values_list("name", "rev").iterator():
             state = s.name
             last_field = ""
 
@@ -86,13 +146,26 @@ def add_line(f1, f2, f3, f4):
             elif s.slug == "repl":
                 state += " replaced by " + replacements.get(name, "0")
 
-            add_line(name + "-" + rev,
-                     formatted_rev_date(name),
-                     state,
-                     last_field,
-                    )
+            yield (name, "", "1\t%04d\t%s" % (s.order, name),
+                   line(name + "-" + rev,
+                        revision_dates.get(name, ""),
+                        state,
+                        last_field,
+                        ))
+
+def all_id_txt_lines(lines=None):
+    """Generate the contents of all_id.txt a line at a time
 
-    return "\n".join(res) + "\n"
+    Documents are read with server-side cursors, so the index is never held
+    in memory as a whole. Pre-generated entry lines can be passed in instead.
+    """
+    yield "\nInternet-Drafts Status Summary\n\n"
+    if lines is None:
+        lines = (entry[3] for entry in all_id_entries())
+    yield from lines
+
+def all_id_txt():
+    return "".join(all_id_txt_lines())
 
 def file_types_for_drafts():
     """Look in the draft directory and return file types found as dict (name + rev -> [t1, t2, ...])."""
@@ -108,44 +181,52 @@ def file_types_for_drafts():
 
     return file_types
 
-def all_id2_txt():
+def all_id2_entries(names=None):
+    """Generate the all_id2.txt entries as (name, section, sort_key, line) tuples
+
+    Entries come in file order. If names is given, only those drafts are
+    considered.
+    """
     # this returns a lot of data so try to be efficient
 
     drafts = Document.objects.filter(type="draft").order_by('name')
     drafts = drafts.select_related('group', 'group__parent', 'ad', 'intended_std_level', 'shepherd', )
     drafts = drafts.prefetch_related("states")
+    if names is not None:
+        drafts = drafts.filter(name__in=names)
 
-    rfcs = dict()
-    for rfc in Document.objects.filter(type_id="rfc"):
-        draft = rfc.came_from_draft()
-        if draft is not None:
-            rfcs[draft.name] = rfc.name
-
-    replacements = dict(RelatedDocument.objects.filter(target__states=State.objects.get(type="draft", slug="repl"),
-                                                       relationship="replaces").values_list("target__name", "source__name"))
-
-    revision_time = dict(DocEvent.objects.filter(type="new_revision", doc__name__startswith="draft-").order_by('time').values_list("doc__name", "time"))
+    rfcs = _rfcs_by_draft_name(names)
+    replacements = _replacements(names)
+    revision_dates = _latest_revision_dates(DocEvent, names)
+    substate_tags = _iesg_substate_tags(names)
 
     file_types = file_types_for_drafts()
 
+    doc_authors = DocumentAuthor.objects.filter(document__name__startswith="draft-")
+    if names is not None:
+        doc_authors = doc_authors.filter(document__name__in=names)
     authors = {}
-    for a in DocumentAuthor.objects.filter(document__name__startswith="draft-").order_by("order").select_related("email", "person").iterator():
-        if a.document.name not in authors:
-            l = authors[a.document.name] = []
+    for a in doc_authors.order_by("order").select_related("email", "person").annotate(document_name=F("document__name")).iterator():
+        if a.document_name not in authors:
+            l = authors[a.document_name] = []
         else:
-            l = authors[a.document.name]
+            l = authors[a.document_name]
         if a.email:
             l.append('%s <%s>' % (a.person.plain_name().replace("@", ""), a.email.address.replace(",", "")))
         else:
             l.append(a.person.plain_name())
 
+    shepherd_emails = Email.objects.filter(shepherd_document_set__type="draft")
+    ad_people = Person.objects.filter(ad_document_set__type="draft")
+    if names is not None:
+        shepherd_emails = shepherd_emails.filter(shepherd_document_set__name__in=names)
+        ad_people = ad_people.filter(ad_document_set__name__in=names)
     shepherds = dict((e.pk, e.formatted_ascii_email().replace('"', ''))
-                     for e in Email.objects.filter(shepherd_document_set__type="draft").select_related("person").distinct())
+                     for e in shepherd_emails.select_related("person").distinct())
     ads = dict((p.pk, p.formatted_ascii_email().replace('"', ''))
-               for p in Person.objects.filter(ad_document_set__type="draft").distinct())
+               for p in ad_people.distinct())
 
-    res = []
-    for d in drafts:
+    for d in drafts.iterator(chunk_size=2000):
         state = d.get_state_slug()
         iesg_state = d.get_state("draft-iesg")
 
@@ -161,7 +242,7 @@ def all_id2_txt():
             s = "I-D Exists"
             if iesg_state:
                 s = iesg_state.name
-                tags = d.tags.filter(slug__in=IESG_SUBSTATE_TAGS).values_list("name", flat=True)
+                tags = substate_tags.get(d.name)
                 if tags:
                     s += "::" + "::".join(tags)
             fields.append(s)
@@ -180,8 +261,7 @@ def all_id2_txt():
             repl = replacements.get(d.name, "")
         fields.append(repl)
         # 6
-        t = revision_time.get(d.name)
-        fields.append(t.strftime("%Y-%m-%d") if t else "")
+        fields.append(revision_dates.get(d.name, ""))
         # 7
         group_acronym = ""
         if d.group and d.group.type_id != "area" and d.group.acronym != "none":
@@ -220,13 +300,28 @@ def all_id2_txt():
         fields.append(ads.get(d.ad_id, ""))
 
         #
-        res.append("\t".join(fields))
+        yield (d.name, "", d.name, "\t".join(fields))
+
+def all_id2_txt_lines(lines=None):
+    """Generate the contents of all_id2.txt a line at a time"""
+    if lines is None:
+        lines = (entry[3] for entry in all_id2_entries())
+    head, tail = _render_around("idindex/all_id2.txt", {}, "data")
+    yield head
+    separator = ""
+    for line in lines:
+        yield separator + line
+        separator = "\n"
+    yield tail
 
-    return render_to_string("idindex/all_id2.txt", {'data': "\n".join(res) })
+def all_id2_txt():
+    return "".join(all_id2_txt_lines())
 
-def active_drafts_index_by_group(extra_values=()):
+def active_drafts_index_by_group(extra_values=(), names=None):
     """Return active drafts grouped into their corresponding
-    associated group, for spitting out draft index."""
+    associated group, for spitting out draft index.
+
+    If names is given, only those drafts are included."""
 
     # this returns a lot of data so try to be efficient
 
@@ -239,15 +334,23 @@ def active_drafts_index_by_group(extra_values=()):
 
     extracted_values = ("name", "rev", "title", "group_id") + extra_values
 
+    active_docs = Document.objects.filter(states=active_state)
+    revision_events = NewRevisionDocEvent.objects.filter(type="new_revision", doc__states=active_state)
+    doc_authors = DocumentAuthor.objects.filter(document__states=active_state)
+    if names is not None:
+        active_docs = active_docs.filter(name__in=names)
+        revision_events = revision_events.filter(doc__name__in=names)
+        doc_authors = doc_authors.filter(document__name__in=names)
+
     docs_dict = dict((d["name"], d)
-                     for d in Document.objects.filter(states=active_state).values(*extracted_values))
+                     for d in active_docs.values(*extracted_values))
 
     # Special case for drafts with group set, but in state wg_cand:
-    for d in Document.objects.filter(states=active_state).filter(states__in=[wg_cand, wg_adopt]):
-        docs_dict[d.name]['group_id'] = individual.id
+    for name in active_docs.filter(states__in=[wg_cand, wg_adopt]).values_list("name", flat=True):
+        docs_dict[name]['group_id'] = individual.id
 
     # add initial and latest revision time
-    for time, doc_name in NewRevisionDocEvent.objects.filter(type="new_revision", doc__states=active_state).order_by('-time').values_list("time", "doc__name"):
+    for time, doc_name in revision_events.order_by('-time').values_list("time", "doc__name"):
         d = docs_dict.get(doc_name)
         if d:
             if "rev_time" not in d:
@@ -255,8 +358,8 @@ def active_drafts_index_by_group(extra_values=()):
             d["initial_rev_time"] = time
 
     # add authors
-    for a in DocumentAuthor.objects.filter(document__states=active_state).order_by("order").select_related("person"):
-        d = docs_dict.get(a.document.name)
+    for a in doc_authors.order_by("order").select_related("person").annotate(document_name=F("document__name")):
+        d = docs_dict.get(a.document_name)
         if d:
             if "authors" not in d:
                 d["authors"] = []
@@ -276,20 +379,30 @@ def active_drafts_index_by_group(extra_values=()):
     groups = [g for g in groups_dict.values() if hasattr(g, "active_drafts")]
     groups.sort(key=lambda g: g.acronym)
 
-    fallback_time = datetime.datetime(1950, 1, 1, tzinfo=datetime.UTC)
     for g in groups:
-        g.active_drafts.sort(key=lambda d: d.get("initial_rev_time", fallback_time))
+        g.active_drafts.sort(key=lambda d: d.get("initial_rev_time", FALLBACK_REV_TIME))
 
     return groups
     
-def id_index_txt(with_abstracts=False):
+def id_index_group_header(group):
+    return render_to_string("idindex/id_index_group.txt", {'group': group})
+
+def id_index_entries(with_abstracts=False, names=None):
+    """Generate the 1id-index.txt (or 1id-abstracts.txt) entries as
+    (name, section, sort_key, text) tuples
+
+    Each group gets a header entry with an empty name, followed by the entries
+    of its drafts. Entries come in file order. If names is given, only those
+    drafts (and the headers of their groups) are generated.
+    """
     extra_values = ()
     if with_abstracts:
         extra_values = ("abstract",)
-    groups = active_drafts_index_by_group(extra_values)
+    groups = active_drafts_index_by_group(extra_values, names=names)
 
     file_types = file_types_for_drafts()
     for g in groups:
+        yield ("", g.acronym, g.acronym + "\t", id_index_group_header(g))
         for d in g.active_drafts:
             # we need to output a multiple extension thing
             types = file_types.get(d["name"] + "-" + d["rev"], "")
@@ -299,9 +412,148 @@ def id_index_txt(with_abstracts=False):
             if ".pdf" in types:
                 exts += ",.pdf"
             d["exts"] = exts
-
-    return render_to_string("idindex/id_index.txt", {
-            'groups': groups,
+            initial_rev_time = d.get("initial_rev_time", FALLBACK_REV_TIME)
+            yield (
+                d["name"],
+                g.acronym,
+                "%s\t%s\t%s" % (g.acronym, initial_rev_time.astimezone(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%S.%f"), d["name"]),
+                render_to_string("idindex/id_index_draft.txt", {
+                    'd': d,
+                    'with_abstracts': with_abstracts,
+                }),
+            )
+
+def id_index_txt_chunks(with_abstracts=False, chunks=None):
+    """Generate the contents of 1id-index.txt (or 1id-abstracts.txt) an entry at a time"""
+    if chunks is None:
+        chunks = (entry[3] for entry in id_index_entries(with_abstracts))
+    head, tail = _render_around(
+        "idindex/id_index.txt",
+        {
             'time': timezone.now().astimezone(datetime.UTC).strftime("%Y-%m-%d %H:%M:%S %Z"),
             'with_abstracts': with_abstracts,
-            })
+        },
+        "group_sections",
+    )
+    yield head
+    yield from chunks
+    yield tail
+
+def id_index_txt(with_abstracts=False):
+    return "".join(id_index_txt_chunks(with_abstracts))
+
+
+# Bump this whenever the text generated for an index entry changes, so that
+# stored entries are regenerated by the next update
+INDEX_FORMAT_VERSION = 1
+
+# Allow for events committed late by transactions that started before a build
+INDEX_CHANGE_MARGIN = datetime.timedelta(minutes=5)
+
+INDEX_ENTRY_BATCH_SIZE = 2000
+
+def _index_entry_generators(names=None):
+    return {
+        "all_id": all_id_entries(names),
+        "all_id2": all_id2_entries(names),
+        "id_index": id_index_entries(names=names),
+        "id_abstracts": id_index_entries(with_abstracts=True, names=names),
+    }
+
+def _dirty_draft_names(since):
+    """Names of the drafts whose index entries may have changed since the given time"""
+    changed = DocEvent.objects.filter(time__gte=since)
+    names = set(changed.filter(doc__type_id="draft").values_list("doc__name", flat=True))
+    # the RFC number shows up in the entry of the draft that became the RFC
+    names.update(
+        RelatedDocument.objects.filter(
+            relationship_id="became_rfc",
+            target__in=changed.filter(doc__type_id="rfc").values("doc"),
+        ).values_list("source__name", flat=True)
+    )
+    # and the replacing draft in the entry of the one it replaced
+    names.update(
+        RelatedDocument.objects.filter(
+            relationship_id="replaces",
+            source__name__in=names,
+        ).values_list("target__name", flat=True)
+    )
+    return names
+
+def _store_index_entries(entries, kind):
+    batch = []
+    for name, section, sort_key, text in entries:
+        batch.append(IndexEntry(kind=kind, name=name, section=section, sort_key=sort_key, text=text))
+        if len(batch) >= INDEX_ENTRY_BATCH_SIZE:
+            IndexEntry.objects.bulk_create(batch)
+            batch = []
+    IndexEntry.objects.bulk_create(batch)
+
+def _update_index_entries_for(names):
+    """Regenerate the stored entries of the given drafts
+
+    Group headers of 1id-index.txt and 1id-abstracts.txt are refreshed for the
+    groups the drafts are now listed under, and dropped for groups that are
+    left without drafts.
+    """
+    for kind, entries in _index_entry_generators(names).items():
+        stale = IndexEntry.objects.filter(kind=kind, name__in=names)
+        sections = set(stale.exclude(section="").values_list("section", flat=True))
+        stale.delete()
+        headers = []
+        drafts = []
+        for entry in entries:
+            (drafts if entry[0] else headers).append(entry)
+        _store_index_entries(drafts, kind)
+
+        # groups the drafts moved out of may still list other drafts
+        fresh_sections = set(entry[1] for entry in headers)
+        populated = set(
+            IndexEntry.objects.filter(kind=kind, section__in=sections - fresh_sections)
+            .exclude(name="").values_list("section", flat=True)
+        )
+        headers.extend(
+            ("", g.acronym, g.acronym + "\t", id_index_group_header(g))
+            for g in Group.objects.filter(acronym__in=populated)
+        )
+        IndexEntry.objects.filter(kind=kind, name="", section__in=sections | fresh_sections).delete()
+        _store_index_entries(headers, kind)
+
+def update_index_entries(full=False):
+    """Bring the stored I-D index entries up to date
+
+    Unless full is set, no entries have been built yet, or INDEX_FORMAT_VERSION
+    has changed since the last build, only the entries of drafts touched by
+    DocEvents since the last build are regenerated. Changes that leave no such
+    trace, like a group being renamed, are picked up by the next full rebuild.
+
+    Returns the new IndexBuild.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # serializes concurrent builders
+        last = IndexBuild.objects.select_for_update().order_by("-pk").first()
+        full = full or last is None or last.format_version != INDEX_FORMAT_VERSION
+        if full:
+            IndexEntry.objects.all().delete()
+            for kind, entries in _index_entry_generators().items():
+                _store_index_entries(entries, kind)
+        else:
+            names = _dirty_draft_names(last.time - INDEX_CHANGE_MARGIN)
+            if names:
+                _update_index_entries_for(names)
+        return IndexBuild.objects.create(time=now, full=full, format_version=INDEX_FORMAT_VERSION)
+
+def stored_index_entries(kind):
+    """Generate the text of the stored entries of a kind, in file order"""
+    sort_key = F("sort_key")
+    if kind in ("id_index", "id_abstracts"):
+        # groups and revision times are ordered by code point, as in
+        # active_drafts_index_by_group(), not by the database's collation
+        sort_key = Collate(sort_key, "C")
+    return (
+        IndexEntry.objects.filter(kind=kind)
+        .order_by(sort_key)
+        .values_list("text", flat=True)
+        .iterator(chunk_size=INDEX_ENTRY_BATCH_SIZE)
+    )
@@ -0,0 +1,54 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexBuild",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("time", models.DateTimeField(default=django.utils.timezone.now)),
+                ("full", models.BooleanField(default=False, help_text="Whether all entries were regenerated")),
+                ("format_version", models.IntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="IndexEntry",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("all_id", "all_id.txt"),
+                            ("all_id2", "all_id2.txt"),
+                            ("id_index", "1id-index.txt"),
+                            ("id_abstracts", "1id-abstracts.txt"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("name", models.CharField(blank=True, help_text="Draft name, or empty for a section header", max_length=255)),
+                ("section", models.CharField(blank=True, help_text="Group acronym the entry is listed under, if any", max_length=64)),
+                ("sort_key", models.CharField(max_length=512)),
+                ("text", models.TextField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["kind", "sort_key"], name="idindex_ind_kind_d22e09_idx"),
+                    models.Index(fields=["kind", "name"], name="idindex_ind_kind_1e63b2_idx"),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="indexentry",
+            constraint=models.UniqueConstraint(fields=("kind", "section", "name"), name="unique_indexentry_kind_section_name"),
+        ),
+    ]
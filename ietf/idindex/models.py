@@ -0,0 +1,55 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+# -*- coding: utf-8 -*-
+
+
+from django.db import models
+from django.utils import timezone
+
+import debug                            # pyflakes:ignore
+
+
+class IndexBuild(models.Model):
+    """A run of the I-D index builder
+
+    time is when the run started; drafts changed after it are picked up by the
+    next run. format_version records the INDEX_FORMAT_VERSION the entries were
+    generated with, so that a format change forces a full rebuild.
+    """
+    time = models.DateTimeField(default=timezone.now)
+    full = models.BooleanField(default=False, help_text="Whether all entries were regenerated")
+    format_version = models.IntegerField()
+
+    def __str__(self):
+        return "I-D index build at %s%s" % (self.time, " (full)" if self.full else "")
+
+
+class IndexEntry(models.Model):
+    """The text one draft contributes to a generated I-D index file
+
+    The index files are written by concatenating the entries of a kind in
+    sort_key order. Entries with an empty name are section headers, used for
+    the per-group headings of 1id-index.txt and 1id-abstracts.txt.
+    """
+    KINDS = [
+        ("all_id", "all_id.txt"),
+        ("all_id2", "all_id2.txt"),
+        ("id_index", "1id-index.txt"),
+        ("id_abstracts", "1id-abstracts.txt"),
+    ]
+    kind = models.CharField(max_length=16, choices=KINDS)
+    name = models.CharField(max_length=255, blank=True, help_text="Draft name, or empty for a section header")
+    section = models.CharField(max_length=64, blank=True, help_text="Group acronym the entry is listed under, if any")
+    sort_key = models.CharField(max_length=512)
+    text = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "section", "name"], name="unique_indexentry_kind_section_name"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "sort_key"]),
+            models.Index(fields=["kind", "name"]),
+        ]
+
+    def __str__(self):
+        return "%s entry %s" % (self.kind, self.name or self.section)
@@ -0,0 +1,43 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+# -*- coding: utf-8 -*-
+
+
+from ietf.api import ModelResource
+from tastypie.constants import ALL
+from tastypie.cache import SimpleCache
+
+from ietf import api
+
+from ietf.idindex.models import IndexBuild, IndexEntry
+
+
+class IndexBuildResource(ModelResource):
+    class Meta:
+        queryset = IndexBuild.objects.all()
+        serializer = api.Serializer()
+        cache = SimpleCache()
+        #resource_name = 'indexbuild'
+        ordering = ['id', ]
+        filtering = { 
+            "id": ALL,
+            "time": ALL,
+            "full": ALL,
+            "format_version": ALL,
+        }
+api.idindex.register(IndexBuildResource())
+
+
+class IndexEntryResource(ModelResource):
+    class Meta:
+        queryset = IndexEntry.objects.all()
+        serializer = api.Serializer()
+        cache = SimpleCache()
+        #resource_name = 'indexentry'
+        ordering = ['id', ]
+        filtering = { 
+            "id": ALL,
+            "kind": ALL,
+            "name": ALL,
+            "section": ALL,
+        }
+api.idindex.register(IndexEntryResource())
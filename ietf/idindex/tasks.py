@@ -1,4 +1,4 @@
-# Copyright The IETF Trust 2024, All Rights Reserved
+# Copyright The IETF Trust 2024-2026, All Rights Reserved
 #
 # Celery task definitions
 #
@@ -17,7 +17,8 @@
 
 from ietf.doc.storage_utils import store_file
 
-from .index import all_id_txt, all_id2_txt, id_index_txt
+from .index import (all_id_txt_lines, all_id2_txt_lines, id_index_txt_chunks,
+                    stored_index_entries, update_index_entries)
 
 
 class TempFileManager(AbstractContextManager):
@@ -26,10 +27,26 @@ def __init__(self, tmpdir=None) -> None:
         self.dir = tmpdir
 
     def make_temp_file(self, content):
+        """Write content to a new temp file
+
+        Content may be a str or an iterable of strs, which is written out as
+        it is generated.
+        """
         with NamedTemporaryFile(mode="wt", delete=False, dir=self.dir) as tf:
             tf_path = Path(tf.name)
             self.cleanup_list.add(tf_path)
-            tf.write(content)
+            if isinstance(content, str):
+                tf.write(content)
+            else:
+                tf.writelines(content)
+        return tf_path
+
+    def copy_temp_file(self, src_path: Path):
+        with NamedTemporaryFile(mode="wb", delete=False, dir=self.dir) as tf:
+            tf_path = Path(tf.name)
+            self.cleanup_list.add(tf_path)
+            with src_path.open("rb") as src:
+                shutil.copyfileobj(src, tf)
         return tf_path
 
     def move_into_place(self, src_path: Path, dest_path: Path, hardlink_dirs: List[Path] = []):
@@ -53,8 +70,14 @@ def __exit__(self, exc_type, exc_val, exc_tb):
 
 
 @shared_task
-def idindex_update_task():
-    """Update I-D indexes"""
+def idindex_update_task(full=False):
+    """Update I-D indexes
+
+    Only the entries of drafts changed since the last run are regenerated,
+    unless full is set.
+    """
+    update_index_entries(full=full)
+
     id_path = Path(settings.INTERNET_DRAFT_PATH)
     derived_path = Path(settings.DERIVED_DIR)
     download_path = Path(settings.ALL_ID_DOWNLOAD_DIR)
@@ -62,25 +85,26 @@ def idindex_update_task():
     all_archive_path = Path(settings.INTERNET_ALL_DRAFTS_ARCHIVE_DIR)
 
     with TempFileManager() as tmp_mgr:
-        # Generate copies of new contents
-        all_id_content = all_id_txt()
-        all_id_tmpfile = tmp_mgr.make_temp_file(all_id_content)
-        derived_all_id_tmpfile = tmp_mgr.make_temp_file(all_id_content)
-        download_all_id_tmpfile = tmp_mgr.make_temp_file(all_id_content)
-
-        id_index_content = id_index_txt()
-        id_index_tmpfile = tmp_mgr.make_temp_file(id_index_content)
-        derived_id_index_tmpfile = tmp_mgr.make_temp_file(id_index_content)
-        download_id_index_tmpfile = tmp_mgr.make_temp_file(id_index_content)
-
-        id_abstracts_content = id_index_txt(with_abstracts=True)
-        id_abstracts_tmpfile = tmp_mgr.make_temp_file(id_abstracts_content)
-        derived_id_abstracts_tmpfile = tmp_mgr.make_temp_file(id_abstracts_content)
-        download_id_abstracts_tmpfile = tmp_mgr.make_temp_file(id_abstracts_content)
-
-        all_id2_content = all_id2_txt()
-        all_id2_tmpfile = tmp_mgr.make_temp_file(all_id2_content)
-        derived_all_id2_tmpfile = tmp_mgr.make_temp_file(all_id2_content)
+        # Assemble new contents once from the stored entries, streaming them
+        # to disk, then copy
+        all_id_tmpfile = tmp_mgr.make_temp_file(all_id_txt_lines(stored_index_entries("all_id")))
+        derived_all_id_tmpfile = tmp_mgr.copy_temp_file(all_id_tmpfile)
+        download_all_id_tmpfile = tmp_mgr.copy_temp_file(all_id_tmpfile)
+
+        id_index_tmpfile = tmp_mgr.make_temp_file(
+            id_index_txt_chunks(chunks=stored_index_entries("id_index"))
+        )
+        derived_id_index_tmpfile = tmp_mgr.copy_temp_file(id_index_tmpfile)
+        download_id_index_tmpfile = tmp_mgr.copy_temp_file(id_index_tmpfile)
+
+        id_abstracts_tmpfile = tmp_mgr.make_temp_file(
+            id_index_txt_chunks(with_abstracts=True, chunks=stored_index_entries("id_abstracts"))
+        )
+        derived_id_abstracts_tmpfile = tmp_mgr.copy_temp_file(id_abstracts_tmpfile)
+        download_id_abstracts_tmpfile = tmp_mgr.copy_temp_file(id_abstracts_tmpfile)
+
+        all_id2_tmpfile = tmp_mgr.make_temp_file(all_id2_txt_lines(stored_index_entries("all_id2")))
+        derived_all_id2_tmpfile = tmp_mgr.copy_temp_file(all_id2_tmpfile)
 
         # Move temp files as-atomically-as-possible into place
         tmp_mgr.move_into_place(all_id_tmpfile, id_path / "all_id.txt", [ftp_path, all_archive_path])
@@ -9,16 +9,21 @@
 from tempfile import TemporaryDirectory
 
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 import debug    # pyflakes:ignore
 
-from ietf.doc.factories import WgDraftFactory, RfcFactory
-from ietf.doc.models import Document, RelatedDocument, State, LastCallDocEvent, NewRevisionDocEvent
+from ietf.doc.factories import DocEventFactory, WgDraftFactory, RfcFactory
+from ietf.doc.models import (Document, DocEvent, RelatedDocument, State, LastCallDocEvent,
+    NewRevisionDocEvent)
 from ietf.doc.storage_utils import retrieve_str
 from ietf.group.factories import GroupFactory
 from ietf.name.models import DocRelationshipName
-from ietf.idindex.index import all_id_txt, all_id2_txt, id_index_txt
+from ietf.idindex.index import (all_id_txt, all_id2_txt, id_index_txt, all_id_txt_lines,
+    all_id2_txt_lines, id_index_txt_chunks, stored_index_entries, update_index_entries)
+from ietf.idindex.models import IndexEntry
 from ietf.idindex.tasks import idindex_update_task, TempFileManager
 from ietf.person.factories import PersonFactory, EmailFactory
 from ietf.utils.test_utils import TestCase
@@ -157,10 +162,73 @@ def test_id_index_txt(self):
         self.assertTrue(draft.abstract[:20] in txt)
 
 
+    def test_query_count_does_not_grow_with_drafts(self):
+        def make_drafts(count):
+            for _ in range(count):
+                draft = WgDraftFactory(
+                    states=[("draft", "active"), ("draft-iesg", "ad-eval")],
+                    authors=[PersonFactory(), PersonFactory()],
+                )
+                draft.tags.add("need-rev")
+                rfc_draft = WgDraftFactory(states=[("draft", "rfc")], authors=[PersonFactory()])
+                rfc_draft.relateddocument_set.create(relationship_id="became_rfc", target=RfcFactory())
+
+        def count_queries():
+            counts = []
+            for build in (all_id_txt, all_id2_txt, id_index_txt):
+                with CaptureQueriesContext(connection) as ctx:
+                    build()
+                counts.append(len(ctx.captured_queries))
+            return counts
+
+        make_drafts(2)
+        baseline = count_queries()
+        make_drafts(3)
+        self.assertEqual(count_queries(), baseline)
+        self.assertIn("::Revised I-D Needed", all_id_txt())
+
+    def test_update_index_entries(self):
+        def stored_id_index_txt():
+            # skip the header, which carries the generation time
+            return "".join(id_index_txt_chunks(chunks=stored_index_entries("id_index"))).split("\n", 2)[2]
+
+        old_group = GroupFactory()
+        new_group = GroupFactory()
+        moved = WgDraftFactory(group=old_group, states=[("draft", "active")])
+        kept = WgDraftFactory(group=new_group, states=[("draft", "active")])
+        DocEvent.objects.update(time=timezone.now() - datetime.timedelta(days=1))
+
+        build = update_index_entries()
+        self.assertTrue(build.full)
+        self.assertEqual("".join(all_id_txt_lines(stored_index_entries("all_id"))), all_id_txt())
+        self.assertEqual("".join(all_id2_txt_lines(stored_index_entries("all_id2"))), all_id2_txt())
+        self.assertEqual(stored_id_index_txt(), id_index_txt().split("\n", 2)[2])
+        self.assertIn("(%s)" % old_group.acronym, stored_id_index_txt())
+
+        # only the entries of drafts changed since the last build are regenerated
+        IndexEntry.objects.filter(kind="all_id", name=kept.name).update(text="untouched\n")
+        moved.group = new_group
+        moved.save_with_history([DocEventFactory(doc=moved, type="changed_group")])
+        added = WgDraftFactory(group=new_group, states=[("draft", "active")])
+
+        build = update_index_entries()
+        self.assertFalse(build.full)
+        all_id = "".join(all_id_txt_lines(stored_index_entries("all_id")))
+        self.assertIn("untouched", all_id)
+        self.assertIn(added.name, all_id)
+        self.assertEqual(stored_id_index_txt(), id_index_txt().split("\n", 2)[2])
+        self.assertNotIn("(%s)" % old_group.acronym, stored_id_index_txt())
+
+        update_index_entries(full=True)
+        self.assertEqual("".join(all_id_txt_lines(stored_index_entries("all_id"))), all_id_txt())
+
+
 class TaskTests(TestCase):
-    @mock.patch("ietf.idindex.tasks.all_id_txt")
-    @mock.patch("ietf.idindex.tasks.all_id2_txt")
-    @mock.patch("ietf.idindex.tasks.id_index_txt")
+    @mock.patch("ietf.idindex.tasks.update_index_entries")
+    @mock.patch("ietf.idindex.tasks.stored_index_entries")
+    @mock.patch("ietf.idindex.tasks.all_id_txt_lines")
+    @mock.patch("ietf.idindex.tasks.all_id2_txt_lines")
+    @mock.patch("ietf.idindex.tasks.id_index_txt_chunks")
     @mock.patch.object(TempFileManager, "__enter__")
     def test_idindex_update_task(
         self,
@@ -168,23 +236,30 @@ def test_idindex_update_task(
         id_index_mock,
         all_id2_mock,
         all_id_mock,
+        stored_mock,
+        update_mock,
     ):
         # Replace TempFileManager's __enter__() method with one that returns a mock.
         # Pass a spec to the mock so we validate that only actual methods are called.
         mgr_mock = mock.Mock(spec=TempFileManager)
         temp_file_mgr_enter_mock.return_value = mgr_mock
         
+        stored_mock.side_effect = lambda kind: kind
+
         idindex_update_task()
 
-        self.assertEqual(all_id_mock.call_count, 1)
-        self.assertEqual(all_id2_mock.call_count, 1)
+        self.assertEqual(update_mock.call_args, mock.call(full=False))
+        self.assertEqual(all_id_mock.call_args, mock.call("all_id"))
+        self.assertEqual(all_id2_mock.call_args, mock.call("all_id2"))
         self.assertEqual(id_index_mock.call_count, 2)
-        self.assertEqual(id_index_mock.call_args_list[0], (tuple(), dict()))
+        self.assertEqual(id_index_mock.call_args_list[0], (tuple(), {"chunks": "id_index"}))
         self.assertEqual(
             id_index_mock.call_args_list[1], 
-            (tuple(), {"with_abstracts": True}),
+            (tuple(), {"with_abstracts": True, "chunks": "id_abstracts"}),
         )
-        self.assertEqual(mgr_mock.make_temp_file.call_count, 11)
+        # each index is generated once and copied for its other destinations
+        self.assertEqual(mgr_mock.make_temp_file.call_count, 4)
+        self.assertEqual(mgr_mock.copy_temp_file.call_count, 7)
         self.assertEqual(mgr_mock.move_into_place.call_count, 11)
 
     def test_temp_file_manager(self):
@@ -195,13 +270,19 @@ def test_temp_file_manager(self):
                 with TempFileManager(temp_path) as tfm:
                     path1 = tfm.make_temp_file("yay")
                     path2 = tfm.make_temp_file("boo")  # do not keep this one
+                    path3 = tfm.make_temp_file(line for line in ["b\n", "o\n"])
+                    path4 = tfm.copy_temp_file(path3)
                     self.assertTrue(path1.exists())
                     self.assertTrue(path2.exists())
+                    self.assertEqual(path3.read_text(), "b\no\n")
+                    self.assertEqual(path4.read_text(), "b\no\n")
                     dest = temp_path / "yay.txt"
                     tfm.move_into_place(path1, dest, [other_path])
                 # make sure things were cleaned up...
                 self.assertFalse(path1.exists())  # moved to dest
                 self.assertFalse(path2.exists())  # left behind
+                self.assertFalse(path3.exists())
+                self.assertFalse(path4.exists())
                 # check destination contents and permissions
                 self.assertEqual(dest.read_text(), "yay")
                 self.assertEqual(
@@ -0,0 +1,216 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+# -*- coding: utf-8 -*-
+"""Benchmark the automatic schedule generator on a synthetic meeting
+
+A meeting of the requested size is generated, with rooms, timeslots, sessions
+and constraints picked with a fixed data seed. The initial fill and the optimiser
+of generate_schedule are then run once for each of the given seeds, and the wall
+time, number of session cost evaluations and final cost of each phase are written
+as a JSON report. The synthetic meeting is removed afterwards, unless --keep is given.
+"""
+
+import datetime
+import json
+import math
+import random
+import socket
+import statistics
+import time
+
+from io import StringIO
+
+import factory.random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+import debug                            # pyflakes:ignore
+
+from ietf.group.factories import GroupFactory, RoleFactory
+from ietf.meeting.factories import MeetingFactory, RoomFactory, SessionFactory
+from ietf.meeting.management.commands.generate_schedule import ScheduleHandler
+from ietf.meeting.models import Constraint, TimeSlot
+from ietf.person.factories import PersonFactory
+
+
+# (hour, minute, duration in minutes) of the regular timeslots on each meeting day
+DAY_TIMESLOTS = [(9, 30, 120), (13, 0, 90), (15, 0, 90), (17, 0, 60)]
+SESSION_DURATIONS = [(datetime.timedelta(hours=1), 4), (datetime.timedelta(minutes=90), 3),
+                     (datetime.timedelta(hours=2), 1)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the schedule generator on a synthetic meeting, writing a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=100,
+                            help='number of sessions to schedule (default 100)')
+        parser.add_argument('--rooms', type=int, default=10,
+                            help='number of rooms (default 10)')
+        parser.add_argument('--days', type=int, default=5,
+                            help=f'number of meeting days, each with {len(DAY_TIMESLOTS)} timeslots per room (default 5)')
+        parser.add_argument('--areas', type=int, default=7,
+                            help='number of areas the groups belong to (default 7)')
+        parser.add_argument('--conflicts', type=int, default=3,
+                            help='number of group conflicts declared by each group (default 3)')
+        parser.add_argument('--key-people', type=int, dest='key_people', default=2,
+                            help='average number of key people per group (default 2)')
+        parser.add_argument('--data-seed', type=int, dest='data_seed', default=0,
+                            help='random seed for the synthetic meeting (default 0)')
+        parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3],
+                            help='random seeds of the generator runs (default 1 2 3)')
+        parser.add_argument('-r', '--max-runs', type=int, dest='max_cycles', default=20,
+                            help='maximum optimiser runs (default 20)')
+        parser.add_argument('-o', '--output', default='-',
+                            help='file to write the JSON report to (default is standard output)')
+        parser.add_argument('--keep', action='store_true',
+                            help='keep the synthetic meeting in the database')
+
+    def handle(self, *args, **options):
+        if socket.gethostname().split('.')[0] in ['core3', 'ietfa', 'ietfb', 'ietfc', ]:
+            raise EnvironmentError("Refusing to create a benchmark meeting on a production server")
+        for option in ('sessions', 'rooms', 'days', 'areas'):
+            if options[option] < 1:
+                raise CommandError('--{} must be at least 1'.format(option))
+
+        with transaction.atomic():
+            meeting = self._create_meeting(options)
+            report = {
+                'parameters': {
+                    option: options[option]
+                    for option in ('sessions', 'rooms', 'days', 'areas', 'conflicts', 'key_people',
+                                   'data_seed', 'seeds', 'max_cycles')
+                },
+                'meeting': meeting.number,
+                'runs': [self._run(meeting, seed, options['max_cycles']) for seed in options['seeds']],
+            }
+            report['summary'] = self._summarise(report['runs'])
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        output = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            if options['verbosity'] >= 1:
+                self.stdout.write('Benchmark report written to {}'.format(options['output']))
+
+    def _create_meeting(self, options):
+        """Create a synthetic meeting, picking everything with the data seed"""
+        rng = random.Random(options['data_seed'])
+        factory.random.reseed_random(options['data_seed'])
+
+        # Meeting starts on a Saturday, regular timeslots are on the days after the Sunday
+        meeting = MeetingFactory(type_id='ietf', date=datetime.date(2030, 11, 16),
+                                 days=options['days'] + 2, populate_schedule=False)
+        for n in range(options['rooms']):
+            room = RoomFactory(meeting=meeting, name='Room {}'.format(n + 1),
+                               capacity=50 + 250 * n // max(options['rooms'] - 1, 1))
+            for day in range(2, options['days'] + 2):
+                for hour, minute, duration in DAY_TIMESLOTS:
+                    TimeSlot.objects.create(
+                        meeting=meeting,
+                        type_id='regular',
+                        name='Session {}'.format(room.name),
+                        time=meeting.tz().localize(datetime.datetime.combine(
+                            meeting.date + datetime.timedelta(days=day),
+                            datetime.time(hour, minute),
+                        )),
+                        duration=datetime.timedelta(minutes=duration),
+                        location=room,
+                    )
+
+        prefix = 'bench{}'.format(meeting.number)
+        areas = [
+            GroupFactory(acronym='{}area{}'.format(prefix, n), type_id='area')
+            for n in range(options['areas'])
+        ]
+        area_directors = {area: PersonFactory() for area in areas}
+        people = [PersonFactory() for _ in range(max(options['sessions'] // 4, 1))]
+
+        # Most groups are working groups with a single session, some are BOFs or
+        # proposed research groups, and some ask for two sessions on subsequent days.
+        groups = []
+        n_sessions = 0
+        while n_sessions < options['sessions']:
+            area = rng.choice(areas)
+            kind = rng.choices(['wg', 'bof', 'prg'], weights=[18, 1, 1])[0]
+            acronym = '{}{}{}'.format(prefix, kind, len(groups))
+            if kind == 'prg':
+                group = GroupFactory(acronym=acronym, type_id='rg', state_id='proposed')
+            else:
+                group = GroupFactory(acronym=acronym, parent=area,
+                                     state_id='bof' if kind == 'bof' else 'active')
+                RoleFactory(group=group, name_id='ad', person=area_directors[area])
+            count = 2 if n_sessions + 2 <= options['sessions'] and rng.random() < 0.1 else 1
+            duration = rng.choices([d for d, _ in SESSION_DURATIONS], [w for _, w in SESSION_DURATIONS])[0]
+            attendees = min(int(20 * rng.paretovariate(1.5)), 400)
+            for _ in range(count):
+                SessionFactory(meeting=meeting, group=group, add_to_schedule=False, status_id='schedw',
+                               attendees=attendees, requested_duration=duration)
+            if count == 2:
+                Constraint.objects.create(meeting=meeting, source=group, name_id='time_relation',
+                                          time_relation='subsequent-days')
+            groups.append(group)
+            n_sessions += count
+
+        conflict_names = list(meeting.group_conflict_types.all())
+        for group in groups:
+            others = [g for g in groups if g != group]
+            for target in rng.sample(others, min(options['conflicts'], len(others))):
+                Constraint.objects.create(meeting=meeting, source=group, target=target,
+                                          name=rng.choice(conflict_names))
+            n_people = rng.randint(0, 2 * options['key_people'])
+            for person in rng.sample(people, min(n_people, len(people))):
+                Constraint.objects.create(meeting=meeting, source=group, name_id='bethere', person=person)
+        return meeting
+
+    def _run(self, meeting, seed, max_cycles):
+        """Run the initial fill and the optimiser once, returning their measurements"""
+        random.seed(seed)
+        beg_time = time.time()
+        handler = ScheduleHandler(StringIO(), meeting.number, max_cycles=max_cycles, verbosity=0)
+        schedule = handler.schedule
+        result = {
+            'seed': seed,
+            'load_seconds': time.time() - beg_time,
+            'sessions': len(schedule.sessions),
+            'timeslots': sum(1 for t in schedule.timeslots if t.is_scheduled),
+        }
+
+        def measure(phase, beg_time, **extra):
+            seconds = time.time() - beg_time
+            cost_evaluations = sum(s.cost_evaluations for s in schedule.sessions)
+            violations, cost = schedule.total_schedule_cost()
+            result[phase] = dict(
+                seconds=seconds,
+                cost_evaluations=cost_evaluations,
+                cost=cost if cost != math.inf else None,  # JSON has no infinity
+                violations=len(violations),
+                **extra
+            )
+            for session in schedule.sessions:
+                session.cost_evaluations = 0
+
+        beg_time = time.time()
+        schedule.fill_initial_schedule()
+        measure('fill', beg_time)
+        beg_time = time.time()
+        optimiser_runs = schedule.optimise_schedule()
+        measure('optimise', beg_time, optimiser_runs=optimiser_runs)
+        return result
+
+    def _summarise(self, runs):
+        summary = {}
+        for phase in ('fill', 'optimise'):
+            summary[phase] = {}
+            for key in ('seconds', 'cost_evaluations', 'cost'):
+                values = [run[phase][key] for run in runs if run[phase][key] is not None]
+                summary[phase][key] = dict(
+                    min=min(values, default=None),
+                    mean=statistics.mean(values) if values else None,
+                    max=max(values, default=None),
+                )
+        return summary
@@ -6,16 +6,21 @@
 import calendar
 import datetime
 import math
+import os
 import random
 import string
 import sys
 import time
 
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
-from typing import NamedTuple, Optional
+from io import StringIO
+from typing import List, NamedTuple, Optional, Tuple
 from warnings import warn
 
+import django
+from django import db
 from django.contrib.humanize.templatetags.humanize import intcomma
 from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Q
@@ -55,6 +60,26 @@ def __str__(self):
         return '/'.join(tok for tok in reversed(self) if tok is not None)
 
 
+class GeneratorRun(NamedTuple):
+    """Result of one seeded schedule generator run"""
+    seed: int
+    violations: List[str]
+    cost: float
+    optimiser_runs: int
+    assignments: List[Tuple[int, int, float]]  # (timeslot pk, session pk, badness)
+
+
+def _generate_seeded_schedule(handler_kwargs, seed):
+    """Generate a schedule with the given random seed, without saving it
+
+    Runs in a worker process, with its own snapshot of the meeting data.
+    """
+    random.seed(seed)
+    handler = ScheduleHandler(StringIO(), verbosity=0, **handler_kwargs)
+    violations, cost, optimiser_runs = handler.generate()
+    return GeneratorRun(seed, violations, cost, optimiser_runs, handler.schedule.assignments())
+
+
 class Command(BaseCommand):
     help = 'Create a meeting schedule'
 
@@ -86,9 +111,22 @@ def add_arguments(self, parser):
                                 'Limit scheduling to specified purpose '
                                 '(use option multiple times to specify more than one purpose; default is all purposes)'
                             ))
-
-    def handle(self, meeting, name, max_cycles, verbosity, base_id, purposes, *args, **kwargs):
-        ScheduleHandler(self.stdout, meeting, name, max_cycles, verbosity, base_id, purposes).run()
+        parser.add_argument('--starts', type=int, default=1,
+                            help='number of independently seeded schedules to generate, keeping the best one')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='number of worker processes for --starts (default is the number of CPUs)')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='random seed (with --starts, the seed of the first run, incremented for each run)')
+
+    def handle(self, meeting, name, max_cycles, verbosity, base_id, purposes, starts, workers, seed,
+               *args, **kwargs):
+        if starts < 1:
+            raise CommandError('--starts must be at least 1')
+        handler = ScheduleHandler(self.stdout, meeting, name, max_cycles, verbosity, base_id, purposes)
+        if starts == 1:
+            handler.run(seed)
+        else:
+            handler.run_multistart(starts, workers, seed)
 
 
 class ScheduleHandler(object):
@@ -98,6 +136,7 @@ def __init__(self, stdout, meeting_number, name=None, max_cycles=OPTIMISER_MAX_C
         self.verbosity = verbosity
         self.name = name
         self.max_cycles = max_cycles
+        self.base_id = base_id
         self.session_purposes = session_purposes
         if meeting_number:
             try:
@@ -134,8 +173,16 @@ def __init__(self, stdout, meeting_number, name=None, max_cycles=OPTIMISER_MAX_C
         if len(self.schedule.timeslots) == 0:
             raise CommandError('No timeslots found for schedule')
 
-    def run(self):
+    def run(self, seed=None):
         """Schedule all sessions"""
+        if seed is not None:
+            random.seed(seed)
+        violations, cost, _ = self.generate()
+        self._save_schedule(cost, self.schedule.assignments())
+        return violations, cost
+
+    def generate(self):
+        """Fill and optimise the schedule, returning violations, cost and the number of optimiser runs"""
         beg_time = time.time()
         self.schedule.fill_initial_schedule()
         violations, cost = self.schedule.total_schedule_cost()
@@ -160,11 +207,53 @@ def run(self):
                 self.stdout.write(v)
                 
         self.schedule.optimise_timeslot_capacity()
+        return violations, cost, runs
 
-        self._save_schedule(cost)
-        return violations, cost
-    
-    def _save_schedule(self, cost):
+    def run_multistart(self, starts, workers=None, seed=None):
+        """Generate independently seeded schedules in worker processes and save the best
+
+        Each run loads its own copy of the meeting data. With a single worker, the runs
+        are made one after the other in this process.
+        """
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        seeds = [seed + n for n in range(starts)]
+        handler_kwargs = dict(
+            meeting_number=self.meeting.number,
+            max_cycles=self.max_cycles,
+            base_id=self.base_id,
+            session_purposes=self.session_purposes,
+        )
+        workers = min(workers or os.cpu_count() or 1, starts)
+        if self.verbosity >= 1:
+            self.stdout.write('Generating {} schedules with {} worker{}, seeds {} to {}'.format(
+                starts, workers, '' if workers == 1 else 's', seeds[0], seeds[-1]))
+
+        beg_time = time.time()
+        if workers == 1:
+            results = [_generate_seeded_schedule(handler_kwargs, s) for s in seeds]
+        else:
+            # Worker processes must not share this process's database connections
+            db.connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+                results = list(executor.map(_generate_seeded_schedule, [handler_kwargs] * starts, seeds))
+        tot_time = time.time() - beg_time
+
+        best = min(results, key=lambda result: (result.cost, len(result.violations)))
+        if self.verbosity >= 1:
+            for result in results:
+                vc = len(result.violations)
+                self.stdout.write('Seed %s: %s violation%s, cost %s, %s optimiser runs%s'
+                                  % (result.seed, vc, '' if vc == 1 else 's', intcomma(result.cost),
+                                     result.optimiser_runs, ' [BEST]' if result is best else ''))
+                if self.verbosity >= 2:
+                    for v in result.violations:
+                        self.stdout.write('    ' + v)
+            self.stdout.write('Generated %s schedules in %dm %.2fs' % (starts, tot_time//60, tot_time%60))
+        self._save_schedule(best.cost, best.assignments)
+        return best
+
+    def _save_schedule(self, cost, assignments):
         if not self.name:
             count = models.Schedule.objects.filter(name__startswith='auto-%s-'%self.meeting.number).count()
             self.name = 'auto-%s-%02d' % (self.meeting.number, count)
@@ -180,7 +269,15 @@ def _save_schedule(self, cost):
             visible=True,
             badness=cost,
         )
-        self.schedule.save_assignments(schedule_db)
+        models.SchedTimeSessAssignment.objects.bulk_create(
+            models.SchedTimeSessAssignment(
+                timeslot_id=timeslot_pk,
+                session_id=session_pk,
+                schedule=schedule_db,
+                badness=badness,
+            )
+            for timeslot_pk, session_pk, badness in assignments
+        )
         self.stdout.write('Schedule saved as {}'.format(self.name))
 
     def _available_timeslots(self):
@@ -239,15 +336,21 @@ def _load_meeting(self):
             for bc in models.BusinessConstraint.objects.all()
         }
 
-        sessions = self._sessions_to_schedule(business_constraint_costs, self.verbosity)
+        # Sessions and timeslots hash by identity, so keep them in pk order rather
+        # than in sets, for a given random seed to give the same schedule
+        sessions = sorted(
+            self._sessions_to_schedule(business_constraint_costs, self.verbosity),
+            key=lambda s: s.session_pk,
+        )
         for session in sessions:
             # The complexity of a session also depends on how many
             # sessions have declared a conflict towards this session.
             session.update_complexity(sessions)
+            session.store_conflict_costs(sessions)
 
-        timeslots = self._available_timeslots()
+        timeslots = sorted(self._available_timeslots(), key=lambda t: t.timeslot_pk)
         for _ in range(len(sessions) - len(timeslots)):
-            timeslots.add(GeneratorTimeSlot(verbosity=self.verbosity))
+            timeslots.append(GeneratorTimeSlot(verbosity=self.verbosity))
         for timeslot in timeslots:
             timeslot.store_relations(timeslots)
 
@@ -283,6 +386,7 @@ def __init__(self, stdout, timeslots, sessions, business_constraint_costs,
         self._fixed_violations = dict()  # key = type of cost
         self.max_cycles = max_cycles
         self.base_schedule = self._load_base_schedule(base_schedule) if base_schedule else None
+        self._cost_model = None  # IncrementalScheduleCost while generating or optimising
 
     def __str__(self):
         return 'Schedule ({} timeslots, {} sessions, {} scheduled, {} in base schedule)'.format(
@@ -353,15 +457,13 @@ def _load_base_schedule(self, db_base_schedule):
             base_schedule[timeslot_lut[assignment.timeslot.pk]] = session_lut[assignment.session.pk]
         return base_schedule
 
-    def save_assignments(self, schedule_db):
-        for timeslot, session in self.schedule.items():
-            if timeslot.is_scheduled:
-                models.SchedTimeSessAssignment.objects.create(
-                    timeslot_id=timeslot.timeslot_pk,
-                    session_id=session.session_pk,
-                    schedule=schedule_db,
-                    badness=session.last_cost,
-                )
+    def assignments(self):
+        """Assignments of the schedule as (timeslot pk, session pk, badness) tuples"""
+        return [
+            (timeslot.timeslot_pk, session.session_pk, session.last_cost)
+            for timeslot, session in self.schedule.items()
+            if timeslot.is_scheduled
+        ]
     
     def adjust_for_timeslot_availability(self):
         """
@@ -466,6 +568,13 @@ def calculate_dynamic_cost(self, schedule=None, include_fixed=False):
 
         return violations, cost
 
+    def _start_cost_model(self):
+        """Track the dynamic cost of self.schedule incrementally while it is changed"""
+        schedule = dict(self.schedule)
+        if self.base_schedule is not None:
+            schedule.update(self.base_schedule)
+        self._cost_model = IncrementalScheduleCost(schedule, self.timeslots)
+
     def fill_initial_schedule(self):
         """
         Create an initial schedule, which is stored in self.schedule.
@@ -491,16 +600,15 @@ def fill_initial_schedule(self):
                 f'WARNING: fewer timeslots ({n_free_scheduled_slots}) than sessions ({n_free_sessions}). Some sessions will not be scheduled.'
             )
         sessions = sorted(self.free_sessions, key=lambda s: s.complexity, reverse=True)
+        self._start_cost_model()
 
         for session in sessions:
             possible_slots = [t for t in self.free_timeslots if t not in self.schedule.keys()]
             random.shuffle(possible_slots)
             
             def timeslot_preference(t):
-                proposed_schedule = self.schedule.copy()
-                proposed_schedule[t] = session
                 return (
-                    self.calculate_dynamic_cost(proposed_schedule)[1],
+                    self._cost_model.cost_after({t: session}),
                     t.duration if t.is_scheduled else datetime.timedelta(hours=1000),  # unscheduled slots sort to the end
                     t.capacity if t.is_scheduled else math.inf,  # unscheduled slots sort to the end
                 )
@@ -513,6 +621,7 @@ def timeslot_preference(t):
                                               possible_slots[0].location_pk))
                 else:
                     self.stdout.write('Scheduled {} in unscheduled slot')
+        self._cost_model = None
 
     def optimise_schedule(self):
         """
@@ -535,6 +644,7 @@ def optimise_schedule(self):
         shuffle_next_run = False
         last_run_cost = None
         run_count = 0
+        self._start_cost_model()
 
         for _ in range(self.max_cycles):
             run_count += 1
@@ -554,13 +664,14 @@ def optimise_schedule(self):
             for original_timeslot, session in items:
                 if session.is_fixed:
                     continue
-                best_cost = self.calculate_dynamic_cost()[1]
+                best_cost = self._cost_model.cost
                 if best_cost == 0:
                     if self.verbosity >= 1 and self.stdout.isatty():
                         sys.stderr.write('\n')
                     if self.verbosity >= 2:
                         self.stdout.write('Optimiser found an optimal schedule')
 
+                    self._cost_model = None
                     return run_count
                 best_timeslot = None
 
@@ -592,6 +703,7 @@ def optimise_schedule(self):
             self.stdout.write('Optimiser did not find perfect schedule, using best schedule at dynamic cost {:,}'
                               .format(self.best_cost))
         self.schedule = self.best_schedule
+        self._cost_model = None
 
         return run_count
 
@@ -635,7 +747,9 @@ def optimise_timeslot_capacity(self):
         for timeslot in list(self.schedule.keys()):
             if timeslot in optimised_timeslots or timeslot.is_fixed or not timeslot.is_scheduled:
                 continue
-            timeslot_overlaps = sorted(timeslot.full_overlaps, key=lambda t: t.capacity, reverse=True)
+            timeslot_overlaps = sorted(
+                timeslot.full_overlaps, key=lambda t: (t.capacity, t.timeslot_pk), reverse=True
+            )
             sessions_overlaps = [self.schedule.get(t) for t in timeslot_overlaps]
             sessions_overlaps.sort(key=lambda s: s.attendees if s else 0, reverse=True)
             assert len(timeslot_overlaps) == len(sessions_overlaps)
@@ -654,28 +768,24 @@ def optimise_timeslot_capacity(self):
 
     def _schedule_session(self, session, timeslot):
         self.schedule[timeslot] = session
+        if self._cost_model is not None:
+            self._cost_model.apply({timeslot: session})
 
     def _cost_for_switch(self, timeslot1, timeslot2):
         """
         Calculate the total cost of self.schedule, if the sessions in timeslot1 and timeslot2 
         would be switched. Does not perform the switch, self.schedule remains unchanged.
+        Only the costs of sessions affected by the switch are recalculated.
         """
-        proposed_schedule = self.schedule.copy()
-        session1 = proposed_schedule.get(timeslot1)
-        session2 = proposed_schedule.get(timeslot2)
+        session1 = self.schedule.get(timeslot1)
+        session2 = self.schedule.get(timeslot2)
         if session1 and not session1.fits_in_timeslot(timeslot2):
             return math.inf
         if session2 and not session2.fits_in_timeslot(timeslot1):
             return math.inf
-        if session1:
-            proposed_schedule[timeslot2] = session1
-        elif session2:
-            del proposed_schedule[timeslot2]
-        if session2:
-            proposed_schedule[timeslot1] = session2
-        elif session1:
-            del proposed_schedule[timeslot1]
-        return self.calculate_dynamic_cost(proposed_schedule)[1]
+        if timeslot1 == timeslot2:
+            return self._cost_model.cost
+        return self._cost_model.cost_after({timeslot1: session2, timeslot2: session1})
 
     def _switch_sessions(self, timeslot1, timeslot2) -> Optional['Session']:
         """
@@ -698,6 +808,8 @@ def _switch_sessions(self, timeslot1, timeslot2) -> Optional['Session']:
             self.schedule[timeslot1] = session2
         elif session1:
             del self.schedule[timeslot1]
+        if self._cost_model is not None:
+            self._cost_model.apply({timeslot1: session2, timeslot2: session1})
         return session2
     
     def _save(self, cost):
@@ -706,6 +818,100 @@ def _save(self, cost):
             self.best_schedule = self.schedule.copy()
 
 
+class IncrementalScheduleCost:
+    """
+    The dynamic cost of a schedule, kept up to date as sessions are moved.
+
+    The cost of each session depends only on the sessions in timeslots that overlap
+    or are adjacent to its own, and on the other sessions of its group. The sessions
+    in timeslots overlapping or adjacent to each timeslot, and the sessions of each
+    group, are tracked so that moving sessions only recalculates the costs of the
+    sessions that the move can affect, rather than those of the whole schedule.
+
+    Changes are given as a dict of timeslots to the session to put in each, or None
+    to empty it. The schedule includes the base schedule, if any.
+    """
+    def __init__(self, schedule, timeslots):
+        self.schedule = dict(schedule)
+        self.group_sessions = defaultdict(set)
+        for timeslot, session in self.schedule.items():
+            self.group_sessions[session.group].add((timeslot, session))
+        # timeslots whose session cost depends on the session in a given timeslot
+        self.dependents = defaultdict(set)
+        for timeslot in timeslots:
+            for other in timeslot.overlaps | timeslot.adjacent:
+                self.dependents[other].add(timeslot)
+        self.costs = {timeslot: self._session_cost(timeslot) for timeslot in self.schedule}
+        self.finite_cost = sum(c for c in self.costs.values() if c != math.inf)
+        self.infinite_costs = sum(1 for c in self.costs.values() if c == math.inf)
+
+    @property
+    def cost(self):
+        return math.inf if self.infinite_costs else self.finite_cost
+
+    def _session_cost(self, timeslot):
+        session = self.schedule[timeslot]
+        overlapping_sessions = {self.schedule[t] for t in timeslot.overlaps if t in self.schedule}
+        return session.calculate_cost(
+            self.schedule, timeslot, overlapping_sessions, self.group_sessions[session.group]
+        )[1]
+
+    def _affected_timeslots(self, changes):
+        affected = set(changes)
+        for timeslot in changes:
+            affected.update(self.dependents[timeslot])
+            if timeslot in self.schedule:
+                affected.update(t for t, _ in self.group_sessions[self.schedule[timeslot].group])
+        return affected
+
+    def _apply(self, changes):
+        """Make the changes, returning the changes that undo them"""
+        undo = {timeslot: self.schedule.get(timeslot) for timeslot in changes}
+        for timeslot in changes:
+            if timeslot in self.schedule:
+                session = self.schedule.pop(timeslot)
+                self.group_sessions[session.group].discard((timeslot, session))
+        for timeslot, session in changes.items():
+            if session is not None:
+                self.schedule[timeslot] = session
+                self.group_sessions[session.group].add((timeslot, session))
+        return undo
+
+    def _recalculate(self, changes):
+        """Make the changes, returning the undo changes and the old and new affected costs"""
+        affected = self._affected_timeslots(changes)
+        undo = self._apply(changes)
+        affected |= self._affected_timeslots(changes)
+        old_costs = {t: self.costs[t] for t in affected if t in self.costs}
+        new_costs = {t: self._session_cost(t) for t in affected if t in self.schedule}
+        return undo, old_costs, new_costs
+
+    def _cost_with(self, old_costs, new_costs):
+        finite_cost, infinite_costs = self.finite_cost, self.infinite_costs
+        for costs, sign in ((old_costs, -1), (new_costs, 1)):
+            for c in costs.values():
+                if c == math.inf:
+                    infinite_costs += sign
+                else:
+                    finite_cost += sign * c
+        return finite_cost, infinite_costs
+
+    def cost_after(self, changes):
+        """Dynamic cost of the schedule with the changes made, leaving it unchanged"""
+        undo, old_costs, new_costs = self._recalculate(changes)
+        self._apply(undo)
+        finite_cost, infinite_costs = self._cost_with(old_costs, new_costs)
+        return math.inf if infinite_costs else finite_cost
+
+    def apply(self, changes):
+        """Make the changes to the schedule and update its cost"""
+        _, old_costs, new_costs = self._recalculate(changes)
+        self.finite_cost, self.infinite_costs = self._cost_with(old_costs, new_costs)
+        for timeslot in old_costs:
+            del self.costs[timeslot]
+        self.costs.update(new_costs)
+
+
 class GeneratorTimeSlot:
     """Representation of a timeslot for the schedule generator"""
     def __init__(self, *, verbosity=0, is_fixed=False):
@@ -791,6 +997,14 @@ def store_relations(self, other_timeslots):
                 self.adjacent.add(other)
 
 
+def _time_order(timeslot_session_pair):
+    """Sort key putting (timeslot, session) pairs in time order, unscheduled ones last"""
+    timeslot, session = timeslot_session_pair
+    if timeslot.is_scheduled:
+        return (0, timeslot.start, session.session_pk)
+    return (1, 0, session.session_pk)
+
+
 class Session(object):
     """
     This Session class is analogous to the Session class in the models,
@@ -845,6 +1059,7 @@ def __init__(self, stdout, meeting, session_db, business_constraint_costs, verbo
         self.timeranges_unavailable_penalty = 0
 
         self.last_cost = None
+        self.cost_evaluations = 0  # number of calls to calculate_cost(), for benchmarking
 
         for constraint_db in constraints_db:
             if constraint_db.name.is_group_conflict:
@@ -905,6 +1120,7 @@ def calculate_cost(self, schedule, my_timeslot, overlapping_sessions, my_session
 
         The return value is a tuple of violations (list of strings) and a cost (integer).        
         """
+        self.cost_evaluations += 1
         violations, cost = [], 0
         # Ignore overlap between two fixed sessions when calculating dynamic cost
         overlapping_sessions = tuple(
@@ -926,15 +1142,11 @@ def calculate_cost(self, schedule, my_timeslot, overlapping_sessions, my_session
                                   .format(self.group, my_timeslot.time_group))
                 cost += self.timeranges_unavailable_penalty
             
-        v, c = self._calculate_cost_overlapping_groups(overlapping_sessions)
+        v, c = self._calculate_cost_overlapping_sessions(overlapping_sessions)
         violations += v
         cost += c
 
-        v, c = self._calculate_cost_business_logic(overlapping_sessions)
-        violations += v
-        cost += c
-
-        v, c = self._calculate_cost_my_other_sessions(tuple(my_sessions))
+        v, c = self._calculate_cost_my_other_sessions(tuple(sorted(my_sessions, key=_time_order)))
         violations += v
         cost += c
 
@@ -948,77 +1160,95 @@ def calculate_cost(self, schedule, my_timeslot, overlapping_sessions, my_session
         self.last_cost = cost
         return violations, cost
 
-    @lru_cache(maxsize=10000)
-    def _calculate_cost_overlapping_groups(self, overlapping_sessions):
-        violations, cost = [], 0
-        for other in overlapping_sessions:
-            if not other:
-                continue
-            if self.is_fixed and other.is_fixed:
+    def store_conflict_costs(self, other_sessions):
+        """
+        Store the costs of this session overlapping with each of the other sessions.
+        This should be called after all Session objects are created. Only pairs with
+        a cost or violation are stored, as a table of the other session to a tuple of
+        group conflict violations, business logic violations and the total cost.
+        """
+        self.conflict_costs = {}
+        for other in other_sessions:
+            if other is self or (self.is_fixed and other.is_fixed):
                 continue
-            if other.group == self.group:
-                violations.append('{}: scheduled twice in overlapping slots'.format(self.group))
-                cost += math.inf
-            if other.group in self.conflict_groups:
-                violations.append('{}: group conflict with {}'.format(self.group, other.group))
-                cost += self.conflict_groups[other.group]
-    
-            conflict_people = self.conflict_people.intersection(other.conflict_people)
-            for person in conflict_people:
-                violations.append('{}: conflict w/ key person {}, also in {}'
-                                  .format(self.group, person, other.group))
-            cost += len(conflict_people) * self.conflict_people_penalty
+            group_violations, group_cost = self._pair_cost_overlapping_groups(other)
+            business_violations, business_cost = self._pair_cost_business_logic(other)
+            if group_violations or business_violations or group_cost or business_cost:
+                self.conflict_costs[other] = (
+                    group_violations, business_violations, group_cost + business_cost
+                )
+
+    def _calculate_cost_overlapping_sessions(self, overlapping_sessions):
+        """Cost of overlapping with the given sessions, from the stored conflict costs"""
+        group_violations, business_violations, cost = [], [], 0
+        for other in overlapping_sessions:
+            conflict = self.conflict_costs.get(other)
+            if conflict:
+                group_violations += conflict[0]
+                business_violations += conflict[1]
+                cost += conflict[2]
+        return group_violations + business_violations, cost
+
+    def _pair_cost_overlapping_groups(self, other):
+        violations, cost = [], 0
+        if other.group == self.group:
+            violations.append('{}: scheduled twice in overlapping slots'.format(self.group))
+            cost += math.inf
+        if other.group in self.conflict_groups:
+            violations.append('{}: group conflict with {}'.format(self.group, other.group))
+            cost += self.conflict_groups[other.group]
+
+        conflict_people = self.conflict_people.intersection(other.conflict_people)
+        for person in conflict_people:
+            violations.append('{}: conflict w/ key person {}, also in {}'
+                              .format(self.group, person, other.group))
+        cost += len(conflict_people) * self.conflict_people_penalty
         return violations, cost
 
-    @lru_cache(maxsize=10000)
-    def _calculate_cost_business_logic(self, overlapping_sessions):
+    def _pair_cost_business_logic(self, other):
         violations, cost = [], 0
-        for other in overlapping_sessions:
-            if not other:
-                continue
-            if self.is_fixed and other.is_fixed:
-                continue
-            # BOFs cannot conflict with PRGs
-            if self.is_bof and other.is_prg:
-                violations.append('{}: BOF overlaps with PRG: {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['bof_overlapping_prg']
-            # BOFs cannot conflict with any other BOFs
-            if self.is_bof and other.is_bof:
-                violations.append('{}: BOF overlaps with other BOF: {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['bof_overlapping_bof']
-            # BOFs cannot conflict with any other WGs in their area
-            if self.is_bof and self.parent == other.parent:
-                violations.append('{}: BOF overlaps with other session from same area: {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['bof_overlapping_area_wg']
-            # BOFs cannot conflict with any area-wide meetings (of any area)
-            if self.is_bof and other.is_area_meeting:
-                violations.append('{}: BOF overlaps with area meeting {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['bof_overlapping_area_meeting']
-            # Area meetings cannot conflict with anything else in their area 
-            if self.is_area_meeting and other.parent == self.group:
-                violations.append('{}: area meeting overlaps with session from same area: {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['area_overlapping_in_area']
-            # Area meetings cannot conflict with other area meetings 
-            if self.is_area_meeting and other.is_area_meeting:
-                violations.append('{}: area meeting overlaps with other area meeting: {}'
-                                  .format(self.group, other.group))
-                cost += self.business_constraint_costs['area_overlapping_other_area']
-            # WGs overseen by the same Area Director should not conflict  
-            if self.ad and self.ad == other.ad:
-                violations.append('{}: has same AD as {}'.format(self.group, other.group))
-                cost += self.business_constraint_costs['session_overlap_ad']
+        # BOFs cannot conflict with PRGs
+        if self.is_bof and other.is_prg:
+            violations.append('{}: BOF overlaps with PRG: {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['bof_overlapping_prg']
+        # BOFs cannot conflict with any other BOFs
+        if self.is_bof and other.is_bof:
+            violations.append('{}: BOF overlaps with other BOF: {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['bof_overlapping_bof']
+        # BOFs cannot conflict with any other WGs in their area
+        if self.is_bof and self.parent == other.parent:
+            violations.append('{}: BOF overlaps with other session from same area: {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['bof_overlapping_area_wg']
+        # BOFs cannot conflict with any area-wide meetings (of any area)
+        if self.is_bof and other.is_area_meeting:
+            violations.append('{}: BOF overlaps with area meeting {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['bof_overlapping_area_meeting']
+        # Area meetings cannot conflict with anything else in their area 
+        if self.is_area_meeting and other.parent == self.group:
+            violations.append('{}: area meeting overlaps with session from same area: {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['area_overlapping_in_area']
+        # Area meetings cannot conflict with other area meetings 
+        if self.is_area_meeting and other.is_area_meeting:
+            violations.append('{}: area meeting overlaps with other area meeting: {}'
+                              .format(self.group, other.group))
+            cost += self.business_constraint_costs['area_overlapping_other_area']
+        # WGs overseen by the same Area Director should not conflict  
+        if self.ad and self.ad == other.ad:
+            violations.append('{}: has same AD as {}'.format(self.group, other.group))
+            cost += self.business_constraint_costs['session_overlap_ad']
         return violations, cost
     
     @lru_cache(maxsize=10000)
     def _calculate_cost_my_other_sessions(self, my_sessions):
         """Calculate cost due to other sessions for same group
 
-        my_sessions is a set of (GeneratorTimeSlot, Session) tuples.
+        my_sessions is a tuple of (GeneratorTimeSlot, Session) tuples in the order
+        of their timeslots.
         """
         def sort_sessions(timeslot_session_pairs):
             return sorted(timeslot_session_pairs, key=lambda item: item[1].session_pk)
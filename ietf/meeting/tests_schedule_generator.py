@@ -1,17 +1,21 @@
 # Copyright The IETF Trust 2020, All Rights Reserved
 import calendar
 import datetime
+import json
 import pytz
+import random
 from io import StringIO
 from warnings import filterwarnings
 
 
+from django.core.management import call_command
 from django.core.management.base import CommandError
 
 from ietf.utils.test_utils import TestCase
 from ietf.group.factories import GroupFactory, RoleFactory
 from ietf.person.factories import PersonFactory
-from ietf.meeting.models import Constraint, TimerangeName, BusinessConstraint, SchedTimeSessAssignment, Schedule
+from ietf.meeting.models import (Constraint, TimerangeName, BusinessConstraint, SchedTimeSessAssignment, Schedule,
+    Meeting)
 from ietf.meeting.factories import MeetingFactory, RoomFactory, TimeSlotFactory, SessionFactory, ScheduleFactory
 from ietf.meeting.management.commands import generate_schedule
 from ietf.name.models import ConstraintName
@@ -87,6 +91,34 @@ def test_normal_schedule(self):
         schedule = self.meeting.schedule_set.get(name__startswith='auto-')
         self.assertEqual(schedule.assignments.count(), 13)
 
+    def test_multistart_schedule(self):
+        self._create_basic_sessions()
+        generator = generate_schedule.ScheduleHandler(self.stdout, self.meeting.number, verbosity=1)
+        best = generator.run_multistart(3, workers=1, seed=42)
+        self.assertEqual(best.violations, self.fixed_violations)
+        self.assertEqual(best.cost, self.fixed_cost)
+
+        self.stdout.seek(0)
+        output = self.stdout.read()
+        self.assertIn('Generating 3 schedules with 1 worker, seeds 42 to 44', output)
+        for seed in (42, 43, 44):
+            self.assertIn('Seed {}: '.format(seed), output)
+        self.assertEqual(output.count('[BEST]'), 1)
+
+        schedule = self.meeting.schedule_set.get(name__startswith='auto-')
+        self.assertEqual(schedule.badness, best.cost)
+        self.assertCountEqual(
+            schedule.assignments.values_list('timeslot_id', 'session_id', 'badness'),
+            best.assignments,
+        )
+
+    def test_seeded_schedule_is_reproducible(self):
+        self._create_basic_sessions()
+        handler_kwargs = dict(meeting_number=self.meeting.number)
+        first = generate_schedule._generate_seeded_schedule(handler_kwargs, 42)
+        second = generate_schedule._generate_seeded_schedule(handler_kwargs, 42)
+        self.assertEqual(first, second)
+
     def test_unresolvable_schedule(self):
         self._create_basic_sessions()
         for group in self.all_groups:
@@ -265,6 +297,61 @@ def test_base_schedule_dynamic_cost(self):
         )
 
 
+    def test_incremental_cost_matches_full_calculation(self):
+        """Costs of switches from the incremental cost model match full recalculations"""
+        self._create_basic_sessions()
+        base_schedule = self._create_base_schedule()
+        filterwarnings('ignore', '"time relation" constraint only makes sense for 2 sessions')
+        handler = generate_schedule.ScheduleHandler(
+            self.stdout,
+            self.meeting.number,
+            verbosity=0,
+            base_id=generate_schedule.ScheduleId.from_schedule(base_schedule),
+        )
+        schedule = handler.schedule
+        schedule.fill_initial_schedule()
+        schedule._start_cost_model()
+        self.assertEqual(schedule._cost_model.cost, schedule.calculate_dynamic_cost()[1])
+
+        rng = random.Random(1234)
+        free_timeslots = sorted(schedule.free_timeslots, key=lambda t: (t.is_scheduled, t.start or 0, id(t)))
+        for _ in range(200):
+            timeslot1, timeslot2 = rng.sample(free_timeslots, 2)
+            proposed = dict(schedule.schedule)
+            session1, session2 = proposed.pop(timeslot1, None), proposed.pop(timeslot2, None)
+            if session1:
+                proposed[timeslot2] = session1
+            if session2:
+                proposed[timeslot1] = session2
+            if (
+                (session1 is None or session1.fits_in_timeslot(timeslot2))
+                and (session2 is None or session2.fits_in_timeslot(timeslot1))
+            ):
+                self.assertEqual(
+                    schedule._cost_for_switch(timeslot1, timeslot2),
+                    schedule.calculate_dynamic_cost(proposed)[1],
+                )
+            schedule._switch_sessions(timeslot1, timeslot2)
+            self.assertEqual(schedule._cost_model.cost, schedule.calculate_dynamic_cost()[1])
+
+    def test_stored_conflict_costs(self):
+        """Stored conflict costs match the costs of each pair of sessions"""
+        self._create_basic_sessions()
+        filterwarnings('ignore', '"time relation" constraint only makes sense for 2 sessions')
+        handler = generate_schedule.ScheduleHandler(self.stdout, self.meeting.number, verbosity=0)
+        sessions = list(handler.schedule.sessions)
+        self.assertTrue(any(session.conflict_costs for session in sessions))
+        for session in sessions:
+            for other in sessions:
+                if other is session:
+                    continue
+                group_violations, group_cost = session._pair_cost_overlapping_groups(other)
+                business_violations, business_cost = session._pair_cost_business_logic(other)
+                self.assertEqual(
+                    session._calculate_cost_overlapping_sessions((other, None)),
+                    (group_violations + business_violations, group_cost + business_cost),
+                )
+
     def _create_basic_sessions(self):
         for group in self.all_groups:
             SessionFactory(meeting=self.meeting, group=group, add_to_schedule=False, attendees=5,
@@ -331,3 +418,21 @@ def _create_base_schedule(self):
         )
         return base_schedule
 
+
+class ScheduleGeneratorBenchmarkTest(TestCase):
+    def test_benchmark_report(self):
+        stdout = StringIO()
+        call_command('benchmark_schedule_generator', sessions=12, rooms=2, days=2, areas=2,
+                     seeds=[1, 2], max_cycles=2, stdout=stdout)
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report['parameters']['sessions'], 12)
+        self.assertEqual([run['seed'] for run in report['runs']], [1, 2])
+        for run in report['runs']:
+            self.assertEqual(run['sessions'], 12)
+            self.assertEqual(run['timeslots'], 2 * 2 * 4)
+            self.assertGreater(run['fill']['cost_evaluations'], 0)
+            self.assertGreater(run['optimise']['cost_evaluations'], 0)
+            self.assertGreaterEqual(run['optimise']['optimiser_runs'], 1)
+        self.assertIn('mean', report['summary']['optimise']['seconds'])
+        # the synthetic meeting is removed again
+        self.assertFalse(Meeting.objects.filter(number=report['meeting']).exists())
@@ -10,9 +10,13 @@
 from unittest.mock import patch, Mock
 
 from django.http import HttpResponse, JsonResponse
-from ietf.meeting.factories import MeetingFactory, RegistrationFactory, RegistrationTicketFactory
-from ietf.meeting.models import Registration
+from django.test import override_settings
+from ietf.group.factories import GroupFactory
+from ietf.meeting.factories import MeetingFactory, RegistrationFactory, RegistrationTicketFactory, SessionFactory
+from ietf.meeting.models import Constraint, Registration
 from ietf.meeting.utils import (
+    cached_constraints_for_meeting_schedule_editor,
+    preprocess_constraints_for_meeting_schedule_editor,
     process_single_registration,
     get_registration_data, 
     sync_registration_data, 
@@ -307,3 +311,53 @@ def test_fetch_attendance_from_meetings(self, mock_sync_reg_data):
             mock_meetings,
         )
         self.assertEqual(stats, [d1, d2, d3])
+
+
+class ScheduleEditorConstraintsCacheTests(TestCase):
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "schedule-editor-constraints-test",
+            }
+        }
+    )
+    def test_cached_constraints_for_meeting_schedule_editor(self):
+        meeting = MeetingFactory(type_id="ietf", populate_schedule=False)
+        group1, group2, group3 = GroupFactory.create_batch(3)
+        sessions = [
+            SessionFactory(meeting=meeting, group=group, add_to_schedule=False)
+            for group in (group1, group2, group3)
+        ]
+        Constraint.objects.create(meeting=meeting, source=group1, target=group2, name_id="chair_conflict")
+
+        with patch(
+            "ietf.meeting.utils.preprocess_constraints_for_meeting_schedule_editor",
+            wraps=preprocess_constraints_for_meeting_schedule_editor,
+        ) as mock_preprocess:
+            constraints_for_sessions, _, _ = cached_constraints_for_meeting_schedule_editor(meeting, sessions)
+            self.assertEqual(mock_preprocess.call_count, 1)
+            self.assertEqual(
+                constraints_for_sessions[sessions[0].pk], [("chair_conflict", sessions[1].pk, None)]
+            )
+
+            # reused while nothing changes
+            cached = cached_constraints_for_meeting_schedule_editor(meeting, sessions)
+            self.assertEqual(mock_preprocess.call_count, 1)
+            self.assertEqual(cached[0], constraints_for_sessions)
+
+            # recomputed when the constraints change
+            Constraint.objects.create(meeting=meeting, source=group1, target=group3, name_id="tech_overlap")
+            constraints_for_sessions, _, _ = cached_constraints_for_meeting_schedule_editor(meeting, sessions)
+            self.assertEqual(mock_preprocess.call_count, 2)
+            self.assertCountEqual(
+                constraints_for_sessions[sessions[0].pk],
+                [("chair_conflict", sessions[1].pk, None), ("tech_overlap", sessions[2].pk, None)],
+            )
+
+            # and when the sessions change
+            cached_constraints_for_meeting_schedule_editor(meeting, sessions[:2])
+            self.assertEqual(mock_preprocess.call_count, 3)
+            sessions[2].joint_with_groups.add(group1)
+            cached_constraints_for_meeting_schedule_editor(meeting, sessions)
+            self.assertEqual(mock_preprocess.call_count, 4)
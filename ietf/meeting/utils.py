@@ -1,6 +1,7 @@
 # Copyright The IETF Trust 2016-2024, All Rights Reserved
 # -*- coding: utf-8 -*-
 import datetime
+import hashlib
 import itertools
 from contextlib import suppress
 from dataclasses import dataclass
@@ -20,7 +21,7 @@
 from django.core.cache import caches
 from django.core.files.base import ContentFile
 from django.db import IntegrityError
-from django.db.models import OuterRef, Subquery, TextField, Q, Value, Max
+from django.db.models import OuterRef, Subquery, TextField, Q, Value, Max, Count
 from django.db.models.functions import Coalesce
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -513,6 +514,44 @@ def format_constraint(c):
     return constraints_for_sessions, formatted_constraints_for_sessions, constraint_names
 
 
+SCHEDULE_EDITOR_CONSTRAINTS_CACHE_TIMEOUT = 60 * 60
+
+
+def cached_constraints_for_meeting_schedule_editor(meeting, sessions):
+    """Cached result of preprocess_constraints_for_meeting_schedule_editor()
+
+    The cache key changes whenever the meeting's constraints, enabled constraint
+    names or the editor's sessions (including their joint groups) change, so editor
+    loads after a swap or assignment reuse the constraint graph. Constraints have no
+    modification time, but editing them deletes and recreates rows, which changes
+    their count or highest pk. Changes elsewhere, like a new responsible AD, are
+    picked up when the cache entry expires.
+    """
+    constraints = Constraint.objects.filter(meeting=meeting).aggregate(count=Count("pk"), last=Max("pk"))
+    key_components = [
+        str(constraints["count"]),
+        str(constraints["last"]),
+        ",".join(sorted(n.pk for n in meeting.enabled_constraint_names())),
+    ] + [
+        "{}:{}:{}".format(
+            s.pk,
+            s.modified.isoformat(),
+            ",".join(str(g.pk) for g in s.joint_with_groups.all()),
+        )
+        for s in sorted(sessions, key=lambda s: s.pk)
+    ]
+    cache_key = "meeting:schedule-editor-constraints:{}:{}".format(
+        meeting.pk,
+        hashlib.sha256(".".join(key_components).encode()).hexdigest(),
+    )
+    cache = caches["default"]
+    result = cache.get(cache_key)
+    if result is None:
+        result = preprocess_constraints_for_meeting_schedule_editor(meeting, sessions)
+        cache.set(cache_key, result, SCHEDULE_EDITOR_CONSTRAINTS_CACHE_TIMEOUT)
+    return result
+
+
 def diff_meeting_schedules(from_schedule, to_schedule):
     """Compute the difference between the two meeting schedules as a list
     describing the set of actions that will turn the schedule of from into
@@ -101,7 +101,7 @@
 from ietf.meeting.utils import session_requested_by, SaveMaterialsError
 from ietf.meeting.utils import current_session_status, get_meeting_sessions, SessionNotScheduledError
 from ietf.meeting.utils import data_for_meetings_overview, handle_upload_file, save_session_minutes_revision
-from ietf.meeting.utils import preprocess_constraints_for_meeting_schedule_editor
+from ietf.meeting.utils import cached_constraints_for_meeting_schedule_editor
 from ietf.meeting.utils import diff_meeting_schedules, prefetch_schedule_diff_objects
 from ietf.meeting.utils import swap_meeting_schedule_timeslot_assignments, bulk_create_timeslots
 from ietf.meeting.utils import preprocess_meeting_important_dates
@@ -411,6 +411,10 @@ def _response(bucket: str, name: str):
     return _response(bucket=resolved.bucket, name=resolved.blob)
 
 
+# Bytes read from a materials blob per chunk of a streamed response
+MATERIALS_BLOB_BLOCK_SIZE = 64 * 1024
+
+
 @requires_api_token
 def api_retrieve_materials_blob(request, bucket, name):
     """Retrieve contents of a meeting materials blob
@@ -437,6 +441,17 @@ def api_retrieve_materials_blob(request, bucket, name):
     def _default_content_type(blob_name: str):
         return DEFAULT_CONTENT_TYPES.get(Path(name).suffix, "application/octet-stream") 
 
+    def _blob_response(blob):
+        # Streams the blob; chunked blobs are read from the database as they are sent
+        assert isinstance(blob, BlobFile)
+        response = FileResponse(
+            blob,
+            filename=name,
+            content_type=blob.content_type or _default_content_type(name),
+        )
+        response.block_size = MATERIALS_BLOB_BLOCK_SIZE
+        return response
+
     if not (
         settings.ENABLE_BLOBSTORAGE
         and bucket in settings.MATERIALS_TYPES_SERVED_BY_WORKER
@@ -450,13 +465,8 @@ def _default_content_type(blob_name: str):
         pass
     else:
         # found the blob - return it
-        assert isinstance(blob, BlobFile)
         log(f"Materials blob: directly returning {bucket}:{name}")
-        return FileResponse(
-            blob,
-            filename=name,
-            content_type=blob.content_type or _default_content_type(name),
-        )
+        return _blob_response(blob)
     
     # Did not find the blob. Create it if we can 
     name_as_path = Path(name)
@@ -491,12 +501,7 @@ def _default_content_type(blob_name: str):
         return HttpResponseNotFound(f"Object {bucket}:{name} not found.")
     else:
         # found the blob - return it
-        assert isinstance(blob, BlobFile)
-        return FileResponse(
-            blob,
-            filename=name,
-            content_type=blob.content_type or _default_content_type(name),
-        )
+        return _blob_response(blob)
     
 
 @login_required
@@ -757,7 +762,7 @@ def prepare_sessions_for_display(sessions):
         requested_by_lookup = {p.pk: p for p in Person.objects.filter(pk__in=set(s.requested_by for s in sessions if s.requested_by))}
 
         # constraints
-        constraints_for_sessions, formatted_constraints_for_sessions, constraint_names = preprocess_constraints_for_meeting_schedule_editor(meeting, sessions)
+        constraints_for_sessions, formatted_constraints_for_sessions, constraint_names = cached_constraints_for_meeting_schedule_editor(meeting, sessions)
 
         sessions_for_group = defaultdict(list)
         for s in sessions:
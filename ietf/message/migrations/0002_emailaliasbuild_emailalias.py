@@ -0,0 +1,54 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import ietf.utils.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("message", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailAliasBuild",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("time", models.DateTimeField(default=django.utils.timezone.now)),
+                ("full", models.BooleanField(default=False, help_text="Whether this version was a full rebuild")),
+                ("full_time", models.DateTimeField(default=django.utils.timezone.now, help_text="When the snapshot was last fully rebuilt")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="EmailAlias",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("draft", "Draft alias"), ("group", "Group alias")], max_length=8)),
+                ("alias", models.CharField(max_length=255)),
+                ("source", models.CharField(help_text="Name of the draft or acronym of the group the alias belongs to", max_length=255)),
+                ("domains", models.JSONField(default=list)),
+                ("addresses", models.JSONField(default=list)),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "build",
+                    ietf.utils.models.ForeignKey(
+                        help_text="Version in which this entry last changed",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="message.emailaliasbuild",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["kind", "source"], name="message_ema_kind_9212b5_idx"),
+                    models.Index(fields=["kind", "build"], name="message_ema_kind_9c0e66_idx"),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="emailalias",
+            constraint=models.UniqueConstraint(fields=("kind", "alias"), name="unique_emailalias_kind_alias"),
+        ),
+    ]
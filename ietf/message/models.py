@@ -101,3 +101,46 @@ def __str__(self):
     class Meta:
         verbose_name_plural='Announcement From addresses'
         
+
+
+class EmailAliasBuild(models.Model):
+    """A version of the EmailAlias snapshot
+
+    The pk is the version token handed out by the alias APIs. time is when
+    the snapshot was last brought up to date, which may be later than when
+    this version was created if nothing changed in between. full_time is when
+    the snapshot was last rebuilt from scratch, by this or an earlier version.
+    """
+    time = models.DateTimeField(default=timezone.now)
+    full = models.BooleanField(default=False, help_text="Whether this version was a full rebuild")
+    full_time = models.DateTimeField(default=timezone.now, help_text="When the snapshot was last fully rebuilt")
+
+    def __str__(self):
+        return "Email alias build %s at %s" % (self.pk, self.time)
+
+
+class EmailAlias(models.Model):
+    """An entry in the incrementally maintained snapshot of the draft and group email aliases"""
+    KINDS = [
+        ("draft", "Draft alias"),
+        ("group", "Group alias"),
+    ]
+    kind = models.CharField(max_length=8, choices=KINDS)
+    alias = models.CharField(max_length=255)
+    source = models.CharField(max_length=255, help_text="Name of the draft or acronym of the group the alias belongs to")
+    domains = models.JSONField(default=list)
+    addresses = models.JSONField(default=list)
+    build = ForeignKey(EmailAliasBuild, help_text="Version in which this entry last changed")
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "alias"], name="unique_emailalias_kind_alias"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "source"]),
+            models.Index(fields=["kind", "build"]),
+        ]
+
+    def __str__(self):
+        return "%s -> %s" % (self.alias, ", ".join(self.addresses))
@@ -11,7 +11,8 @@
 
 from ietf import api
 
-from ietf.message.models import Message, SendQueue, MessageAttachment, AnnouncementFrom
+from ietf.message.models import ( Message, SendQueue, MessageAttachment, AnnouncementFrom,
+    EmailAliasBuild, EmailAlias )
 from ietf.person.resources import PersonResource
 from ietf.group.resources import GroupResource
 from ietf.doc.resources import DocumentResource
@@ -103,3 +104,40 @@ class Meta:
             "group": ALL_WITH_RELATIONS,
         }
 api.message.register(AnnouncementFromResource())
+
+
+
+class EmailAliasBuildResource(ModelResource):
+    class Meta:
+        queryset = EmailAliasBuild.objects.all()
+        serializer = api.Serializer()
+        cache = SimpleCache()
+        #resource_name = 'emailaliasbuild'
+        ordering = ['id', ]
+        filtering = { 
+            "id": ALL,
+            "time": ALL,
+            "full": ALL,
+            "full_time": ALL,
+        }
+api.message.register(EmailAliasBuildResource())
+
+
+
+class EmailAliasResource(ModelResource):
+    build            = ToOneField(EmailAliasBuildResource, 'build')
+    class Meta:
+        queryset = EmailAlias.objects.none()
+        serializer = api.Serializer()
+        cache = SimpleCache()
+        #resource_name = 'emailalias'
+        ordering = ['id', ]
+        filtering = { 
+            "id": ALL,
+            "kind": ALL,
+            "alias": ALL,
+            "source": ALL,
+            "deleted": ALL,
+            "build": ALL_WITH_RELATIONS,
+        }
+api.message.register(EmailAliasResource())
@@ -5,7 +5,11 @@
 from celery import shared_task
 from smtplib import SMTPException
 
-from ietf.message.utils import send_scheduled_message_from_send_queue, retry_send_messages
+from ietf.message.utils import (
+    send_scheduled_message_from_send_queue,
+    retry_send_messages,
+    update_email_aliases,
+)
 from ietf.message.models import SendQueue, Message
 from ietf.utils import log
 from ietf.utils.mail import log_smtp_exception, send_error_email
@@ -45,3 +49,16 @@ def retry_send_messages_by_pk_task(message_pks: list, resend=False):
         messages=Message.objects.filter(pk__in=message_pks),
         resend=resend,
     )
+
+
+@shared_task
+def update_email_aliases_task(full=False):
+    """Bring the draft and group email alias snapshot up to date
+
+    The alias APIs keep the snapshot current incrementally once it exists, with a
+    full rebuild once EMAIL_ALIAS_FULL_REBUILD_INTERVAL has passed. Run this with
+    full=True to build it in the first place and, periodically, to do the full
+    rebuilds outside of API requests.
+    """
+    build = update_email_aliases(full=full)
+    log.log(f"Email alias snapshot is at version {build.pk}")
@@ -10,11 +10,23 @@
 
 import debug                            # pyflakes:ignore
 
-from ietf.group.factories import GroupFactory
+from ietf.doc.factories import DocEventFactory, WgDraftFactory
+from ietf.doc.models import DocumentAuthor, State
+from ietf.group.factories import GroupFactory, RoleFactory
 from ietf.message.factories import MessageFactory, SendQueueFactory
-from ietf.message.models import Message, SendQueue
-from ietf.message.tasks import send_scheduled_mail_task, retry_send_messages_by_pk_task
-from ietf.message.utils import send_scheduled_message_from_send_queue, retry_send_messages
+from ietf.message.models import EmailAlias, EmailAliasBuild, Message, SendQueue
+from ietf.message.tasks import (
+    send_scheduled_mail_task,
+    retry_send_messages_by_pk_task,
+    update_email_aliases_task,
+)
+from ietf.message.utils import (
+    send_scheduled_message_from_send_queue,
+    retry_send_messages,
+    update_email_aliases,
+    EMAIL_ALIAS_FULL_REBUILD_INTERVAL,
+)
+from ietf.person.factories import EmailFactory, PersonFactory
 from ietf.person.models import Person
 from ietf.utils.mail import outbox, send_mail_text, send_mail_message, get_payload_text
 from ietf.utils.test_utils import TestCase
@@ -171,6 +183,85 @@ def test_retry_send_messages(self, mock_send_mail_message):
         )
 
 
+class EmailAliasTests(TestCase):
+    def aliases(self, kind):
+        return {
+            e.alias: sorted(e.addresses)
+            for e in EmailAlias.objects.filter(kind=kind, deleted=False)
+        }
+
+    def test_update_email_aliases(self):
+        author = PersonFactory()
+        draft = WgDraftFactory(authors=[author])
+        chair_role = RoleFactory(group=draft.group, name_id="chair")
+        chair = chair_role.person
+
+        first = update_email_aliases()
+        self.assertTrue(first.full)
+        self.assertEqual(self.aliases("draft")[draft.name], [author.email_address()])
+        self.assertEqual(
+            self.aliases("group")[f"{draft.group.acronym}-chairs"], [chair.email_address()]
+        )
+
+        # nothing changed, so no new version
+        self.assertEqual(update_email_aliases(), first)
+
+        # a change recorded by a DocEvent is picked up incrementally
+        other_author = PersonFactory()
+        DocumentAuthor.objects.create(
+            document=draft, person=other_author, email=other_author.email(), order=2
+        )
+        DocEventFactory(doc=draft)
+        second = update_email_aliases()
+        self.assertFalse(second.full)
+        self.assertGreater(second.pk, first.pk)
+        self.assertEqual(
+            self.aliases("draft")[draft.name],
+            sorted([author.email_address(), other_author.email_address()]),
+        )
+        self.assertEqual(
+            EmailAlias.objects.get(kind="draft", alias=draft.name).build, second
+        )
+        # untouched aliases stay in the version they last changed in
+        self.assertEqual(
+            EmailAlias.objects.get(kind="group", alias=f"{draft.group.acronym}-chairs").build,
+            first,
+        )
+
+        # aliases of drafts that drop out of the list are marked deleted
+        draft.set_state(State.objects.get(type_id="draft", slug="expired"))
+        draft.expires = timezone.now() - datetime.timedelta(days=3 * 365)
+        draft.save_with_history([DocEventFactory(doc=draft)])
+        third = update_email_aliases()
+        self.assertNotIn(draft.name, self.aliases("draft"))
+        self.assertTrue(
+            EmailAlias.objects.filter(
+                kind="draft", alias=draft.name, deleted=True, build=third
+            ).exists()
+        )
+
+        # a full rebuild changes nothing further
+        self.assertEqual(update_email_aliases(full=True), third)
+        self.assertEqual(EmailAliasBuild.objects.count(), 3)
+
+        # changes that leave no event behind wait for the next full rebuild, which
+        # happens by itself once the last one is old enough
+        old_email = chair_role.email
+        old_email.active = False
+        old_email.primary = False
+        old_email.save()
+        new_email = EmailFactory(person=chair, primary=True)
+        self.assertEqual(update_email_aliases(), third)
+        EmailAliasBuild.objects.update(
+            full_time=timezone.now() - EMAIL_ALIAS_FULL_REBUILD_INTERVAL - datetime.timedelta(minutes=1)
+        )
+        fourth = update_email_aliases()
+        self.assertTrue(fourth.full)
+        self.assertEqual(
+            self.aliases("group")[f"{draft.group.acronym}-chairs"], [new_email.address]
+        )
+
+
 class TaskTests(TestCase):
     @mock.patch("ietf.message.tasks.log_smtp_exception")
     @mock.patch("ietf.message.tasks.send_scheduled_message_from_send_queue")
@@ -203,3 +294,11 @@ def test_retry_send_messages_by_pk_task(self, mock_retry_send):
         called_with_messages = mock_retry_send.call_args.kwargs["messages"]
         self.assertCountEqual(msgs, called_with_messages)
         self.assertTrue(mock_retry_send.call_args.kwargs["resend"])
+
+    @mock.patch("ietf.message.tasks.update_email_aliases")
+    def test_update_email_aliases_task(self, mock_update):
+        mock_update.return_value = EmailAliasBuild(pk=1)
+        update_email_aliases_task()
+        self.assertEqual(mock_update.call_args, mock.call(full=False))
+        update_email_aliases_task(full=True)
+        self.assertEqual(mock_update.call_args, mock.call(full=True))
@@ -1,18 +1,20 @@
 # Copyright The IETF Trust 2012-2020, All Rights Reserved
 # -*- coding: utf-8 -*-
 
+import datetime
 import email
 import email.utils
 import re
 import smtplib
 
+from django.db import transaction
 from django.db.models import QuerySet
 from django.utils import timezone
 from django.utils.encoding import force_str
 
 from ietf.utils import log
 from ietf.utils.mail import send_mail_text, send_mail_mime, send_mail_message
-from ietf.message.models import Message
+from ietf.message.models import EmailAlias, EmailAliasBuild, Message
 
 first_dot_on_line_re = re.compile(r'^\.', re.MULTILINE)
 
@@ -88,3 +90,192 @@ def retry_send_messages(messages: QuerySet[Message], resend=False):
                 f'retry_send_messages: '
                 f'Failure {e}:  {msg.pk}  {msg.frm} -> {to}  "{msg.subject.strip()}"'
             )
+
+
+# Overlap between successive incremental alias builds, so that changes
+# committed while a build was running are picked up by the next one
+EMAIL_ALIAS_CHANGE_MARGIN = datetime.timedelta(minutes=5)
+
+# Changes that leave no trace for incremental builds, like a person changing
+# their primary address, are picked up by a full rebuild at least this often
+EMAIL_ALIAS_FULL_REBUILD_INTERVAL = datetime.timedelta(days=1)
+
+
+def _generate_draft_aliases(draft_queryset=None):
+    from ietf.doc.utils import DraftAliasGenerator  # avoid circular import
+    return {
+        alias: (["ietf"], sorted(addresses))
+        for alias, addresses in DraftAliasGenerator(draft_queryset)
+    }
+
+
+def _generate_group_aliases(group_queryset=None):
+    from ietf.group.utils import GroupAliasGenerator  # avoid circular import
+    return {
+        alias: (list(domains), sorted(addresses))
+        for alias, domains, addresses in GroupAliasGenerator(group_queryset)
+    }
+
+
+def _email_alias_source(kind, alias):
+    """Name of the draft or acronym of the group an alias belongs to"""
+    if kind == "draft":
+        return alias.partition(".")[0]  # e.g., draft-foo-bar.authors
+    return alias.rpartition("-")[0]  # e.g., foo-chairs
+
+
+def _touched_draft_ids(since, now, group_ids):
+    """Drafts whose aliases may have changed between since and now
+
+    group_ids are the groups touched in the same period.
+    """
+    from ietf.doc.models import DocEvent, Document, RelatedDocument
+    from ietf.doc.utils import DraftAliasGenerator
+    # drafts drop out of the alias list this long after expiry or publication
+    window = datetime.timedelta(days=DraftAliasGenerator.days)
+
+    draft_ids = set(
+        DocEvent.objects.filter(time__gte=since, doc__type_id="draft").values_list("doc_id", flat=True)
+    )
+    drafts = Document.objects.filter(type_id="draft")
+    # chair and AD aliases follow the roles of the group and its area
+    draft_ids.update(drafts.filter(group__in=group_ids).values_list("pk", flat=True))
+    draft_ids.update(drafts.filter(group__parent__in=group_ids).values_list("pk", flat=True))
+    draft_ids.update(
+        drafts.filter(expires__gte=since - window, expires__lt=now - window).values_list("pk", flat=True)
+    )
+    draft_ids.update(
+        RelatedDocument.objects.filter(
+            relationship_id="became_rfc",
+            target__docevent__type="published_rfc",
+            target__docevent__time__gte=since - window,
+            target__docevent__time__lt=now - window,
+        ).values_list("source_id", flat=True)
+    )
+    return draft_ids
+
+
+def _touched_group_ids(since, now):
+    """Groups whose aliases may have changed between since and now"""
+    from ietf.group.models import Group, GroupEvent
+    from ietf.group.utils import GroupAliasGenerator
+    # inactive groups drop out of the alias list this long after their last change
+    window = datetime.timedelta(days=GroupAliasGenerator.days)
+
+    group_ids = set(GroupEvent.objects.filter(time__gte=since).values_list("group_id", flat=True))
+    group_ids.update(Group.objects.filter(time__gte=since).values_list("pk", flat=True))
+    group_ids.update(
+        Group.objects.filter(time__gte=since - window, time__lt=now - window).values_list("pk", flat=True)
+    )
+    # area aliases include the chairs of the groups in the area
+    group_ids.update(
+        Group.objects.filter(pk__in=group_ids, parent__isnull=False).values_list("parent_id", flat=True)
+    )
+    return group_ids
+
+
+def _apply_email_alias_changes(kind, sources, generated, build):
+    """Make the snapshot entries of a kind match freshly generated aliases
+
+    generated maps each alias to a (domains, addresses) tuple and must hold every
+    current alias of the given sources; entries of those sources that are missing
+    from it are marked deleted. With sources None, all entries of the kind are
+    considered. Changed entries are moved to build. Returns the number of changes.
+    """
+    existing = EmailAlias.objects.filter(kind=kind)
+    if sources is not None:
+        sources = set(sources)
+        sources.update(_email_alias_source(kind, alias) for alias in generated)
+        existing = existing.filter(source__in=sources)
+    existing = {e.alias: e for e in existing}
+
+    to_create = []
+    to_update = []
+    for alias, (domains, addresses) in generated.items():
+        entry = existing.pop(alias, None)
+        if entry is None:
+            to_create.append(
+                EmailAlias(
+                    kind=kind,
+                    alias=alias,
+                    source=_email_alias_source(kind, alias),
+                    domains=domains,
+                    addresses=addresses,
+                    build=build,
+                )
+            )
+        elif entry.deleted or entry.domains != domains or entry.addresses != addresses:
+            entry.domains = domains
+            entry.addresses = addresses
+            entry.deleted = False
+            entry.build = build
+            to_update.append(entry)
+    for entry in existing.values():
+        if not entry.deleted:
+            entry.deleted = True
+            entry.build = build
+            to_update.append(entry)
+
+    EmailAlias.objects.bulk_create(to_create)
+    EmailAlias.objects.bulk_update(to_update, ["domains", "addresses", "deleted", "build"])
+    return len(to_create) + len(to_update)
+
+
+def update_email_aliases(full=False):
+    """Bring the EmailAlias snapshot of the draft and group aliases up to date
+
+    Unless full is set, no snapshot has been built yet, or the last full rebuild
+    is older than EMAIL_ALIAS_FULL_REBUILD_INTERVAL, only the aliases of drafts
+    and groups touched by DocEvents, GroupEvents or group changes since the last
+    build are regenerated. Changes that leave no such trace, like a person
+    changing their primary address, are picked up by the next full rebuild.
+
+    Returns the current EmailAliasBuild. A new one is only created if something
+    changed, so its pk can be used as a version token.
+    """
+    from ietf.doc.models import Document
+    from ietf.group.models import Group
+
+    now = timezone.now()
+    with transaction.atomic():
+        # serializes concurrent builders
+        last = EmailAliasBuild.objects.select_for_update().order_by("-pk").first()
+        full = (
+            full
+            or last is None
+            or last.full_time < now - EMAIL_ALIAS_FULL_REBUILD_INTERVAL
+        )
+        build = EmailAliasBuild.objects.create(
+            time=now, full=full, full_time=now if full else last.full_time
+        )
+        if full:
+            changed = _apply_email_alias_changes("draft", None, _generate_draft_aliases(), build)
+            changed += _apply_email_alias_changes("group", None, _generate_group_aliases(), build)
+        else:
+            since = last.time - EMAIL_ALIAS_CHANGE_MARGIN
+            changed = 0
+            group_ids = _touched_group_ids(since, now)
+            draft_ids = _touched_draft_ids(since, now, group_ids)
+            if draft_ids:
+                drafts = Document.objects.filter(pk__in=draft_ids)
+                changed += _apply_email_alias_changes(
+                    "draft",
+                    drafts.values_list("name", flat=True),
+                    _generate_draft_aliases(drafts),
+                    build,
+                )
+            if group_ids:
+                groups = Group.objects.filter(pk__in=group_ids)
+                changed += _apply_email_alias_changes(
+                    "group",
+                    groups.values_list("acronym", flat=True),
+                    _generate_group_aliases(groups),
+                    build,
+                )
+        if changed == 0 and last is not None:
+            build.delete()
+            last.time = now
+            last.full_time = build.full_time
+            last.save()
+            return last
+    return build
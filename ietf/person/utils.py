@@ -349,3 +349,31 @@ def lookup_persons(email_or_name):
         raise Http404
     persons.sort(key=lambda p: p.id)
     return persons
+
+
+def fill_in_email_caches(people):
+    """Seed the Person.email() cache of each person with one query between them
+
+    Mirrors Person.email(): a primary address if there is one -- lowest by address,
+    which is the pk an unordered first() would have ordered by -- and otherwise the
+    most recent active one. Email.address is a CICharField, so the database orders
+    it case-insensitively, comparing lowercased values; lowercase the key to match.
+    """
+    people = [p for p in people if not hasattr(p, "_cached_email")]
+    if not people:
+        return
+    emails_by_person = {p.pk: [] for p in people}
+    for e in Email.objects.filter(person__in=list(emails_by_person)):
+        emails_by_person[e.person_id].append(e)
+    for person in people:
+        emails = emails_by_person[person.pk]
+        primary = sorted((e for e in emails if e.primary), key=lambda e: e.address.lower())
+        if primary:
+            person._cached_email = primary[0]
+        else:
+            active = sorted(
+                (e for e in emails if e.active),
+                key=lambda e: (e.time, e.address.lower()),
+                reverse=True,
+            )
+            person._cached_email = active[0] if active else None
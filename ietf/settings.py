@@ -776,11 +776,13 @@ def skip_unreadable_post(record):
     "conflrev",
     "draft",
     "floorplan",
+    "htmlized",
     "indexes",
     "liai-att",
     "meetinghostlogo",
     "minutes",
     "narrativeminutes",
+    "pdfized",
     "photo",
     "polls",
     "procmaterials",
@@ -878,6 +880,11 @@ def skip_unreadable_post(record):
 # Age limit before action holders are flagged in the document display
 DOC_ACTION_HOLDER_AGE_LIMIT_DAYS = 20
 
+# Match document search names against PostgreSQL full-text search vectors rather
+# than by substring. Run the update_document_search_vectors management command
+# after enabling this, since the vectors are only maintained while it is on.
+DOC_SEARCH_FULL_TEXT = False
+
 # Override this in settings_local.py if needed
 CACHE_MIDDLEWARE_SECONDS = 300
 CACHE_MIDDLEWARE_KEY_PREFIX = ''
@@ -885,7 +892,10 @@ def skip_unreadable_post(record):
 HTMLIZER_VERSION = 1
 HTMLIZER_URL_PREFIX = "/doc/html"
 HTMLIZER_CACHE_TIME = 60*60*24*14       # 14 days
+HTMLIZER_STALE_TIME = 60*60*24*7        # serve expired renderings this long while one request re-renders
+PDFIZER_VERSION = 1                     # bump to re-render stored PDFs after rendering changes
 PDFIZER_CACHE_TIME = HTMLIZER_CACHE_TIME
+PDFIZER_STALE_TIME = HTMLIZER_STALE_TIME
 PDFIZER_URL_PREFIX = IDTRACKER_BASE_URL+"/doc/pdf"
 
 # Email settings
@@ -1286,6 +1296,14 @@ def skip_unreadable_post(record):
 
 STATS_TIMELINE_CACHE_TIMEOUT = 86400
 
+# Modules defining @slow_page_value functions, imported by the tasks that refresh them
+SLOW_PAGE_VALUE_MODULES = [
+    "ietf.doc.views_doc",
+    "ietf.doc.views_search",
+    "ietf.group.utils",
+    "ietf.stats.views",
+]
+
 UTILS_MEETING_CONFERENCE_DOMAINS = ['webex.com', 'zoom.us', 'jitsi.org', 'meetecho.com', 'gather.town', ]
 UTILS_TEST_RANDOM_STATE_FILE = '.factoryboy_random_state'
 UTILS_APIKEY_GUI_LOGIN_LIMIT_DAYS = 30
@@ -1311,7 +1329,8 @@ def skip_unreadable_post(record):
 CELERY_RESULT_EXPIRES = datetime.timedelta(minutes=5)  # how long are results valid? (Default is 1 day)
 CELERY_TASK_IGNORE_RESULT = True  # ignore results unless specifically enabled for a task
 CELERY_TASK_ROUTES = {
-    "ietf.blobdb.tasks.pybob_the_blob_replicator_task": {"queue": "blobdb"}
+    "ietf.blobdb.tasks.pybob_the_blob_replicator_task": {"queue": "blobdb"},
+    "ietf.blobdb.tasks.replicate_pending_blobs_task": {"queue": "blobdb"},
 }
 
 # Meetecho API setup: Uncomment this and provide real credentials to enable
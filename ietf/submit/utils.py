@@ -36,6 +36,7 @@
     DocumentAuthor, AddedMessageEvent )
 from ietf.doc.models import NewRevisionDocEvent
 from ietf.doc.models import RelatedDocument, DocRelationshipName, DocExtResource
+from ietf.doc.tasks import render_document_artifacts_task
 from ietf.doc.storage_utils import remove_from_storage, retrieve_bytes, store_bytes, store_file, store_str
 from ietf.doc.utils import (add_state_change_event, rebuild_reference_relations,
     set_replaces_for_document, prettify_std_name, update_doc_extresources, 
@@ -499,6 +500,10 @@ def post_submission(request, submission, approved_doc_desc, approved_subm_desc):
         f.write(ref_text)
     store_str("bibxml-ids", f"reference.I-D.{draft.name}-{draft.rev}.txt", ref_text) # TODO-BLOBSTORE verify with test
 
+    # Pre-render the htmlized and pdfized forms once the files are committed
+    name, rev = draft.name, draft.rev
+    transaction.on_commit(lambda: render_document_artifacts_task.delay(name, rev))
+
     log.log(f"{submission.name}: done")
     
 
@@ -1,5 +1,6 @@
 # Copyright The IETF Trust 2026, All Rights Reserved
 import datetime
+import hashlib
 import json
 import shutil
 from collections import defaultdict
@@ -16,13 +17,14 @@
 from django.db.models import Q
 from lxml import etree
 
+from django.core.cache import caches
 from django.core.files.storage import storages
 from django.db import models
 from django.db.models.functions import Substr, Cast
 from django.template.loader import render_to_string
 from django.utils import timezone
 
-from ietf.doc.models import Document
+from ietf.doc.models import DocEvent, Document, RelatedDocument, RfcAuthor, StoredObject
 from ietf.name.models import StdLevelName
 from ietf.utils.log import log
 from ietf.utils.models import DirtyBits
@@ -30,6 +32,8 @@
 FORMATS_FOR_INDEX = ["txt", "html", "pdf", "xml", "ps"]
 SS_TXT_MARGIN = 3
 SS_TXT_CUE_COL_WIDTH = 14
+# Entries are keyed by a digest of their content, so they never go stale
+RFCINDEX_ENTRY_CACHE_TIMEOUT = 60 * 60 * 24 * 30
 
 
 def format_rfc_number(n):
@@ -185,11 +189,225 @@ def format_ordering(rfc_number):
     return ordering.index  # return the method
 
 
+def get_rfc_index_entry_digests() -> dict[int, str]:
+    """Digest of everything the index entries of each published RFC depend on
+
+    Maps RFC numbers to a hash of the RFC's own fields, its authors, its relations
+    to other documents, its publication date, its formats and its errata state.
+    Gathered with a handful of queries over all RFCs, so unchanged entries can be
+    recognized without rendering them.
+    """
+    inputs = defaultdict(list)
+    rfc_numbers = {}
+    doc_ids = {}
+    for values in Document.objects.filter(type_id="rfc").values_list(
+        "pk",
+        "rfc_number",
+        "name",
+        "rev",
+        "title",
+        "pages",
+        "keywords",
+        "abstract",
+        "std_level_id",
+        "stream_id",
+        "group__acronym",
+        "group__type_id",
+        "group__parent__acronym",
+        "group__parent__type_id",
+    ):
+        rfc_numbers[values[0]] = values[1]
+        doc_ids[values[2]] = values[0]
+        inputs[values[0]].append(values[1:])
+    for values in RfcAuthor.objects.filter(document__type_id="rfc").values_list(
+        "document_id", "order", "titlepage_name", "is_editor"
+    ):
+        inputs[values[0]].append(("author",) + values[1:])
+    for values in RelatedDocument.objects.filter(
+        Q(source__type_id="rfc") | Q(target__type_id="rfc"),
+        relationship_id__in=["obs", "updates", "contains", "became_rfc"],
+    ).values_list(
+        "source_id",
+        "target_id",
+        "relationship_id",
+        "source__name",
+        "source__rev",
+        "source__type_id",
+        "source__rfc_number",
+        "target__name",
+        "target__rfc_number",
+    ):
+        inputs[values[0]].append(values[2:])
+        inputs[values[1]].append(values[2:])
+    for doc_id, time in (
+        DocEvent.objects.filter(type="published_rfc", doc__type_id="rfc")
+        .values("doc_id")
+        .annotate(time=models.Max("time"))
+        .values_list("doc_id", "time")
+    ):
+        inputs[doc_id].append(("published", time))
+    for doc_id in Document.tags.through.objects.filter(
+        document__type_id="rfc", doctagname_id="errata"
+    ).values_list("document_id", flat=True):
+        inputs[doc_id].append(("errata",))
+    for doc_name, name, doc_rev in StoredObject.objects.filter(
+        store="rfc", doc_name__in=doc_ids.keys()
+    ).values_list("doc_name", "name", "doc_rev"):
+        inputs[doc_ids[doc_name]].append(("format", name, doc_rev))
+
+    # settings that change how every entry is rendered
+    salt = repr((
+        getattr(settings, "RFCINDEX_MATCH_LEGACY_XML", False),
+        settings.FIRST_V3_RFC,
+        settings.IETF_DOI_PREFIX,
+        settings.RFC_EDITOR_ERRATA_BASE_URL,
+    ))
+    return {
+        rfc_number: hashlib.sha256(
+            (salt + repr(sorted(inputs[pk], key=repr))).encode("utf-8")
+        ).hexdigest()
+        for pk, rfc_number in rfc_numbers.items()
+    }
+
+
+def cached_rfc_index_entries(kind, rfcs, render, key_suffix):
+    """Get the rendered index entries of published RFCs, keyed by RFC number
+
+    Entries are cached by RFC number and the digest from get_rfc_index_entry_digests(),
+    plus the key_suffix of each RFC for inputs that do not come from the database.
+    Only RFCs whose entries are not in the cache are rendered.
+    """
+    digests = get_rfc_index_entry_digests()
+    keys = {
+        rfc.rfc_number: (
+            f"rfcindex:{kind}:{rfc.rfc_number}:{digests[rfc.rfc_number]}"
+            f"{key_suffix(rfc)}"
+        )
+        for rfc in rfcs
+    }
+    cache = caches["default"]
+    entries = cache.get_many(keys.values())
+    rendered = {}
+    for rfc in rfcs:
+        key = keys[rfc.rfc_number]
+        if key not in entries:
+            rendered[key] = entries[key] = render(rfc)
+    if rendered:
+        cache.set_many(rendered, RFCINDEX_ENTRY_CACHE_TIMEOUT)
+    log(f"Rendered {len(rendered)} of {len(rfcs)} rfc-index.{kind} entries")
+    return {rfc_number: entries[key] for rfc_number, key in keys.items()}
+
+
+def rfc_text_index_entry(rfc: Document, april1_rfc_numbers: Container[int]) -> str:
+    """Render the rfc-index.txt entry for a published RFC"""
+    authors = ", ".join(
+        author.format_for_titlepage() for author in rfc.rfcauthor_set.all()
+    )
+    published_at = rfc.pub_date()
+    date = (
+        published_at.strftime("1 %B %Y")
+        if rfc.rfc_number in april1_rfc_numbers
+        else published_at.strftime("%B %Y")
+    )
+
+    # formats
+    formats = ", ".join(
+        sorted(
+            [
+                format["fmt"]
+                for format in rfc.formats()
+                if format["fmt"] in FORMATS_FOR_INDEX
+            ],
+            key=format_ordering(rfc.rfc_number),
+        )
+    ).upper()
+
+    # obsoletes
+    obsoletes = ""
+    obsoletes_documents = sorted(
+        rfc.related_that_doc("obs"),
+        key=attrgetter("rfc_number"),
+    )
+    if len(obsoletes_documents) > 0:
+        obsoletes_names = ", ".join(
+            f"RFC{format_rfc_number(doc.rfc_number)}"
+            for doc in obsoletes_documents
+        )
+        obsoletes = f" (Obsoletes {obsoletes_names})"
+
+    # obsoleted by
+    obsoleted_by = ""
+    obsoleted_by_documents = sorted(
+        rfc.related_that("obs"),
+        key=attrgetter("rfc_number"),
+    )
+    if len(obsoleted_by_documents) > 0:
+        obsoleted_by_names = ", ".join(
+            f"RFC{format_rfc_number(doc.rfc_number)}"
+            for doc in obsoleted_by_documents
+        )
+        obsoleted_by = f" (Obsoleted by {obsoleted_by_names})"
+
+    # updates
+    updates = ""
+    updates_documents = sorted(
+        rfc.related_that_doc("updates"),
+        key=attrgetter("rfc_number"),
+    )
+    if len(updates_documents) > 0:
+        updates_names = ", ".join(
+            f"RFC{format_rfc_number(doc.rfc_number)}"
+            for doc in updates_documents
+        )
+        updates = f" (Updates {updates_names})"
+
+    # updated by
+    updated_by = ""
+    updated_by_documents = sorted(
+        rfc.related_that("updates"),
+        key=attrgetter("rfc_number"),
+    )
+    if len(updated_by_documents) > 0:
+        updated_by_names = ", ".join(
+            f"RFC{format_rfc_number(doc.rfc_number)}"
+            for doc in updated_by_documents
+        )
+        updated_by = f" (Updated by {updated_by_names})"
+
+    doc_relations = f"{obsoletes}{obsoleted_by}{updates}{updated_by} "
+
+    # subseries
+    subseries = ",".join(
+        f"{container.type.slug}{format_rfc_number(int(container.name[3:]))}"
+        for container in rfc.part_of()
+    ).upper()
+    if subseries:
+        subseries = f"(Also {subseries}) "
+
+    entry = fill(
+        (
+            f"{format_rfc_number(rfc.rfc_number)} {rfc.title}. {authors}. {date}. "
+            f"(Format: {formats}){doc_relations}{subseries}"
+            f"(Status: {str(rfc.std_level).upper()}) "
+            f"(DOI: {rfc.doi})"
+        ),
+        width=73,
+        subsequent_indent=" " * 5,
+    )
+    return entry
+
+
 def get_rfc_text_index_entries():
     """Returns RFC entries for rfc-index.txt"""
     entries = []
     april1_rfc_numbers = get_april1_rfc_numbers()
-    published_rfcs = Document.objects.filter(type_id="rfc").order_by("rfc_number")
+    published_rfcs = list(Document.objects.filter(type_id="rfc").order_by("rfc_number"))
+    rendered = cached_rfc_index_entries(
+        "txt",
+        published_rfcs,
+        lambda rfc: rfc_text_index_entry(rfc, april1_rfc_numbers),
+        lambda rfc: f":{int(rfc.rfc_number in april1_rfc_numbers)}",
+    )
     rfcs = sorted(
         chain(published_rfcs, get_unusable_rfc_numbers()), key=attrgetter("rfc_number")
     )
@@ -198,101 +416,7 @@ def get_rfc_text_index_entries():
             entries.append(f"{format_rfc_number(rfc.rfc_number)} Not Issued.")
         else:
             assert isinstance(rfc, Document)
-            authors = ", ".join(
-                author.format_for_titlepage() for author in rfc.rfcauthor_set.all()
-            )
-            published_at = rfc.pub_date()
-            date = (
-                published_at.strftime("1 %B %Y")
-                if rfc.rfc_number in april1_rfc_numbers
-                else published_at.strftime("%B %Y")
-            )
-
-            # formats
-            formats = ", ".join(
-                sorted(
-                    [
-                        format["fmt"]
-                        for format in rfc.formats()
-                        if format["fmt"] in FORMATS_FOR_INDEX
-                    ],
-                    key=format_ordering(rfc.rfc_number),
-                )
-            ).upper()
-
-            # obsoletes
-            obsoletes = ""
-            obsoletes_documents = sorted(
-                rfc.related_that_doc("obs"),
-                key=attrgetter("rfc_number"),
-            )
-            if len(obsoletes_documents) > 0:
-                obsoletes_names = ", ".join(
-                    f"RFC{format_rfc_number(doc.rfc_number)}"
-                    for doc in obsoletes_documents
-                )
-                obsoletes = f" (Obsoletes {obsoletes_names})"
-
-            # obsoleted by
-            obsoleted_by = ""
-            obsoleted_by_documents = sorted(
-                rfc.related_that("obs"),
-                key=attrgetter("rfc_number"),
-            )
-            if len(obsoleted_by_documents) > 0:
-                obsoleted_by_names = ", ".join(
-                    f"RFC{format_rfc_number(doc.rfc_number)}"
-                    for doc in obsoleted_by_documents
-                )
-                obsoleted_by = f" (Obsoleted by {obsoleted_by_names})"
-
-            # updates
-            updates = ""
-            updates_documents = sorted(
-                rfc.related_that_doc("updates"),
-                key=attrgetter("rfc_number"),
-            )
-            if len(updates_documents) > 0:
-                updates_names = ", ".join(
-                    f"RFC{format_rfc_number(doc.rfc_number)}"
-                    for doc in updates_documents
-                )
-                updates = f" (Updates {updates_names})"
-
-            # updated by
-            updated_by = ""
-            updated_by_documents = sorted(
-                rfc.related_that("updates"),
-                key=attrgetter("rfc_number"),
-            )
-            if len(updated_by_documents) > 0:
-                updated_by_names = ", ".join(
-                    f"RFC{format_rfc_number(doc.rfc_number)}"
-                    for doc in updated_by_documents
-                )
-                updated_by = f" (Updated by {updated_by_names})"
-
-            doc_relations = f"{obsoletes}{obsoleted_by}{updates}{updated_by} "
-
-            # subseries
-            subseries = ",".join(
-                f"{container.type.slug}{format_rfc_number(int(container.name[3:]))}"
-                for container in rfc.part_of()
-            ).upper()
-            if subseries:
-                subseries = f"(Also {subseries}) "
-
-            entry = fill(
-                (
-                    f"{format_rfc_number(rfc.rfc_number)} {rfc.title}. {authors}. {date}. "
-                    f"(Format: {formats}){doc_relations}{subseries}"
-                    f"(Status: {str(rfc.std_level).upper()}) "
-                    f"(DOI: {rfc.doi})"
-                ),
-                width=73,
-                subsequent_indent=" " * 5,
-            )
-            entries.append(entry)
+            entries.append(rendered[rfc.rfc_number])
 
     return entries
 
@@ -563,13 +687,112 @@ def add_related_xml_index_entries(root: etree.Element, rfc: Document, tag: str):
             ).text = f"RFC{format_rfc_number(doc.rfc_number)}"
 
 
+def rfc_xml_index_entry(
+    rfc: Document,
+    april1_rfc_numbers: Container[int],
+    publication_statuses: dict[int, StdLevelName],
+) -> etree.Element:
+    """Build the rfc-index.xml entry for a published RFC
+
+    The entry is not attached to an index so that it can be serialized on its own.
+    """
+    entry = etree.Element("rfc-entry")
+
+    etree.SubElement(
+        entry, "doc-id"
+    ).text = f"RFC{format_rfc_number(rfc.rfc_number)}"
+    etree.SubElement(entry, "title").text = rfc.title
+
+    for author in rfc.rfcauthor_set.all():
+        author_element = etree.SubElement(entry, "author")
+        etree.SubElement(author_element, "name").text = author.titlepage_name
+        if author.is_editor:
+            etree.SubElement(author_element, "title").text = "Editor"
+
+    date = etree.SubElement(entry, "date")
+    published_at = rfc.pub_date()
+    etree.SubElement(date, "month").text = published_at.strftime("%B")
+    if rfc.rfc_number in april1_rfc_numbers:
+        etree.SubElement(date, "day").text = str(published_at.day)
+    etree.SubElement(date, "year").text = str(published_at.year)
+
+    format_ = etree.SubElement(entry, "format")
+    fmts = [ff["fmt"] for ff in rfc.formats() if ff["fmt"] in FORMATS_FOR_INDEX]
+    for fmt in sorted(fmts, key=format_ordering(rfc.rfc_number)):
+        match_legacy = getattr(settings, "RFCINDEX_MATCH_LEGACY_XML", False)
+        etree.SubElement(format_, "file-format").text = (
+            "ASCII" if match_legacy and fmt == "txt" else fmt.upper()
+        )
+
+    etree.SubElement(entry, "page-count").text = str(rfc.pages)
+
+    if len(rfc.keywords) > 0:
+        keywords = etree.SubElement(entry, "keywords")
+        for keyword in rfc.keywords:
+            etree.SubElement(keywords, "kw").text = keyword.strip()
+
+    if rfc.abstract:
+        abstract = etree.SubElement(entry, "abstract")
+        for paragraph in rfc.abstract.split("\n\n"):
+            etree.SubElement(abstract, "p").text = paragraph.strip()
+
+    draft = rfc.came_from_draft()
+    if draft is not None:
+        etree.SubElement(entry, "draft").text = f"{draft.name}-{draft.rev}"
+
+    part_of_documents = rfc.part_of()
+    if len(part_of_documents) > 0:
+        is_also = etree.SubElement(entry, "is-also")
+        for doc in part_of_documents:
+            etree.SubElement(is_also, "doc-id").text = doc.name.upper()
+
+    add_related_xml_index_entries(entry, rfc, "obsoletes")
+    add_related_xml_index_entries(entry, rfc, "obsoleted-by")
+    add_related_xml_index_entries(entry, rfc, "updates")
+    add_related_xml_index_entries(entry, rfc, "updated-by")
+
+    etree.SubElement(entry, "current-status").text = rfc.std_level.name.upper()
+    etree.SubElement(entry, "publication-status").text = publication_statuses[
+        rfc.rfc_number
+    ].name.upper()
+    etree.SubElement(entry, "stream").text = (
+        "INDEPENDENT" if rfc.stream_id == "ise" else rfc.stream.name
+    )
+
+    # Add area / wg_acronym
+    if rfc.stream_id == "ietf":
+        if rfc.group.type_id in ["individ", "area"]:
+            etree.SubElement(entry, "wg_acronym").text = "NON WORKING GROUP"
+        else:
+            if rfc.area is not None:
+                etree.SubElement(entry, "area").text = rfc.area.acronym
+            if rfc.group:
+                etree.SubElement(entry, "wg_acronym").text = rfc.group.acronym
+
+    if rfc.tags.filter(slug="errata").exists():
+        etree.SubElement(entry, "errata-url").text = errata_url(rfc)
+    etree.SubElement(entry, "doi").text = rfc.doi
+    return entry
+
+
 def add_rfc_xml_index_entries(rfc_index):
     """Add RFC entries for rfc-index.xml"""
     entries = []
     april1_rfc_numbers = get_april1_rfc_numbers()
     publication_statuses = get_publication_std_levels()
 
-    published_rfcs = Document.objects.filter(type_id="rfc").order_by("rfc_number")
+    published_rfcs = list(Document.objects.filter(type_id="rfc").order_by("rfc_number"))
+    rendered = cached_rfc_index_entries(
+        "xml",
+        published_rfcs,
+        lambda rfc: etree.tostring(
+            rfc_xml_index_entry(rfc, april1_rfc_numbers, publication_statuses)
+        ),
+        lambda rfc: (
+            f":{int(rfc.rfc_number in april1_rfc_numbers)}"
+            f":{publication_statuses[rfc.rfc_number].slug}"
+        ),
+    )
 
     # Iterators for unpublished and published, both sorted by number
     unpublished_iter = iter(get_unusable_rfc_numbers())
@@ -594,82 +817,8 @@ def add_rfc_xml_index_entries(rfc_index):
 
         rfc = next_published  # hang on to this
         next_published = next(published_iter, None)  # prep for next iteration
-        entry = etree.SubElement(rfc_index, "rfc-entry")
-
-        etree.SubElement(
-            entry, "doc-id"
-        ).text = f"RFC{format_rfc_number(rfc.rfc_number)}"
-        etree.SubElement(entry, "title").text = rfc.title
-
-        for author in rfc.rfcauthor_set.all():
-            author_element = etree.SubElement(entry, "author")
-            etree.SubElement(author_element, "name").text = author.titlepage_name
-            if author.is_editor:
-                etree.SubElement(author_element, "title").text = "Editor"
-
-        date = etree.SubElement(entry, "date")
-        published_at = rfc.pub_date()
-        etree.SubElement(date, "month").text = published_at.strftime("%B")
-        if rfc.rfc_number in april1_rfc_numbers:
-            etree.SubElement(date, "day").text = str(published_at.day)
-        etree.SubElement(date, "year").text = str(published_at.year)
-
-        format_ = etree.SubElement(entry, "format")
-        fmts = [ff["fmt"] for ff in rfc.formats() if ff["fmt"] in FORMATS_FOR_INDEX]
-        for fmt in sorted(fmts, key=format_ordering(rfc.rfc_number)):
-            match_legacy = getattr(settings, "RFCINDEX_MATCH_LEGACY_XML", False)
-            etree.SubElement(format_, "file-format").text = (
-                "ASCII" if match_legacy and fmt == "txt" else fmt.upper()
-            )
-
-        etree.SubElement(entry, "page-count").text = str(rfc.pages)
-
-        if len(rfc.keywords) > 0:
-            keywords = etree.SubElement(entry, "keywords")
-            for keyword in rfc.keywords:
-                etree.SubElement(keywords, "kw").text = keyword.strip()
-
-        if rfc.abstract:
-            abstract = etree.SubElement(entry, "abstract")
-            for paragraph in rfc.abstract.split("\n\n"):
-                etree.SubElement(abstract, "p").text = paragraph.strip()
-
-        draft = rfc.came_from_draft()
-        if draft is not None:
-            etree.SubElement(entry, "draft").text = f"{draft.name}-{draft.rev}"
-
-        part_of_documents = rfc.part_of()
-        if len(part_of_documents) > 0:
-            is_also = etree.SubElement(entry, "is-also")
-            for doc in part_of_documents:
-                etree.SubElement(is_also, "doc-id").text = doc.name.upper()
-
-        add_related_xml_index_entries(entry, rfc, "obsoletes")
-        add_related_xml_index_entries(entry, rfc, "obsoleted-by")
-        add_related_xml_index_entries(entry, rfc, "updates")
-        add_related_xml_index_entries(entry, rfc, "updated-by")
-
-        etree.SubElement(entry, "current-status").text = rfc.std_level.name.upper()
-        etree.SubElement(entry, "publication-status").text = publication_statuses[
-            rfc.rfc_number
-        ].name.upper()
-        etree.SubElement(entry, "stream").text = (
-            "INDEPENDENT" if rfc.stream_id == "ise" else rfc.stream.name
-        )
-
-        # Add area / wg_acronym
-        if rfc.stream_id == "ietf":
-            if rfc.group.type_id in ["individ", "area"]:
-                etree.SubElement(entry, "wg_acronym").text = "NON WORKING GROUP"
-            else:
-                if rfc.area is not None:
-                    etree.SubElement(entry, "area").text = rfc.area.acronym
-                if rfc.group:
-                    etree.SubElement(entry, "wg_acronym").text = rfc.group.acronym
-
-        if rfc.tags.filter(slug="errata").exists():
-            etree.SubElement(entry, "errata-url").text = errata_url(rfc)
-        etree.SubElement(entry, "doi").text = rfc.doi
+        entry = etree.fromstring(rendered[rfc.rfc_number])
+        rfc_index.append(entry)
         entries.append(entry)
 
 
@@ -30,6 +30,8 @@
     get_unusable_rfc_numbers,
     red_bucket_input_path,
     red_bucket_output_path,
+    rfc_text_index_entry,
+    rfc_xml_index_entry,
     save_to_filesystem,
     save_to_red_bucket,
     subseries_text_line,
@@ -225,6 +227,46 @@ def test_create_rfc_xml_index(self, mock_save_blob, mock_save_file):
             [(f"{ns}month", "April"), (f"{ns}year", "2021")],
         )
 
+    @override_settings(
+        RFCINDEX_INPUT_PATH="input/",
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "rfcindex-entries",
+            },
+        },
+    )
+    @mock.patch("ietf.sync.rfcindex.save_to_filesystem")
+    @mock.patch("ietf.sync.rfcindex.save_to_red_bucket")
+    def test_rfc_index_entries_are_cached(self, mock_save_blob, mock_save_file):
+        create_rfc_txt_index()
+        create_rfc_xml_index()
+        full_txt, full_xml = [c[0][1] for c in mock_save_blob.call_args_list]
+
+        with (
+            mock.patch("ietf.sync.rfcindex.rfc_text_index_entry", wraps=rfc_text_index_entry) as txt_mock,
+            mock.patch("ietf.sync.rfcindex.rfc_xml_index_entry", wraps=rfc_xml_index_entry) as xml_mock,
+        ):
+            mock_save_blob.reset_mock()
+            create_rfc_txt_index()
+            create_rfc_xml_index()
+            self.assertEqual(txt_mock.call_count, 0)
+            self.assertEqual(xml_mock.call_count, 0)
+            self.assertEqual([c[0][1] for c in mock_save_blob.call_args_list], [full_txt, full_xml])
+
+            # only the entry of the RFC that changed is rendered again
+            self.rfc.tags.remove("errata")
+            mock_save_blob.reset_mock()
+            create_rfc_txt_index()
+            create_rfc_xml_index()
+            self.assertEqual(txt_mock.call_count, 1)
+            self.assertEqual(txt_mock.call_args[0][0], self.rfc)
+            self.assertEqual(xml_mock.call_count, 1)
+            self.assertEqual(xml_mock.call_args[0][0], self.rfc)
+            xml = mock_save_blob.call_args_list[1][0][1]
+            self.assertNotEqual(xml, full_xml)
+            self.assertNotIn(b"errata-url", xml)
+
     @override_settings(RFCINDEX_INPUT_PATH="input/")
     @mock.patch("ietf.sync.rfcindex.save_to_filesystem")
     @mock.patch("ietf.sync.rfcindex.save_to_red_bucket")
@@ -2,7 +2,7 @@
 
 
 from django.contrib import admin
-from .models import DumpInfo, DirtyBits
+from .models import DumpInfo, DirtyBits, SearchIndexChange
 
 
 class SaferStackedInline(admin.StackedInline):
@@ -28,3 +28,10 @@ class DumpInfoAdmin(admin.ModelAdmin):
 @admin.register(DirtyBits)
 class DirtyBitsAdmin(admin.ModelAdmin):
     list_display = ["slug", "dirty_time", "processed_time"]
+
+
+@admin.register(SearchIndexChange)
+class SearchIndexChangeAdmin(admin.ModelAdmin):
+    list_display = ["doc_id", "kind", "time"]
+    list_filter = ["kind"]
+    ordering = ["time"]
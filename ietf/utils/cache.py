@@ -1,6 +1,10 @@
-# Copyright The IETF Trust 2023, All Rights Reserved
+# Copyright The IETF Trust 2023-2026, All Rights Reserved
 # -*- coding: utf-8 -*-
 
+import time
+import uuid
+
+from django.core.cache import caches
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.memcached import PyMemcacheCache
 from pymemcache.exceptions import MemcacheServerError
@@ -18,3 +22,136 @@ def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
                 log(f"Memcache failed to cache large object for {key}")
             else:
                 raise
+
+
+# Longest a render may hold its lock before others assume it died
+RENDER_LOCK_TIMEOUT = 120
+
+
+def _release_lock(lock_cache, lock_key, token):
+    # Only drop the lock if it is still ours - it may have expired and been
+    # taken by someone else while we were rendering
+    if lock_cache.get(lock_key) == token:
+        lock_cache.delete(lock_key)
+
+
+def single_flight(
+    key,
+    render,
+    lookup=None,
+    lock_timeout=RENDER_LOCK_TIMEOUT,
+    wait_timeout=60,
+    poll_interval=0.25,
+    lock_cache="default",
+):
+    """Call render() for key in at most one process at a time
+
+    The first caller takes a lock in the shared lock_cache and renders. Callers
+    that find the lock taken poll lookup() (if given) until the result appears,
+    and try to take the lock themselves if it is released without one. After
+    wait_timeout seconds a waiter gives up and renders on its own, so a lost
+    lock costs a duplicate render rather than a failed request.
+
+    With a non-shared lock cache (e.g., DummyCache, whose add() always succeeds)
+    every caller simply renders.
+    """
+    locks = caches[lock_cache]
+    lock_key = f"single-flight:{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_timeout
+    while True:
+        if locks.add(lock_key, token, lock_timeout):
+            try:
+                return render()
+            finally:
+                _release_lock(locks, lock_key, token)
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            if lookup is not None:
+                value = lookup()
+                if value is not None:
+                    return value
+            if locks.get(lock_key) is None:
+                break  # released without a result, try to take it
+        else:
+            log(f"Gave up waiting for {lock_key}, rendering anyway")
+            return render()
+
+
+def _set_rendered(cache, key, value, timeout, stale_timeout):
+    if stale_timeout:
+        cache.set(key, value, timeout + stale_timeout)
+        cache.set(f"{key}:fresh", True, timeout)
+    else:
+        cache.set(key, value, timeout)
+
+
+def cached_render(cache_name, key, render, timeout, stale_timeout=0, lookup=None):
+    """Get a rendered value from a cache, rendering it at most once at a time on a miss
+
+    On a miss, lookup() (if given) is consulted as a shared second-level store
+    before rendering, and the render goes through single_flight() so that a burst
+    of requests for the same key results in a single render. A value found by
+    lookup() is put in the cache like a rendered one, so it is rendered again
+    once it goes stale.
+
+    If stale_timeout is set, entries stay in the cache for that long after they
+    stop being fresh. A stale entry is returned immediately to every caller
+    except the one that wins the refresh lock, which renders a new value.
+    """
+    cache = caches[cache_name]
+    lock_name = f"{cache_name}:{key}"
+    fresh_key = f"{key}:fresh"
+    try:
+        value = cache.get(key)
+    except EOFError:
+        value = None
+    if value:
+        if not stale_timeout or cache.get(fresh_key):
+            return value
+        locks = caches["default"]
+        lock_key = f"single-flight:{lock_name}"
+        token = uuid.uuid4().hex
+        if not locks.add(lock_key, token, RENDER_LOCK_TIMEOUT):
+            return value  # someone else is refreshing
+        try:
+            rendered = render()
+        except Exception as err:
+            log(f"Failed to refresh stale {lock_name}, keeping old value: {err}")
+            rendered = None
+        finally:
+            _release_lock(locks, lock_key, token)
+        if rendered:
+            _set_rendered(cache, key, rendered, timeout, stale_timeout)
+            value = rendered
+        return value
+
+    def _cached():
+        try:
+            return cache.get(key) or None
+        except EOFError:
+            return None
+
+    def _lookup():
+        found = _cached()
+        if found is None and lookup is not None:
+            found = lookup() or None
+        return found
+
+    def _render():
+        # Check again now that we hold the lock, another process may have
+        # finished rendering between our cache miss and taking the lock.
+        found = _cached()
+        if found is not None:
+            return found
+        if lookup is not None:
+            found = lookup()
+            if found:
+                _set_rendered(cache, key, found, timeout, stale_timeout)
+                return found
+        rendered = render()
+        if rendered:
+            _set_rendered(cache, key, rendered, timeout, stale_timeout)
+        return rendered
+
+    return single_flight(lock_name, _render, lookup=_lookup)
@@ -152,7 +152,18 @@ def create_default_tasks(self):
                 description="Update I-D index files",
             ),
         )
-        
+
+        PeriodicTask.objects.get_or_create(
+            name="Rebuild I-D index files",
+            task="ietf.idindex.tasks.idindex_update_task",
+            kwargs=json.dumps({"full": True}),
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["daily"],
+                description="Regenerate all I-D index entries, including changes not recorded as document events",
+            ),
+        )
+
         PeriodicTask.objects.get_or_create(
             name="Send expiration notifications",
             task="ietf.doc.tasks.notify_expirations_task",
@@ -213,6 +224,16 @@ def create_default_tasks(self):
             ),
         )
 
+        PeriodicTask.objects.get_or_create(
+            name="Prewarm slow pages",
+            task="ietf.utils.tasks.prewarm_slow_page_values_task",
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["every_15m"],
+                description="Recompute missing or stale values of slow pages, such as recent drafts and group stats",
+            ),
+        )
+
         PeriodicTask.objects.get_or_create(
             name="Generate I-D bibxml files",
             task="ietf.doc.tasks.generate_draft_bibxml_files_task",
@@ -223,6 +244,16 @@ def create_default_tasks(self):
             ),
         )
 
+        PeriodicTask.objects.get_or_create(
+            name="Pre-render recent document artifacts",
+            task="ietf.doc.tasks.render_recent_document_artifacts_task",
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["hourly"],
+                description="Render htmlized and pdfized forms of recent revisions that are missing from blob storage",
+            ),
+        )
+
         PeriodicTask.objects.get_or_create(
             name="Send personal API key usage emails",
             task="ietf.person.tasks.send_apikey_usage_emails_task",
@@ -256,6 +287,47 @@ def create_default_tasks(self):
             },
         )
 
+        PeriodicTask.objects.get_or_create(
+            name="Rebuild community list document tracking",
+            task="ietf.community.tasks.update_community_list_tracked_docs_task",
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["daily"],
+                description="Recompute the documents tracked by each community list from its rules",
+            ),
+        )
+
+        PeriodicTask.objects.get_or_create(
+            name="Replicate pending blobs",
+            task="ietf.blobdb.tasks.replicate_pending_blobs_task",
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["every_15m"],
+                description="Replicate blob changes left over from failed or lost replication runs",
+            ),
+        )
+
+        PeriodicTask.objects.get_or_create(
+            name="Rebuild email alias snapshot",
+            task="ietf.message.tasks.update_email_aliases_task",
+            kwargs=json.dumps({"full": True}),
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["daily"],
+                description="Regenerate all draft and group email aliases served by the alias APIs",
+            ),
+        )
+
+        PeriodicTask.objects.get_or_create(
+            name="Sync search index",
+            task="ietf.doc.tasks.sync_searchindex_task",
+            defaults=dict(
+                enabled=False,
+                crontab=self.crontabs["every_15m"],
+                description="Push documents changed since the last sync to the search index",
+            ),
+        )
+
         PeriodicTask.objects.get_or_create(
             name="Run Yang model checks",
             task="ietf.submit.tasks.run_yang_model_checks_task",
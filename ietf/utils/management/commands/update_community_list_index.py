@@ -7,12 +7,13 @@
 
 import debug                            # pyflakes:ignore
 
-from ietf.community.models import SearchRule
-from ietf.community.utils import reset_name_contains_index_for_rule
+from ietf.community.models import CommunityList
+from ietf.community.utils import reset_name_contains_indexes, update_tracked_docs_for_community_list
 
 class Command(BaseCommand):
     help = ("""
-        Update the index tables for stored regex-based document search rules.
+        Update the index tables for stored regex-based document search rules
+        and the documents tracked by each community list.
         """)
 
     def add_arguments(self, parser):
@@ -22,12 +23,10 @@ def add_arguments(self, parser):
 
     def handle(self, *args, **options):
         verbosity = options.get('verbosity', 1)
-        for rule in tqdm(SearchRule.objects.filter(rule_type='name_contains'), disable=(verbosity!=1)):
-            count1 = rule.name_contains_index.count()
-            if not options['dry_run']:
-                reset_name_contains_index_for_rule(rule)
-            count2 = rule.name_contains_index.count()
-            if int(options['verbosity']) > 1:
+        # one streamed pass over all document names for all rules
+        counts = reset_name_contains_indexes(dry_run=options['dry_run'])
+        if int(options['verbosity']) > 1:
+            for rule, (count1, count2) in counts.items():
                 group = rule.group or rule.community_list.group
                 person  = rule.person
                 if not person and not group:
@@ -37,4 +36,6 @@ def handle(self, *args, **options):
                         pass
                 name = ((group and group.acronym) or (person and person.email_address())) or '?'
                 self.stdout.write("%-24s %-24s  %3d -->%3d\n" % (name[:24], rule.text[:24], count1, count2 ))
-            
+        if not options['dry_run']:
+            for clist in tqdm(CommunityList.objects.all(), disable=(verbosity!=1)):
+                update_tracked_docs_for_community_list(clist)
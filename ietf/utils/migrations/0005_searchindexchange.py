@@ -0,0 +1,51 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("utils", "0004_alter_dirtybits_slug"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndexChange",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "doc_id",
+                    models.IntegerField(
+                        help_text="Primary key of the changed Document", unique=True
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("update", "Update"), ("delete", "Delete")],
+                        default="update",
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "time",
+                    models.DateTimeField(
+                        help_text="Time of the latest change to the document"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["time"], name="utils_searc_time_0a2c0c_idx")
+                ],
+            },
+        ),
+    ]
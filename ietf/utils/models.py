@@ -25,6 +25,29 @@ class Slugs(models.TextChoices):
     class Meta:
         verbose_name_plural = "dirty bits"
 
+
+
+class SearchIndexChange(models.Model):
+    """A document whose search index entry is out of date
+
+    Changes to the same document coalesce into one entry. The entry is removed
+    by the search index sync task once the document has been pushed or removed.
+    """
+
+    class Kinds(models.TextChoices):
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+
+    doc_id = models.IntegerField(unique=True, help_text="Primary key of the changed Document")
+    kind = models.CharField(max_length=8, choices=Kinds.choices, default=Kinds.UPDATE)
+    time = models.DateTimeField(help_text="Time of the latest change to the document")
+
+    class Meta:
+        indexes = [models.Index(fields=["time"])]
+
+    def __str__(self):
+        return f"{self.kind} doc {self.doc_id} at {self.time:%Y-%m-%d %H:%M:%S}"
+
     
 class DumpInfo(models.Model):
     date = models.DateTimeField()
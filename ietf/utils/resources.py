@@ -10,7 +10,7 @@
 from django.contrib.contenttypes.models import ContentType
 
 from ietf import api
-from ietf.utils.models import DirtyBits, DumpInfo
+from ietf.utils.models import DirtyBits, DumpInfo, SearchIndexChange
 
 
 class UserResource(ModelResource):
@@ -47,3 +47,9 @@ class DirtyBitsResource(ModelResource):
     class Meta:
         queryset = DirtyBits.objects.none()
 api.utils.register(DirtyBitsResource())
+
+
+class SearchIndexChangeResource(ModelResource):
+    class Meta:
+        queryset = SearchIndexChange.objects.none()
+api.utils.register(SearchIndexChangeResource())
@@ -1,11 +1,80 @@
-# Copyright The IETF Trust 2020, All Rights Reserved
+# Copyright The IETF Trust 2020-2026, All Rights Reserved
 # -*- coding: utf-8 -*-
 
 from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils.safestring import mark_safe
 
 def permission_denied(request, msg):
     "A wrapper around the PermissionDenied exception"
     if not request.user.is_authenticated:
         msg += '  <br>You may want to <a href="/accounts/login?next=%s">log in</a> if you have a datatracker role that lets you access this page.' % request.path
-    raise PermissionDenied(mark_safe(msg))
\ No newline at end of file
+    raise PermissionDenied(mark_safe(msg))
+
+def _parse_byte_range(header, length):
+    """Parse a single-range Range header into an inclusive (start, end) pair
+
+    Returns None if the header should be ignored (missing, malformed or asking
+    for multiple ranges, which we serve as a full response), or the string
+    "unsatisfiable" if the range lies entirely outside the content.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, last = (part.strip() for part in spec.split("-", 1))
+    if not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+        return None
+    if first == "":
+        if last == "":
+            return None
+        suffix = int(last)  # "bytes=-N" means the last N bytes
+        if suffix == 0:
+            return "unsatisfiable"
+        return (max(length - suffix, 0), length - 1)
+    start = int(first)
+    end = int(last) if last else length - 1
+    if end < start:
+        return None
+    if start >= length:
+        return "unsatisfiable"
+    return (start, min(end, length - 1))
+
+
+def ranged_response(request, content, content_type, etag=None):
+    """Serve in-memory content with ETag and single byte-range support
+
+    If etag is given, it is sent as a strong validator, an If-None-Match that
+    matches it gets a 304 and an If-Range that does not match it makes a Range
+    request fall back to the full content.
+    """
+    quoted_etag = quote_etag(etag) if etag else None
+    if quoted_etag:
+        not_modified = get_conditional_response(request, etag=quoted_etag)
+        if not_modified is not None:
+            return not_modified
+
+    length = len(content)
+    byte_range = None
+    if request.method in ("GET", "HEAD"):
+        byte_range = _parse_byte_range(request.headers.get("range"), length)
+        if_range = request.headers.get("if-range")
+        if byte_range is not None and if_range is not None and if_range != quoted_etag:
+            byte_range = None
+
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{length}"
+    elif byte_range is not None:
+        start, end = byte_range
+        response = HttpResponse(content[start:end + 1], content_type=content_type, status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{length}"
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response["Accept-Ranges"] = "bytes"
+    if quoted_etag:
+        response["ETag"] = quoted_etag
+    return response
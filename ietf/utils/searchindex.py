@@ -2,6 +2,8 @@
 """Search indexing utilities"""
 
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from itertools import batched
 from math import floor
 from typing import Iterable
@@ -12,11 +14,16 @@
 import typesense
 import typesense.exceptions
 from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.db.models import Count, Max
 from typesense.types.document import DocumentSchema
 
-from ietf.doc.models import Document, StoredObject
+from ietf.doc.models import DocEvent, Document, RelatedDocument, StoredObject
 from ietf.doc.storage_utils import retrieve_str
 from ietf.utils.log import log
+from ietf.utils.models import SearchIndexChange
+from ietf.utils.timezone import RPC_TZINFO
 
 # Error classes that might succeed just by retrying a failed attempt.
 # Must be a tuple for use with isinstance()
@@ -34,6 +41,10 @@
     "TYPESENSE_COLLECTION_NAME": "docs",
     "TASK_RETRY_DELAY": 10,
     "TASK_MAX_RETRIES": 12,
+    "TEXT_RETRIEVAL_WORKERS": 8,  # concurrent blob reads when indexing in bulk
+    "SYNC_BATCH_SIZE": 40,  # journaled documents pushed per import
+    "SYNC_MAX_BATCHES": 50,  # imports per sync run
+    "SYNC_SLOW_BATCH_SECONDS": 10,  # end the sync run after an import this slow
 }
 
 
@@ -104,6 +115,129 @@ def typesense_doc_from_rfc(rfc: Document) -> DocumentSchema:
     assert rfc.rfc_number is not None
     assert rfc.pages is not None
 
+    subseries = rfc.part_of()
+    stored_txt = (
+        StoredObject.objects.exclude_deleted()
+        .filter(store="rfc", doc_name=rfc.name, name__startswith="txt/")
+        .first()
+    )
+    return _typesense_doc(
+        rfc,
+        subseries_total=len(subseries[0].contains()) if len(subseries) > 0 else 0,
+        pub_datetime=rfc.pub_datetime(),
+        content="" if stored_txt is None else _retrieve_text(stored_txt),
+    )
+
+
+def typesense_docs_from_rfcs(rfcs: Iterable[Document]) -> list[DocumentSchema]:
+    """Build typesense docs for many RFCs at once
+
+    Equivalent to calling typesense_doc_from_rfc() for each RFC, but loads the
+    data for the whole batch in a fixed number of queries and retrieves the
+    texts concurrently.
+    """
+    rfc_pks = [rfc.pk for rfc in rfcs]
+    rfcs_by_pk = {
+        rfc.pk: rfc
+        for rfc in Document.objects.filter(pk__in=rfc_pks)
+        .select_related("std_level", "stream", "group__type", "group__parent", "ad")
+        .prefetch_related("states", "rfcauthor_set")
+    }
+    rfcs = [rfcs_by_pk[pk] for pk in rfc_pks]  # keep the order of the request
+    for rfc in rfcs_by_pk.values():
+        assert rfc.type_id == "rfc"
+        assert rfc.rfc_number is not None
+        assert rfc.pages is not None
+        rfc._cached_related_that = {"obs": [], "updates": [], "contains": []}
+    for rel in (
+        RelatedDocument.objects.filter(
+            target__in=list(rfcs_by_pk), relationship__in=["obs", "updates", "contains"]
+        )
+        .select_related("source__type")
+        .order_by("pk")
+    ):
+        related = rfcs_by_pk[rel.target_id]._cached_related_that[rel.relationship_id]
+        if rel.source not in related:
+            related.append(rel.source)
+    subseries_totals = dict(
+        RelatedDocument.objects.filter(
+            source__in={
+                subseries.pk
+                for rfc in rfcs_by_pk.values()
+                for subseries in rfc._cached_related_that["contains"]
+            },
+            relationship_id="contains",
+        )
+        .values("source")
+        .annotate(total=Count("target", distinct=True))
+        .values_list("source", "total")
+    )
+    pub_datetimes = {
+        doc_id: latest.astimezone(RPC_TZINFO)
+        for doc_id, latest in DocEvent.objects.filter(
+            doc__in=list(rfcs_by_pk), type="published_rfc"
+        )
+        .values("doc")
+        .annotate(latest=Max("time"))
+        .values_list("doc", "latest")
+    }
+    stored_txts = {}
+    for stored_txt in (
+        StoredObject.objects.exclude_deleted()
+        .filter(
+            store="rfc",
+            doc_name__in=[rfc.name for rfc in rfcs_by_pk.values()],
+            name__startswith="txt/",
+        )
+        .order_by("pk")
+    ):
+        stored_txts.setdefault(stored_txt.doc_name, stored_txt)
+    max_workers = get_settings()["TEXT_RETRIEVAL_WORKERS"]
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = dict(
+                zip(
+                    stored_txts,
+                    executor.map(_retrieve_text_in_thread, stored_txts.values()),
+                )
+            )
+    else:
+        contents = {
+            doc_name: _retrieve_text(stored_txt)
+            for doc_name, stored_txt in stored_txts.items()
+        }
+    return [
+        _typesense_doc(
+            rfc,
+            subseries_total=(
+                subseries_totals.get(rfc._cached_related_that["contains"][0].pk, 0)
+                if len(rfc._cached_related_that["contains"]) > 0
+                else 0
+            ),
+            pub_datetime=pub_datetimes.get(rfc.pk),
+            content=contents.get(rfc.name, ""),
+        )
+        for rfc in rfcs
+    ]
+
+
+def _retrieve_text(stored_txt: StoredObject) -> str:
+    # Should be available in the blobdb, but be cautious...
+    try:
+        return retrieve_str(kind=stored_txt.store, name=stored_txt.name)
+    except Exception as err:
+        log(f"Unable to retrieve {stored_txt} from storage: {err}")
+    return ""
+
+
+def _retrieve_text_in_thread(stored_txt: StoredObject) -> str:
+    try:
+        return _retrieve_text(stored_txt)
+    finally:
+        connections.close_all()  # only closes this thread's connections
+
+
+def _typesense_doc(rfc: Document, subseries_total, pub_datetime, content) -> DocumentSchema:
     keywords: list[str] = rfc.keywords  # help type checking
 
     subseries = rfc.part_of()
@@ -119,19 +253,6 @@ def typesense_doc_from_rfc(rfc: Document) -> DocumentSchema:
     is_updated = len(updated_by) > 0
     is_historic = rfc.std_level.slug == "hist"
 
-    stored_txt = (
-        StoredObject.objects.exclude_deleted()
-        .filter(store="rfc", doc_name=rfc.name, name__startswith="txt/")
-        .first()
-    )
-    content = ""
-    if stored_txt is not None:
-        # Should be available in the blobdb, but be cautious...
-        try:
-            content = retrieve_str(kind=stored_txt.store, name=stored_txt.name)
-        except Exception as err:
-            log(f"Unable to retrieve {stored_txt} from storage: {err}")
-
     ts_document = {
         "id": f"doc-{rfc.pk}",
         "rfcNumber": rfc.rfc_number,
@@ -145,7 +266,7 @@ def typesense_doc_from_rfc(rfc: Document) -> DocumentSchema:
         "state": [state.name for state in rfc.states.all()],
         "status": {"slug": rfc.std_level.slug, "name": rfc.std_level.name},
         "date": floor(rfc.time.timestamp()),
-        "publicationDate": floor(rfc.pub_datetime().timestamp()),
+        "publicationDate": floor(pub_datetime.timestamp()),
         "stream": {"slug": rfc.stream.slug, "name": rfc.stream.name},
         "authors": [
             {"name": rfc_author.titlepage_name, "affiliation": rfc_author.affiliation}
@@ -164,7 +285,7 @@ def typesense_doc_from_rfc(rfc: Document) -> DocumentSchema:
         ts_document["subseries"] = {
             "acronym": subseries.type.slug,
             "number": int(subseries.name[len(subseries.type.slug):]),
-            "total": len(subseries.contains()),
+            "total": subseries_total,
         }
     if rfc.group is not None:
         ts_document["group"] = {
@@ -189,6 +310,57 @@ def typesense_doc_from_rfc(rfc: Document) -> DocumentSchema:
     return ts_document
 
 
+def typesense_doc_from_draft(draft: Document) -> DocumentSchema:
+    assert draft.type_id == "draft"
+
+    keywords: list[str] = draft.keywords  # help type checking
+    is_active = draft.get_state_slug() == "active"
+    ts_document = {
+        "id": f"doc-{draft.pk}",
+        "filename": f"{draft.name}-{draft.rev}",
+        "title": draft.title,
+        "abstract": _sanitize_abstract(draft.abstract),
+        "pages": draft.pages or 0,
+        "keywords": keywords,
+        "type": "draft",
+        "state": [state.name for state in draft.states.all()],
+        "date": floor(draft.time.timestamp()),
+        "authors": [
+            {"name": author.person.name, "affiliation": author.affiliation}
+            for author in draft.documentauthor_set.select_related("person")
+        ],
+        "flags": {
+            "hiddenDefault": not is_active,
+            "obsoleted": False,
+            "updated": False,
+        },
+        "ranking": int(draft.rev) if draft.rev.isdigit() else 0,
+    }
+    if draft.expires is not None:
+        ts_document["expires"] = floor(draft.expires.timestamp())
+    rfc = draft.became_rfc()
+    if rfc is not None:
+        ts_document["ref"] = str(rfc.rfc_number)
+    if draft.stream is not None:
+        ts_document["stream"] = {"slug": draft.stream.slug, "name": draft.stream.name}
+    if draft.group is not None and draft.group.type_id != "individ":
+        ts_document["group"] = {
+            "acronym": draft.group.acronym,
+            "name": draft.group.name,
+            "full": f"{draft.group.acronym} - {draft.group.name}",
+            "type": draft.group.type_id,
+        }
+        if draft.group.parent is not None:
+            ts_document["area"] = {
+                "acronym": draft.group.parent.acronym,
+                "name": draft.group.parent.name,
+                "full": f"{draft.group.parent.acronym} - {draft.group.parent.name}",
+            }
+    if draft.ad is not None:
+        ts_document["adName"] = draft.ad.name
+    return ts_document
+
+
 def update_or_create_rfc_entry(rfc: Document):
     """Update/create index entries for one RFC"""
     ts_document = typesense_doc_from_rfc(rfc)
@@ -214,7 +386,7 @@ def update_or_create_rfc_entries(
     client = get_typesense_client()
     batches = [rfcs] if batchsize is None else batched(rfcs, batchsize)
     for batch in batches:
-        tdoc_batch = [typesense_doc_from_rfc(rfc) for rfc in batch]
+        tdoc_batch = typesense_docs_from_rfcs(batch)
         results = client.collections[get_collection_name()].documents.import_(
             tdoc_batch, {"action": "upsert"}
         )
@@ -227,6 +399,100 @@ def update_or_create_rfc_entries(
     log(f"Added {success_count} RFCs to the index, failed to add {fail_count}")
 
 
+def record_document_change(doc_id: int, kind=SearchIndexChange.Kinds.UPDATE):
+    """Journal a change to a document for the next search index sync
+
+    Only changes to RFCs and drafts, which are the documents in the index, and
+    deletions are journaled.
+    """
+    if not enabled():
+        return
+    if (
+        kind == SearchIndexChange.Kinds.UPDATE
+        and not Document.objects.filter(pk=doc_id, type_id__in=["rfc", "draft"]).exists()
+    ):
+        return
+    # Repeated changes to a document collapse into one entry
+    SearchIndexChange.objects.bulk_create(
+        [SearchIndexChange(doc_id=doc_id, kind=kind, time=timezone.now())],
+        update_conflicts=True,
+        unique_fields=["doc_id"],
+        update_fields=["kind", "time"],
+    )
+
+
+def sync_changed_documents():
+    """Push journaled document changes to the index
+
+    Works through the journal oldest first, a batch at a time. Documents that no
+    longer exist are removed from the index. Stops early when a batch fails with a
+    retryable error or is slow to import, leaving the rest for the next run so a
+    struggling search service is not piled onto.
+    Documents the index fails to import stay in the journal, moved behind the
+    other changes, and are retried on the next run.
+    """
+    _settings = get_settings()
+    client = get_typesense_client()
+    documents = client.collections[get_collection_name()].documents
+    pushed_count = 0
+    removed_count = 0
+    fail_count = 0
+    failed_pks = set()
+    for _ in range(_settings["SYNC_MAX_BATCHES"]):
+        changes = list(
+            SearchIndexChange.objects.exclude(doc_id__in=failed_pks).order_by("time")[
+                : _settings["SYNC_BATCH_SIZE"]
+            ]
+        )
+        if len(changes) == 0:
+            break
+        changed_pks = [change.doc_id for change in changes]
+        existing_pks = set(
+            Document.objects.filter(pk__in=changed_pks).values_list("pk", flat=True)
+        )
+        docs = Document.objects.filter(
+            pk__in=existing_pks, type_id__in=["rfc", "draft"]
+        ).select_related("stream", "group__parent", "ad")
+        tdocs = typesense_docs_from_rfcs(
+            [doc for doc in docs if doc.type_id == "rfc"]
+        ) + [typesense_doc_from_draft(doc) for doc in docs if doc.type_id == "draft"]
+        started = time.monotonic()
+        try:
+            if len(tdocs) > 0:
+                results = documents.import_(tdocs, {"action": "upsert"})
+                for tdoc, result in zip(tdocs, results):
+                    if result["success"]:
+                        pushed_count += 1
+                    else:
+                        fail_count += 1
+                        failed_pks.add(int(tdoc["id"].removeprefix("doc-")))
+                        log(f"Failed to index {tdoc['filename']}: {result['error']}")
+            for change in changes:
+                if change.doc_id not in existing_pks:
+                    try:
+                        documents[f"doc-{change.doc_id}"].delete()
+                        removed_count += 1
+                    except typesense.exceptions.ObjectNotFound:
+                        pass
+        except RETRYABLE_ERROR_CLASSES as err:
+            log(f"Search index sync interrupted ({err}), will resume on the next run")
+            break
+        # Entries for documents that changed again meanwhile are left for the next run
+        for change in changes:
+            unchanged = SearchIndexChange.objects.filter(pk=change.pk, time=change.time)
+            if change.doc_id in failed_pks:
+                unchanged.update(time=timezone.now())
+            else:
+                unchanged.delete()
+        if time.monotonic() - started > _settings["SYNC_SLOW_BATCH_SECONDS"]:
+            log("Search index is responding slowly, leaving remaining changes for the next run")
+            break
+    log(
+        f"Search index sync pushed {pushed_count} documents, removed {removed_count}, "
+        f"failed to push {fail_count}"
+    )
+
+
 DOCS_SCHEMA = {
     "enable_nested_fields": True,
     "default_sorting_field": "ranking",
@@ -0,0 +1,56 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from ietf.doc.models import DocEvent, Document, DocumentAuthor, RelatedDocument, RfcAuthor
+from .models import SearchIndexChange
+from .searchindex import record_document_change
+
+
+# The receivers below journal every change that can affect a document's search
+# index entry. ietf.utils.searchindex.sync_changed_documents() pushes them.
+
+@receiver(post_save, sender=Document, dispatch_uid="searchindex_doc_saved_uid")
+def doc_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_document_change(instance.pk)
+
+
+@receiver(post_delete, sender=Document, dispatch_uid="searchindex_doc_deleted_uid")
+def doc_deleted_receiver(sender, instance, **kwargs):
+    record_document_change(instance.pk, SearchIndexChange.Kinds.DELETE)
+
+
+@receiver(m2m_changed, sender=Document.states.through, dispatch_uid="searchindex_doc_states_uid")
+def doc_states_changed_receiver(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        record_document_change(instance.pk)
+
+
+@receiver(post_save, dispatch_uid="searchindex_docevent_saved_uid")
+def doc_event_saved_receiver(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and created and isinstance(instance, DocEvent):
+        record_document_change(instance.doc_id)
+
+
+@receiver(post_save, sender=DocumentAuthor, dispatch_uid="searchindex_author_saved_uid")
+@receiver(post_save, sender=RfcAuthor, dispatch_uid="searchindex_rfcauthor_saved_uid")
+def doc_author_saved_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_document_change(instance.document_id)
+
+
+@receiver(post_delete, sender=DocumentAuthor, dispatch_uid="searchindex_author_deleted_uid")
+@receiver(post_delete, sender=RfcAuthor, dispatch_uid="searchindex_rfcauthor_deleted_uid")
+def doc_author_deleted_receiver(sender, instance, **kwargs):
+    record_document_change(instance.document_id)
+
+
+@receiver(post_save, sender=RelatedDocument, dispatch_uid="searchindex_relation_saved_uid")
+@receiver(post_delete, sender=RelatedDocument, dispatch_uid="searchindex_relation_deleted_uid")
+def related_document_changed_receiver(sender, instance, raw=False, **kwargs):
+    # obsoletedBy, updatedBy and subseries totals live in the entries of both ends
+    if not raw:
+        record_document_change(instance.source_id)
+        record_document_change(instance.target_id)
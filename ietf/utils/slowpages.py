@@ -0,0 +1,183 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+"""Stale-while-revalidate cache for the values behind slow pages
+
+A function decorated with @slow_page_value computes a value that is expensive
+to build, such as the data of an index page. Calling it returns the value from
+the "slowpages" cache. Once the value is older than fresh_for seconds it is
+still served, for up to stale_for more seconds, while a Celery task computes a
+new one. Only a cache miss makes the request wait for the computation.
+
+The values listed under prewarm are refreshed by a periodic task so that they
+rarely go stale or missing. The modules defining slow page values must be
+listed in settings.SLOW_PAGE_VALUE_MODULES, so that the task can find them.
+
+Hits, stale hits, misses and computation times are counted in the default
+cache and served in Prometheus format by ietf.api.views.slow_page_metrics.
+"""
+import inspect
+import time
+from functools import update_wrapper
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from ietf.utils import log
+
+# Longest a refresh task may run before another one may be queued
+REFRESH_LOCK_TIMEOUT = 10 * 60
+
+COUNTERS = ("hit", "stale", "miss", "compute", "compute_ms")
+
+_slow_page_values = {}
+
+
+class SlowPageValue:
+    def __init__(self, func, fresh_for, stale_for, prewarm):
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.fresh_for = fresh_for
+        self.stale_for = stale_for
+        self.prewarm = [tuple(args) for args in prewarm]
+        self.signature = inspect.signature(func)
+        update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        return self.get(*args, **kwargs)
+
+    def bind(self, args, kwargs=None):
+        """All arguments of a call, positionally and with defaults filled in"""
+        bound = self.signature.bind(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        return tuple(bound.arguments.values())
+
+    def cache_key(self, args):
+        return ":".join(["slowpages", self.name, *(str(arg) for arg in args)])
+
+    def _lookup(self, args):
+        try:
+            return caches["slowpages"].get(self.cache_key(args))
+        except EOFError:
+            return None
+
+    def get(self, *args, **kwargs):
+        args = self.bind(args, kwargs)
+        entry = self._lookup(args)
+        if entry is None:
+            record_metric(self.name, "miss")
+            return self.refresh(*args)
+        computed, value = entry
+        if time.time() - computed < self.fresh_for:
+            record_metric(self.name, "hit")
+        else:
+            record_metric(self.name, "stale")
+            self.queue_refresh(args)
+        return value
+
+    def refresh(self, *args):
+        """Compute the value and store it in the cache"""
+        args = self.bind(args)
+        start = time.monotonic()
+        value = self.func(*args)
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        record_metric(self.name, "compute")
+        record_metric(self.name, "compute_ms", elapsed_ms)
+        caches["slowpages"].set(
+            self.cache_key(args),
+            (time.time(), value),
+            self.fresh_for + self.stale_for,
+        )
+        return value
+
+    def refresh_if_stale(self, *args):
+        args = self.bind(args)
+        entry = self._lookup(args)
+        if entry is None or time.time() - entry[0] >= self.fresh_for:
+            self.refresh(*args)
+
+    def _lock_key(self, args):
+        return f"{self.cache_key(args)}:refreshing"
+
+    def queue_refresh(self, args):
+        """Queue a task to refresh the value, unless one is already queued"""
+        from .tasks import refresh_slow_page_value_task
+
+        if not caches["default"].add(self._lock_key(args), True, REFRESH_LOCK_TIMEOUT):
+            return
+        try:
+            refresh_slow_page_value_task.delay(self.name, list(args))
+        except Exception as err:
+            # keep serving the stale value, the next request will try again
+            log.log(f"Failed to queue refresh of {self.cache_key(args)}: {err}")
+            self.release_refresh_lock(args)
+
+    def release_refresh_lock(self, args):
+        caches["default"].delete(self._lock_key(args))
+
+
+def slow_page_value(fresh_for, stale_for=24 * 60 * 60, prewarm=((),)):
+    """Decorator for a function computing the (picklable) value behind a slow page
+
+    The arguments of the function, defaults included, are part of the cache key
+    and must be JSON-serializable so that they can be passed to the refresh task.
+    Each entry in prewarm is a tuple of arguments for which the value is kept warm.
+    """
+
+    def decorate(func):
+        value = SlowPageValue(func, fresh_for, stale_for, prewarm)
+        _slow_page_values[value.name] = value
+        return value
+
+    return decorate
+
+
+def load_slow_page_values():
+    """Import the modules defining slow page values and return them by name"""
+    for module in getattr(settings, "SLOW_PAGE_VALUE_MODULES", []):
+        import_module(module)
+    return _slow_page_values
+
+
+def get_slow_page_value(name) -> SlowPageValue:
+    value = import_string(name)
+    if not isinstance(value, SlowPageValue):
+        raise ValueError(f"{name} is not a slow page value")
+    return value
+
+
+def prewarm_slow_page_values():
+    for value in load_slow_page_values().values():
+        for args in value.prewarm:
+            try:
+                value.refresh_if_stale(*args)
+            except Exception as err:
+                log.log(f"Failed to prewarm {value.cache_key(args)}: {err}")
+
+
+def _metric_key(name, counter):
+    return f"slowpages:metrics:{name}:{counter}"
+
+
+def record_metric(name, counter, amount=1):
+    metrics = caches["default"]
+    key = _metric_key(name, counter)
+    metrics.add(key, 0, None)
+    try:
+        metrics.incr(key, amount)
+    except ValueError:
+        pass  # not kept by this cache backend
+
+
+def get_metrics():
+    """Counter values of each slow page value, as {name: {counter: value}}"""
+    names = sorted(load_slow_page_values())
+    found = caches["default"].get_many(
+        [_metric_key(name, counter) for name in names for counter in COUNTERS]
+    )
+    return {
+        name: {
+            counter: found.get(_metric_key(name, counter), 0) for counter in COUNTERS
+        }
+        for name in names
+    }
@@ -82,14 +82,19 @@ def _compute_custom_metadata(self):
             self.file.seek(0)
         except AttributeError:  # TODO-BLOBSTORE
             raise NotImplementedError("cannot handle unseekable content")
-        content_bytes = self.file.read()
-        if not isinstance(
-            content_bytes, bytes
-        ):  # TODO-BLOBSTORE: This is sketch-development only -remove before committing
-            raise Exception(f"Expected bytes - got {type(content_bytes)}")
+        # hash a chunk at a time so large content is never held in memory at once
+        digest = sha384()
+        length = 0
+        for chunk in self.chunks():
+            if not isinstance(
+                chunk, bytes
+            ):  # TODO-BLOBSTORE: This is sketch-development only -remove before committing
+                raise Exception(f"Expected bytes - got {type(chunk)}")
+            digest.update(chunk)
+            length += len(chunk)
         self.file.seek(0)
         return {
-            "len": f"{len(content_bytes)}",
-            "sha384": f"{sha384(content_bytes).hexdigest()}",
+            "len": f"{length}",
+            "sha384": f"{digest.hexdigest()}",
             "mtime": None if self.mtime is None else self.mtime.isoformat(),
         }
@@ -0,0 +1,21 @@
+# Copyright The IETF Trust 2026, All Rights Reserved
+#
+# Celery task definitions
+#
+from celery import shared_task
+
+from .slowpages import get_slow_page_value, prewarm_slow_page_values
+
+
+@shared_task
+def refresh_slow_page_value_task(name, args):
+    value = get_slow_page_value(name)
+    try:
+        value.refresh(*args)
+    finally:
+        value.release_refresh_lock(args)
+
+
+@shared_task
+def prewarm_slow_page_values_task():
+    prewarm_slow_page_values()
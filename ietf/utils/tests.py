@@ -11,7 +11,7 @@
 import shutil
 import types
 
-from unittest.mock import call, patch
+from unittest.mock import Mock, call, patch
 from pyquery import PyQuery
 from typing import Dict, List       # pyflakes:ignore
 
@@ -28,13 +28,14 @@
 from django.apps import apps
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.cache import caches
 from django.forms import Form
 from django.template import Context
 from django.template import Template    # pyflakes:ignore
 from django.template.defaulttags import URLNode
 from django.template.loader import get_template, render_to_string
 from django.templatetags.static import StaticNode
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from django.urls import reverse as urlreverse
 
 import debug                            # pyflakes:ignore
@@ -42,9 +43,11 @@
 from ietf.admin.sites import AdminSite
 from ietf.person.name import name_parts, unidecode_name
 from ietf.submit.tests import submission_file
+from ietf.utils.cache import cached_render, single_flight
 from ietf.utils.draft import PlaintextDraft, getmeta
 from ietf.utils.fields import SearchableField
 from ietf.utils.log import unreachable, assertion
+from ietf.utils.slowpages import SlowPageValue, record_metric, get_metrics
 from ietf.utils.mail import (
     send_mail_preformatted,
     send_mail_text,
@@ -938,3 +941,146 @@ def test_health(self):
             200,
         )
             
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "render-locks"},
+        "rendered": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "rendered"},
+    }
+)
+class CachedRenderTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+        caches["rendered"].clear()
+
+    def test_single_flight_waits_for_result(self):
+        caches["default"].add("single-flight:key", "someone-else", 60)
+        render = Mock(return_value="mine")
+        lookup = Mock(side_effect=[None, "theirs"])
+        self.assertEqual(single_flight("key", render, lookup=lookup, poll_interval=0), "theirs")
+        self.assertFalse(render.called)
+
+        # lock released without a result - take it and render
+        lookup = Mock(return_value=None)
+        caches["default"].delete("single-flight:key")
+        self.assertEqual(single_flight("key", render, lookup=lookup, poll_interval=0), "mine")
+        self.assertEqual(render.call_count, 1)
+        self.assertIsNone(caches["default"].get("single-flight:key"))
+
+        # lock held too long - render anyway
+        render.reset_mock()
+        caches["default"].add("single-flight:key", "someone-else", 60)
+        self.assertEqual(
+            single_flight("key", render, lookup=lookup, wait_timeout=0, poll_interval=0),
+            "mine",
+        )
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(caches["default"].get("single-flight:key"), "someone-else")
+
+    def test_cached_render(self):
+        render = Mock(return_value="v1")
+        self.assertEqual(cached_render("rendered", "key", render, 60, stale_timeout=60), "v1")
+        self.assertEqual(cached_render("rendered", "key", render, 60, stale_timeout=60), "v1")
+        self.assertEqual(render.call_count, 1)
+
+        # stale value is served while another process holds the refresh lock
+        caches["rendered"].delete("key:fresh")
+        caches["default"].add("single-flight:rendered:key", "someone-else", 60)
+        render.return_value = "v2"
+        self.assertEqual(cached_render("rendered", "key", render, 60, stale_timeout=60), "v1")
+        self.assertEqual(render.call_count, 1)
+
+        # ... and refreshed by whoever gets the lock
+        caches["default"].delete("single-flight:rendered:key")
+        self.assertEqual(cached_render("rendered", "key", render, 60, stale_timeout=60), "v2")
+        self.assertEqual(render.call_count, 2)
+        self.assertTrue(caches["rendered"].get("key:fresh"))
+
+        # a failed refresh keeps serving the stale value
+        caches["rendered"].delete("key:fresh")
+        render.side_effect = RuntimeError
+        self.assertEqual(cached_render("rendered", "key", render, 60, stale_timeout=60), "v2")
+
+        # on a miss the shared lookup is used before rendering
+        render = Mock(return_value="rendered")
+        self.assertEqual(
+            cached_render("rendered", "other", render, 60, lookup=lambda: "stored"),
+            "stored",
+        )
+        self.assertFalse(render.called)
+
+        # ... and its value is cached, to be rendered again once it is stale
+        self.assertEqual(caches["rendered"].get("other"), "stored")
+        self.assertEqual(
+            cached_render("rendered", "third", render, 60, stale_timeout=60, lookup=lambda: "stored"),
+            "stored",
+        )
+        caches["rendered"].delete("third:fresh")
+        self.assertEqual(
+            cached_render("rendered", "third", render, 60, stale_timeout=60, lookup=lambda: "stored"),
+            "rendered",
+        )
+        self.assertEqual(render.call_count, 1)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "slowpages-locks"},
+        "slowpages": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "slowpages"},
+    },
+    SLOW_PAGE_VALUE_MODULES=[],
+)
+class SlowPageValueTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+        caches["slowpages"].clear()
+
+    @patch("ietf.utils.tasks.refresh_slow_page_value_task")
+    def test_stale_while_revalidate(self, mock_task):
+        compute = Mock(return_value="v1")
+
+        def page_data(count, kind=None):
+            return compute(count, kind)
+
+        value = SlowPageValue(page_data, fresh_for=60, stale_for=60, prewarm=[])
+        self.assertEqual(value(1), "v1")
+        self.assertEqual(value(1, kind=None), "v1")
+        self.assertEqual(compute.call_count, 1)
+
+        # a stale value is served while a task refreshes it, queued only once
+        caches["slowpages"].set(value.cache_key((1, None)), (0, "old"), 60)
+        compute.return_value = "v2"
+        self.assertEqual(value(1), "old")
+        self.assertEqual(value(1), "old")
+        self.assertEqual(compute.call_count, 1)
+        self.assertEqual(mock_task.delay.call_args_list, [call(value.name, [1, None])])
+
+        # what the task does
+        value.refresh(1, None)
+        value.release_refresh_lock([1, None])
+        self.assertEqual(value(1), "v2")
+        self.assertIsNone(caches["default"].get(value._lock_key((1, None))))
+
+        # a fresh value is left alone by the prewarm
+        value.refresh_if_stale(1)
+        self.assertEqual(compute.call_count, 2)
+
+        # failing to queue the refresh keeps serving the stale value
+        caches["slowpages"].set(value.cache_key((1, None)), (0, "old"), 60)
+        mock_task.delay.side_effect = RuntimeError
+        self.assertEqual(value(1), "old")
+        self.assertIsNone(caches["default"].get(value._lock_key((1, None))))
+
+    def test_metrics(self):
+        record_metric("some.value", "hit")
+        record_metric("some.value", "compute_ms", 250)
+        record_metric("some.value", "compute_ms", 250)
+        with patch("ietf.utils.slowpages._slow_page_values", {"some.value": None}):
+            metrics = get_metrics()
+        self.assertEqual(
+            metrics,
+            {"some.value": {"hit": 1, "stale": 0, "miss": 0, "compute": 0, "compute_ms": 500}},
+        )
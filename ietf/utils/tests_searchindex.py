@@ -10,6 +10,8 @@
 from .test_utils import TestCase
 from ..blobdb.models import Blob
 from ..doc.factories import (
+    CharterFactory,
+    DocEventFactory,
     WgDraftFactory,
     WgRfcFactory,
     PublishedRfcDocEventFactory,
@@ -18,6 +20,7 @@
 )
 from ..doc.models import Document, RelatedDocument
 from ..doc.storage_utils import store_str
+from .models import SearchIndexChange
 from ..person.factories import PersonFactory
 
 
@@ -192,6 +195,33 @@ def test_typesense_doc_from_rfc_flags_historic(self):
         self.assertFalse(result["flags"]["updated"])
 
 
+    # texts are retrieved in the test transaction, which other threads cannot see
+    @override_settings(SEARCHINDEX_CONFIG={"TEXT_RETRIEVAL_WORKERS": 1})
+    def test_typesense_docs_from_rfcs(self):
+        rfcs = [PublishedRfcDocEventFactory().doc for _ in range(3)]
+        store_str(
+            kind="rfc",
+            name=f"txt/{rfcs[0].name}.txt",
+            content="The contents of this RFC",
+            doc_name=rfcs[0].name,
+            doc_rev=rfcs[0].rev,
+        )
+        BcpFactory(contains=rfcs[:2], name="bcp1234")
+        RelatedDocument.objects.create(
+            source=rfcs[2], target=rfcs[1], relationship_id="obs"
+        )
+        RelatedDocument.objects.create(
+            source=rfcs[2], target=rfcs[0], relationship_id="updates"
+        )
+        rfcs = [Document.objects.get(pk=rfc.pk) for rfc in rfcs]  # fresh instances
+        expected = [searchindex.typesense_doc_from_rfc(rfc) for rfc in rfcs]
+        with self.assertNumQueries(8):
+            result = searchindex.typesense_docs_from_rfcs(rfcs)
+        self.assertEqual(result, expected)
+        self.assertEqual(result[0]["subseries"]["total"], 2)
+        self.assertIn("content", result[0])
+        self.assertEqual(result[1]["obsoletedBy"], [str(rfcs[2].rfc_number)])
+
     @override_settings(
         SEARCHINDEX_CONFIG={
             "TYPESENSE_API_URL": "http://ts.example.com",
@@ -224,13 +254,13 @@ def test_update_or_create_rfc_entry(
             "TYPESENSE_COLLECTION_NAME": "frogs",
         }
     )
-    @mock.patch("ietf.utils.searchindex.typesense_doc_from_rfc")
+    @mock.patch("ietf.utils.searchindex.typesense_docs_from_rfcs")
     @mock.patch("ietf.utils.searchindex.typesense.Client")
     def test_update_or_create_rfc_entries(
-        self, mock_ts_client_constructor, mock_tdoc_from_rfc
+        self, mock_ts_client_constructor, mock_tdocs_from_rfcs
     ):
         fake_tdoc = object()
-        mock_tdoc_from_rfc.return_value = fake_tdoc
+        mock_tdocs_from_rfcs.side_effect = lambda batch: [fake_tdoc] * len(batch)
         rfc = WgRfcFactory()
         assert isinstance(rfc, Document)
         searchindex.update_or_create_rfc_entries([rfc] * 50)  # list of docs...
@@ -261,6 +291,74 @@ def test_update_or_create_rfc_entries(
             ],
         )
 
+    @override_settings(
+        SEARCHINDEX_CONFIG={
+            "TYPESENSE_API_URL": "http://ts.example.com",
+            "TYPESENSE_API_KEY": "test-api-key",
+            "TYPESENSE_COLLECTION_NAME": "frogs",
+            "TEXT_RETRIEVAL_WORKERS": 1,
+        }
+    )
+    @mock.patch("ietf.utils.searchindex.typesense.Client")
+    def test_sync_changed_documents(self, mock_ts_client_constructor):
+        rfc = PublishedRfcDocEventFactory().doc
+        draft = WgDraftFactory()
+        gone = WgDraftFactory()
+        gone_pk = gone.pk
+        gone.delete()
+        self.assertEqual(
+            SearchIndexChange.objects.get(doc_id=gone_pk).kind,
+            SearchIndexChange.Kinds.DELETE,
+        )
+        self.assertTrue(SearchIndexChange.objects.filter(doc_id=rfc.pk).exists())
+        self.assertTrue(SearchIndexChange.objects.filter(doc_id=draft.pk).exists())
+        # documents that are not in the index are not journaled
+        charter = CharterFactory()
+        DocEventFactory(doc=charter)
+        self.assertFalse(SearchIndexChange.objects.filter(doc_id=charter.pk).exists())
+        mock_documents = mock_ts_client_constructor.return_value.collections[
+            "frogs"  # matches value in override_settings above
+        ].documents
+        mock_documents.import_.side_effect = typesense.exceptions.Timeout
+        searchindex.sync_changed_documents()
+        self.assertTrue(SearchIndexChange.objects.exists())  # left for the next run
+
+        mock_documents.import_.side_effect = lambda tdocs, params: [
+            {"success": True} for _ in tdocs
+        ]
+        searchindex.sync_changed_documents()
+        self.assertFalse(SearchIndexChange.objects.exists())
+        tdocs = mock_documents.import_.call_args.args[0]
+        self.assertCountEqual(
+            [(tdoc["id"], tdoc["type"]) for tdoc in tdocs],
+            [(f"doc-{rfc.pk}", "rfc"), (f"doc-{draft.pk}", "draft")],
+        )
+        self.assertEqual(
+            mock_documents.__getitem__.call_args_list, [mock.call(f"doc-{gone_pk}")]
+        )
+        self.assertTrue(mock_documents.__getitem__.return_value.delete.called)
+
+        # documents that fail to import stay in the journal for the next run
+        searchindex.record_document_change(rfc.pk)
+        searchindex.record_document_change(draft.pk)
+        mock_documents.import_.side_effect = lambda tdocs, params: [
+            {"success": tdoc["id"] != f"doc-{draft.pk}", "error": "bad document"}
+            for tdoc in tdocs
+        ]
+        searchindex.sync_changed_documents()
+        self.assertEqual(
+            list(SearchIndexChange.objects.values_list("doc_id", flat=True)), [draft.pk]
+        )
+        self.assertEqual(mock_documents.import_.call_count, 3)  # not retried in the same run
+
+        mock_documents.import_.side_effect = lambda tdocs, params: [
+            {"success": True} for _ in tdocs
+        ]
+        searchindex.sync_changed_documents()
+        self.assertFalse(SearchIndexChange.objects.exists())
+        tdocs = mock_documents.import_.call_args.args[0]
+        self.assertEqual([tdoc["id"] for tdoc in tdocs], [f"doc-{draft.pk}"])
+
     @override_settings(
         SEARCHINDEX_CONFIG={
             "TYPESENSE_API_URL": "http://ts.example.com",
@@ -398,7 +398,7 @@ def _multiline_to_list(s):
 )
 
 for storagename in ARTIFACT_STORAGE_NAMES:
-    if storagename in ["staging"]:
+    if storagename in ["staging", "htmlized", "pdfized"]:
         continue
     replica_storagename = f"r2-{storagename}"
     adjusted_bucket_name = (
@@ -469,7 +469,7 @@ def _multiline_to_list(s):
     "ENABLED": _blobdb_replication_enabled,
     "DEST_STORAGE_PATTERN": "r2-{bucket}",
     "INCLUDE_BUCKETS": ARTIFACT_STORAGE_NAMES,
-    "EXCLUDE_BUCKETS": ["staging"],
+    "EXCLUDE_BUCKETS": ["staging", "htmlized", "pdfized"],
     "VERBOSE_LOGGING": _blobdb_replication_verbose_logging,
 }
 